@@ -0,0 +1,145 @@
+"""Measures the main lissandra entry points end to end, through the whole pipeline and a real HTTP client, against the
+local mock Riot API in `benchmarks.mockserver`. Reports requests/sec, p50/p99 latency per call, how much of the
+(mock) rate limits was used, and the peak memory allocated while running each scenario.
+
+Run from the repository root with:
+
+    python -m benchmarks.endtoend
+    python -m benchmarks.endtoend --latency 0.02 --error-429-rate 0.01 --calls 200
+    python -m benchmarks.endtoend --app-rate-limit 20:1 --jitter 0.05 --aligned-windows --rate-limiter gcra
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List
+
+import lissandra
+from lissandra import Division, Tier, configuration
+
+from .mockserver import MockRiotAPI
+
+REGION = "EUW"
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def apply_settings(**riot_api) -> None:
+    """Points lissandra at the mock server's region and key; `riot_api` are any other settings for the RiotAPI."""
+    lissandra.apply_settings(
+        {
+            "global": {"default_region": REGION},
+            "pipeline": {"Cache": {}, "DDragon": {}, "RiotAPI": dict(riot_api, api_key="RGAPI-benchmark")},
+            "logging": {"print_calls": False},
+        }
+    )
+
+
+def clear_cache() -> None:
+    configuration.settings.clear_sinks()
+
+
+# Each scenario is (name, call(i), setup(i)). `setup` isn't timed; it empties the cache where the calls would
+# otherwise be served from it.
+SCENARIOS = [
+    ("get_summoner", lambda i: lissandra.get_summoner(name="bench{}".format(i)).level, None),
+    (
+        "get_summoners x50",
+        lambda i: lissandra.get_summoners(names=["bench{}-{}".format(i, j) for j in range(50)]),
+        None,
+    ),
+    ("get_challenger_league", lambda i: len(lissandra.get_challenger_league().entries), lambda i: clear_cache()),
+    (
+        "get_paginated_league_entries",
+        lambda i: len(lissandra.get_paginated_league_entries(Tier.diamond, Division.one)),
+        lambda i: clear_cache(),
+    ),
+    ("get_status", lambda i: lissandra.get_status().services, lambda i: clear_cache()),
+    ("get_profile_icons", lambda i: len(lissandra.get_profile_icons()), lambda i: clear_cache()),
+    (
+        "get_matches x20",
+        lambda i: lissandra.get_matches(["EUW1_{}".format(i * 20 + j) for j in range(20)]),
+        None,
+    ),
+]
+
+
+def run(server: MockRiotAPI, name: str, call: Callable, setup: Callable, n_calls: int, **riot_api) -> None:
+    apply_settings(**riot_api)
+    call(-1)  # Warm up: creates the pipeline and loads the realms / versions a call might need
+    server.reset_stats()
+    latencies = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(n_calls):
+        if setup is not None:
+            setup(i)
+        before = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_requests = sum(server.requests.values())
+    print(
+        "{:<30} {:>9.1f} {:>9.2f} {:>9.2f} {:>8.0%} {:>10.1f} {:>6}".format(
+            name,
+            n_requests / elapsed,
+            percentile(latencies, 50) * 1e3,
+            percentile(latencies, 99) * 1e3,
+            server.max_rate_limit_utilisation,
+            peak / 2**20,
+            sum(count for status, count in server.statuses.items() if status != 200),
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=100, help="calls per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds more")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="the fraction of responses to slow down")
+    parser.add_argument("--slow-latency", type=float, default=0.0, help="seconds added to the slow responses")
+    parser.add_argument("--app-rate-limit", default="500:10,30000:600")
+    parser.add_argument("--method-rate-limit", default="2000:60")
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0)
+    parser.add_argument("--service-rate-limit", help="the hidden capacity of each method, e.g. 100:10")
+    parser.add_argument("--aligned-windows", action="store_true", help="start rate limit windows on the second")
+    parser.add_argument("--rate-limiter", default="fixed_window", help="fixed_window or gcra")
+    parser.add_argument("--hedging", action="store_true", help="hedge slow summoner and league entry lookups")
+    parser.add_argument("--only", help="only run the scenarios whose names contain this")
+    args = parser.parse_args()
+
+    server = MockRiotAPI(
+        latency=args.latency,
+        jitter=args.jitter,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        app_rate_limit=args.app_rate_limit,
+        method_rate_limit=args.method_rate_limit,
+        aligned_windows=args.aligned_windows,
+        error_429_rate=args.error_429_rate,
+        service_rate_limit=args.service_rate_limit,
+        # Only 502s / 504s are retried by the client
+        error_5xx_rate=args.error_5xx_rate,
+        error_5xx_status=504,
+        seed=0,
+    )
+    with server, server.redirect():
+        print(
+            "{:<30} {:>9} {:>9} {:>9} {:>8} {:>10} {:>6}".format(
+                "scenario", "req/s", "p50 ms", "p99 ms", "limit", "peak MiB", "errors"
+            )
+        )
+        for name, call, setup in SCENARIOS:
+            if args.only is None or args.only in name:
+                run(server, name, call, setup, args.calls, rate_limiter=args.rate_limiter, hedging=args.hedging)
+
+
+if __name__ == "__main__":
+    main()
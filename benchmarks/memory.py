@@ -0,0 +1,104 @@
+"""Measures how much memory each LeagueEntryData in a ladder keeps alive.
+
+Run from the repository root with:
+
+    python -m benchmarks.memory
+
+The entries are built from freshly decoded JSON (like Riot API responses), then the JSON is dropped, so what's left is
+what the entries themselves hold on to: the objects and their field values. `CoreData` is the layout every data type
+had before `SlottedCoreData`, with a per-instance `__dict__`.
+"""
+
+import gc
+import json
+import string
+import sys
+import tracemalloc
+import uuid
+from random import Random
+
+from lissandra.core.common import CoreData
+from lissandra.core.league import LeagueEntryData
+
+N_ENTRIES = 100000
+ENTRIES_PER_LEAGUE = 200
+# Roughly how a region's TFT ladder is spread over the tiers below master, which have four divisions each
+TIERS = [("IRON", 0.1), ("BRONZE", 0.2), ("SILVER", 0.25), ("GOLD", 0.22), ("PLATINUM", 0.15), ("DIAMOND", 0.08)]
+DIVISIONS = ["IV", "III", "II", "I"]
+ID_CHARACTERS = string.ascii_letters + string.digits + "-_"
+NAME_CHARACTERS = string.ascii_letters + string.digits + " "
+
+
+class DictLeagueEntryData(CoreData):
+    _renamed = LeagueEntryData._renamed
+
+
+class UninternedLeagueEntryData(LeagueEntryData):
+    _interned = ()
+
+
+def make_ladder_json(seed: int = 0) -> str:
+    """A ladder as the league entries endpoint returns it: each division split into leagues of up to 200 entries, with
+    random encrypted summoner ids, names and game counts.
+    """
+    random = Random(seed)
+    entries = []
+    for tier, share in TIERS:
+        for division in DIVISIONS:
+            n_entries = int(N_ENTRIES * share / len(DIVISIONS))
+            for i in range(n_entries):
+                if i % ENTRIES_PER_LEAGUE == 0:
+                    league_id = str(uuid.UUID(int=random.getrandbits(128), version=4))
+                games = int(random.lognormvariate(4.0, 1.0)) + 1
+                wins = int(games * random.uniform(0.3, 0.7))
+                entries.append(
+                    {
+                        "leagueId": league_id,
+                        "summonerId": "".join(random.choice(ID_CHARACTERS) for _ in range(47)),
+                        "summonerName": "".join(random.choice(NAME_CHARACTERS) for _ in range(random.randint(3, 16))),
+                        "queueType": "RANKED_TFT",
+                        "tier": tier,
+                        "rank": division,
+                        "leaguePoints": random.randrange(100),
+                        "wins": wins,
+                        "losses": games - wins,
+                        "hotStreak": random.random() < 0.05,
+                        "veteran": random.random() < 0.1,
+                        "freshBlood": random.random() < 0.1,
+                        "inactive": random.random() < 0.02,
+                        "region": "EUW",
+                    }
+                )
+    return json.dumps(entries)
+
+
+def measure(type: type, ladder_json: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    ladder = json.loads(ladder_json)
+    n_entries = len(ladder)
+    entries = [type(**entry) for entry in ladder]
+    del ladder
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Don't count the list holding the entries
+    retained -= sys.getsizeof(entries)
+    del entries
+    return retained / n_entries
+
+
+def main():
+    ladder_json = make_ladder_json()
+    before = measure(DictLeagueEntryData, ladder_json)
+    print("{:<40} {:>8.1f} bytes/entry".format("CoreData", before))
+    for name, type in [
+        ("LeagueEntryData without interning", UninternedLeagueEntryData),
+        ("LeagueEntryData", LeagueEntryData),
+    ]:
+        after = measure(type, ladder_json)
+        print("{:<40} {:>8.1f} bytes/entry ({:.1%} of CoreData)".format(name, after, after / before))
+
+
+if __name__ == "__main__":
+    main()
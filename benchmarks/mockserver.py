@@ -0,0 +1,557 @@
+"""A local stand-in for the Riot API and DDragon, for benchmarking without a network or an API key.
+
+`MockRiotAPI` serves canned (but realistically sized) TFT summoner, league, match and status payloads, and the DDragon
+versions, realms, languages and profile icons, from a threaded HTTP server on localhost. It can add latency, sends
+the rate limit headers the Riot API does (and enforces those limits, answering 429s when they're exceeded), and can
+inject 429s and 5xx errors at random.
+
+`MockRiotAPI.redirect` points lissandra's HTTP client at the server, so the library can be used as normal:
+
+    with MockRiotAPI(latency=0.02) as server, server.redirect():
+        lissandra.get_challenger_league(region="EUW").entries
+
+Run it on its own to poke at it with other tools:
+
+    python -m benchmarks.mockserver --port 8000
+"""
+
+import argparse
+import collections
+import contextlib
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from lissandra.datastores.common import HTTPClient
+
+try:
+    from http.server import ThreadingHTTPServer
+except ImportError:  # Python 3.6
+
+    class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+
+DEFAULT_APP_RATE_LIMIT = "500:10,30000:600"
+DEFAULT_METHOD_RATE_LIMIT = "2000:60"
+VERSION = "10.10.1"
+TIERS_WITH_DIVISIONS = ("IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND")
+
+
+def _parse_rate_limit(header: str) -> List[Tuple[int, int]]:
+    return [tuple(int(value) for value in limit.split(":")) for limit in header.split(",")]
+
+
+class _FixedWindows(object):
+    """Counts requests in fixed windows, like the Riot API does, for one application or method rate limit. Windows
+    start at the first request after the last one ended, or at multiples of their length if they're `aligned`.
+    """
+
+    def __init__(self, limits: List[Tuple[int, int]], aligned: bool = False):
+        self.limits = limits
+        self.aligned = aligned
+        self._windows = [[0.0, 0] for _ in limits]  # [window start, count] for each limit
+        self.max_utilisation = 0.0
+
+    def hit(self, now: float) -> Optional[int]:
+        """Counts a request, or returns the seconds until it would be allowed if it's over a limit."""
+        for (permits, seconds), window in zip(self.limits, self._windows):
+            if now - window[0] >= seconds:
+                window[0], window[1] = now - (now % seconds if self.aligned else 0.0), 0
+            if window[1] >= permits:
+                return max(1, int(window[0] + seconds - now + 0.999))
+        for (permits, seconds), window in zip(self.limits, self._windows):
+            window[1] += 1
+            self.max_utilisation = max(self.max_utilisation, window[1] / permits)
+        return None
+
+    def counts(self) -> str:
+        return ",".join("{}:{}".format(window[1], seconds) for (_, seconds), window in zip(self.limits, self._windows))
+
+
+########################
+# Canned payloads      #
+########################
+
+
+def summoner_payload(identifier: str, by: str = "id") -> Dict[str, Any]:
+    # Every identifier maps to the same summoner, so a lookup by any of them is consistent
+    key = identifier.split("-", 1)[1] if identifier.startswith(("id-", "account-", "puuid-")) else identifier
+    key = key.replace(" ", "").lower()
+    return {
+        "id": "id-" + key,
+        "accountId": "account-" + key,
+        "puuid": "puuid-" + key,
+        "name": key if by == "name" else "Summoner " + key,
+        "profileIconId": 4000 + len(key),
+        "revisionDate": 1590000000000,
+        "summonerLevel": 100 + len(key),
+    }
+
+
+def league_entry_payload(i: int, tier: str, division: str, league_id: str = None) -> Dict[str, Any]:
+    entry = {
+        "summonerId": "id-{}".format(i),
+        "summonerName": "Summoner {}".format(i),
+        "leaguePoints": i % 100,
+        "rank": division,
+        "wins": 100 + i % 37,
+        "losses": 90 + i % 41,
+        "veteran": i % 3 == 0,
+        "inactive": False,
+        "freshBlood": i % 5 == 0,
+        "hotStreak": i % 2 == 0,
+    }
+    if league_id is not None:
+        return entry
+    entry.update({"leagueId": "league-{}-{}".format(tier, division), "queueType": "RANKED_TFT", "tier": tier})
+    return entry
+
+
+def league_payload(tier: str, n_entries: int, league_id: str = None) -> Dict[str, Any]:
+    league_id = league_id or "league-" + tier
+    return {
+        "tier": tier,
+        "leagueId": league_id,
+        "queue": "RANKED_TFT",
+        "name": "Mock's Tacticians",
+        "entries": [league_entry_payload(i, tier, "I", league_id) for i in range(n_entries)],
+    }
+
+
+def match_payload(id: str) -> Dict[str, Any]:
+    seed = sum(id.encode("utf-8"))
+    participants = []
+    for placement in range(1, 9):
+        participants.append(
+            {
+                "puuid": "puuid-{}".format((seed + placement) % 10000),
+                "placement": placement,
+                "level": 9 - placement // 3,
+                "gold_left": placement,
+                "last_round": 40 - placement,
+                "players_eliminated": 8 - placement if placement < 4 else 0,
+                "time_eliminated": 2400.0 - 60 * placement,
+                "total_damage_to_players": 150 - 10 * placement,
+                "companion": {"content_ID": "content-{}".format(placement), "skin_ID": 1, "species": "PetTFT"},
+                "traits": [
+                    {
+                        "name": "Set3_Trait{}".format((seed + placement + i) % 20),
+                        "num_units": 2 + i % 3,
+                        "style": i % 4,
+                        "tier_current": 1 + i % 2,
+                        "tier_total": 3,
+                    }
+                    for i in range(7)
+                ],
+                "units": [
+                    {
+                        "character_id": "TFT3_Unit{}".format((seed + placement * 3 + i) % 50),
+                        "items": [(seed + i) % 60, (seed + i + 1) % 60][: i % 3],
+                        "name": "",
+                        "rarity": i % 5,
+                        "tier": 1 + i % 3,
+                    }
+                    for i in range(9)
+                ],
+            }
+        )
+    return {
+        "metadata": {
+            "data_version": "5",
+            "match_id": id,
+            "participants": [participant["puuid"] for participant in participants],
+        },
+        "info": {
+            "game_datetime": 1590000000000,
+            "game_length": 2400.0,
+            "game_version": "Version 10.10.1",
+            "queue_id": 1100,
+            "tft_set_number": 3,
+            "participants": participants,
+        },
+    }
+
+
+def shard_status_payload(platform: str) -> Dict[str, Any]:
+    return {
+        "name": "Mock " + platform.upper(),
+        "slug": platform,
+        "region_tag": platform,
+        "hostname": "prod.{}.lol.riotgames.com".format(platform),
+        "locales": ["en_GB", "de_DE", "es_ES", "fr_FR", "it_IT"],
+        "services": [
+            {"name": name, "slug": name.lower(), "status": "online", "incidents": []}
+            for name in ("Game", "Store", "Website", "Client")
+        ],
+    }
+
+
+def realms_payload(region: str) -> Dict[str, Any]:
+    return {
+        "n": {"profileicon": VERSION, "language": VERSION},
+        "v": VERSION,
+        "l": "en_GB",
+        "cdn": "https://ddragon.leagueoflegends.com/cdn",
+        "dd": VERSION,
+        "lg": VERSION,
+        "css": VERSION,
+        "profileiconmax": 28,
+        "store": None,
+    }
+
+
+def profile_icons_payload(n_icons: int) -> Dict[str, Any]:
+    return {
+        "type": "profileicon",
+        "version": VERSION,
+        "data": {
+            str(i): {
+                "id": i,
+                "image": {
+                    "full": "{}.png".format(i),
+                    "sprite": "profileicon{}.png".format(i // 100),
+                    "group": "profileicon",
+                    "x": 48 * (i % 10),
+                    "y": 48 * (i // 10 % 10),
+                    "w": 48,
+                    "h": 48,
+                },
+            }
+            for i in range(n_icons)
+        },
+    }
+
+
+########################
+# Server               #
+########################
+
+
+class MockRiotAPI(object):
+    """See the module docstring.
+
+    `latency` (plus up to `jitter`) seconds are added to every response, and `slow_latency` more to a `slow_rate`
+    fraction of them, for a long tail. `app_rate_limit` and `method_rate_limit` are
+    sent as the `X-App-Rate-Limit` / `X-Method-Rate-Limit` headers, and enforced per platform (and per platform and
+    method) if `enforce_rate_limits` is set. `error_429_rate` and `error_5xx_rate` are the fractions of requests that
+    are answered with an injected 429 (with `Retry-After: retry_after`) or `error_5xx_status` instead.
+    `aligned_windows` starts every rate limit window at a multiple of its length, rather than at the first request.
+    `service_rate_limit` is the capacity of the service behind each platform's methods: it isn't sent in any header,
+    and requests over it get a 429 without an `X-Rate-Limit-Type`, like when the Riot API's services are overloaded.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        app_rate_limit: str = DEFAULT_APP_RATE_LIMIT,
+        method_rate_limit: str = DEFAULT_METHOD_RATE_LIMIT,
+        enforce_rate_limits: bool = True,
+        aligned_windows: bool = False,
+        error_429_rate: float = 0.0,
+        error_5xx_rate: float = 0.0,
+        error_5xx_status: int = 503,
+        retry_after: int = 1,
+        service_rate_limit: str = None,
+        league_page_size: int = 200,
+        league_pages: int = 5,
+        apex_league_size: int = 300,
+        n_profile_icons: int = 1000,
+        seed: int = None,
+    ):
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.app_rate_limit = app_rate_limit
+        self.method_rate_limit = method_rate_limit
+        self.enforce_rate_limits = enforce_rate_limits
+        self.aligned_windows = aligned_windows
+        self.error_429_rate = error_429_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.error_5xx_status = error_5xx_status
+        self.retry_after = retry_after
+        self.service_rate_limit = service_rate_limit
+        self.league_page_size = league_page_size
+        self.league_pages = league_pages
+        self.apex_league_size = apex_league_size
+        self.n_profile_icons = n_profile_icons
+        self._random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._app_windows = {}  # type: Dict[str, _FixedWindows]
+        self._method_windows = {}  # type: Dict[Tuple[str, str], _FixedWindows]
+        self._service_windows = {}  # type: Dict[Tuple[str, str], _FixedWindows]
+        self.requests = collections.Counter()  # method name -> number of requests
+        self.statuses = collections.Counter()  # status code -> number of responses
+        self._server = None  # type: Optional[ThreadingHTTPServer]
+        self._thread = None  # type: Optional[threading.Thread]
+        self._routes = [
+            (re.compile(pattern), name, handler)
+            for pattern, name, handler in (
+                (r"/tft/summoner/v1/summoners/by-name/(?P<id>[^/]+)$", "summoner-by-name", self._summoner),
+                (r"/tft/summoner/v1/summoners/by-puuid/(?P<id>[^/]+)$", "summoner-by-puuid", self._summoner),
+                (r"/tft/summoner/v1/summoners/by-account/(?P<id>[^/]+)$", "summoner-by-account", self._summoner),
+                (r"/tft/summoner/v1/summoners/(?P<id>[^/]+)$", "summoner", self._summoner),
+                (r"/tft/league/v1/entries/by-summoner/(?P<id>[^/]+)$", "league-by-summoner", self._summoner_entries),
+                (r"/tft/league/v1/entries/(?P<tier>\w+)/(?P<division>\w+)$", "league-entries", self._entries),
+                (r"/tft/league/v1/(?P<tier>challenger|grandmaster|master)$", "apex-league", self._apex_league),
+                (r"/tft/league/v1/leagues/(?P<id>[^/]+)$", "league", self._league),
+                (r"/tft/match/v1/matches/by-puuid/(?P<puuid>[^/]+)/ids$", "match-ids", self._match_ids),
+                (r"/tft/match/v1/matches/(?P<id>[^/]+)$", "match", self._match),
+                (r"/lol/status/v3/shard-data$", "status", self._status),
+                (r"/api/versions.json$", "versions", self._versions),
+                (r"/realms/(?P<region>\w+).json$", "realms", self._realms),
+                (r"/cdn/languages.json$", "languages", self._languages),
+                (r"/cdn/[^/]+/data/[^/]+/profileicon.json$", "profile-icons", self._profile_icons),
+            )
+        ]
+        self._profile_icons_body = None
+
+    # Payloads
+
+    def _summoner(self, host, match, query):
+        by = "name" if "by-name" in match.re.pattern else "id"
+        return summoner_payload(match.group("id"), by)
+
+    def _summoner_entries(self, host, match, query):
+        return [league_entry_payload(0, "GOLD", "II")]
+
+    def _entries(self, host, match, query):
+        page = int(query.get("page", ["1"])[0])
+        tier, division = match.group("tier"), match.group("division")
+        if page > self.league_pages or tier not in TIERS_WITH_DIVISIONS:
+            return []
+        start = (page - 1) * self.league_page_size
+        return [league_entry_payload(i, tier, division) for i in range(start, start + self.league_page_size)]
+
+    def _apex_league(self, host, match, query):
+        return league_payload(match.group("tier").upper(), self.apex_league_size)
+
+    def _league(self, host, match, query):
+        return league_payload("DIAMOND", self.league_page_size, match.group("id"))
+
+    def _match_ids(self, host, match, query):
+        count = int(query.get("count", ["20"])[0])
+        start = int(query.get("start", ["0"])[0])
+        seed = sum(match.group("puuid").encode("utf-8"))
+        return ["EUW1_{}".format(seed * 100 + i) for i in range(start, start + count)]
+
+    def _match(self, host, match, query):
+        return match_payload(match.group("id"))
+
+    def _status(self, host, match, query):
+        return shard_status_payload(host.split(".", 1)[0])
+
+    def _versions(self, host, match, query):
+        return [VERSION, "10.9.1", "10.8.1", "10.7.1"]
+
+    def _realms(self, host, match, query):
+        return realms_payload(match.group("region"))
+
+    def _languages(self, host, match, query):
+        return ["en_US", "en_GB", "de_DE", "es_ES", "fr_FR", "it_IT", "ko_KR"]
+
+    def _profile_icons(self, host, match, query):
+        if self._profile_icons_body is None:
+            self._profile_icons_body = profile_icons_payload(self.n_profile_icons)
+        return self._profile_icons_body
+
+    # Serving
+
+    def handle(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        """Answers a GET for `url`, which is the path of a real Riot API / DDragon URL with its host prepended, e.g.
+        `/euw1.api.riotgames.com/tft/summoner/v1/summoners/by-name/Crimack`. Returns (status, headers, body).
+        """
+        parts = urlsplit(url)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = "/" + path
+        query = parse_qs(parts.query)
+        for pattern, name, handler in self._routes:
+            match = pattern.search(path)
+            if match is not None:
+                break
+        else:
+            return self._respond(404, {}, {"status": {"message": "Not found", "status_code": 404}}, None)
+
+        riot_api = host.endswith(".api.riotgames.com")
+        headers = {}
+        if riot_api:
+            platform = host.split(".", 1)[0]
+            headers["X-App-Rate-Limit"] = self.app_rate_limit
+            headers["X-Method-Rate-Limit"] = self.method_rate_limit
+            limited = None
+            with self._lock:
+                app = self._app_windows.setdefault(
+                    platform, _FixedWindows(_parse_rate_limit(self.app_rate_limit), self.aligned_windows)
+                )
+                method = self._method_windows.setdefault(
+                    (platform, name), _FixedWindows(_parse_rate_limit(self.method_rate_limit), self.aligned_windows)
+                )
+                now = time.monotonic()
+                if self.enforce_rate_limits:
+                    for limit_type, windows in (("application", app), ("method", method)):
+                        retry_after = windows.hit(now)
+                        if retry_after is not None:
+                            limited = limit_type, retry_after
+                            break
+                if limited is None and self.service_rate_limit is not None:
+                    service = self._service_windows.setdefault(
+                        (platform, name),
+                        _FixedWindows(_parse_rate_limit(self.service_rate_limit), self.aligned_windows),
+                    )
+                    retry_after = service.hit(now)
+                    if retry_after is not None:
+                        limited = None, retry_after
+                headers["X-App-Rate-Limit-Count"] = app.counts()
+                headers["X-Method-Rate-Limit-Count"] = method.counts()
+                roll = self._random.random()
+            if limited is not None:
+                headers["Retry-After"] = str(limited[1])
+                if limited[0] is not None:
+                    headers["X-Rate-Limit-Type"] = limited[0]
+                return self._respond(429, headers, {"status": {"status_code": 429}}, name)
+            if roll < self.error_429_rate:
+                headers.update({"Retry-After": str(self.retry_after), "X-Rate-Limit-Type": "service"})
+                return self._respond(429, headers, {"status": {"status_code": 429}}, name)
+            if roll < self.error_429_rate + self.error_5xx_rate:
+                return self._respond(self.error_5xx_status, headers, {"status": {"status_code": 500}}, name)
+        return self._respond(200, headers, handler(host, match, query), name, riot_api)
+
+    def _respond(self, status, headers, payload, name, riot_api=True):
+        with self._lock:
+            self.statuses[status] += 1
+            if name is not None:
+                self.requests[name] += 1
+        # The Riot API sends a charset (so the client decodes the JSON), while DDragon doesn't
+        headers["Content-Type"] = "application/json;charset=utf-8" if riot_api else "application/json"
+        return status, headers, json.dumps(payload).encode("utf-8")
+
+    def _sleep(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.slow_rate and self._random.random() < self.slow_rate:
+            delay += self.slow_latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def _make_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                mock._sleep()
+                status, headers, body = mock.handle(self.path)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MockRiotAPI":
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-riot-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockRiotAPI":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.port)
+
+    def rewrite(self, url: str) -> str:
+        """Turns a Riot API / DDragon URL into the URL of the same resource on this server."""
+        if isinstance(url, bytes):
+            url = url.decode("utf-8")
+        return re.sub(r"^https?://", self.url + "/", url)
+
+    @contextlib.contextmanager
+    def redirect(self):
+        """Sends all of lissandra's HTTP requests to this server while the context is active."""
+        get = HTTPClient.get
+
+        def redirected_get(client, url, *args, **kwargs):
+            return get(client, self.rewrite(url), *args, **kwargs)
+
+        with patch.object(HTTPClient, "get", redirected_get):
+            yield self
+
+    @property
+    def max_rate_limit_utilisation(self) -> float:
+        """The highest fraction of any rate limit that was used in a single window."""
+        with self._lock:
+            windows = list(self._app_windows.values()) + list(self._method_windows.values())
+            return max((window.max_utilisation for window in windows), default=0.0)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.statuses.clear()
+            for windows in list(self._app_windows.values()) + list(self._method_windows.values()):
+                windows.max_utilisation = 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="the fraction of responses to slow down")
+    parser.add_argument("--slow-latency", type=float, default=0.0, help="seconds added to the slow responses")
+    parser.add_argument("--error-429-rate", type=float, default=0.0)
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0)
+    parser.add_argument("--service-rate-limit", help="the hidden capacity of each method, e.g. 100:10")
+    args = parser.parse_args()
+    server = MockRiotAPI(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        error_429_rate=args.error_429_rate,
+        service_rate_limit=args.service_rate_limit,
+        error_5xx_rate=args.error_5xx_rate,
+    )
+    with server:
+        print("Serving the mock Riot API at {}/<host>/<path> (Ctrl-C to stop)".format(server.url))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Measures the per-`get` dispatch overhead of the data pipeline when the result is already in the cache.
+
+Run from the repository root with:
+
+    python -m benchmarks.pipeline
+"""
+
+import timeit
+
+from datapipelines import DataPipeline
+
+from lissandra._configuration.pipeline import CompiledDataPipeline
+from lissandra.core.summoner import Summoner, SummonerData
+from lissandra.datastores import Cache, UnloadedGhostStore
+from lissandra.transformers import __transformers__ as transformers
+
+N_GETS = 10000
+
+
+def make_pipeline(pipeline_cls):
+    cache = Cache()
+    summoner = Summoner.from_data(
+        SummonerData(id="summoner-id", puuid="summoner-puuid", name="Crimack", summonerLevel=30, region="EUW")
+    )
+    cache.put(Summoner, summoner)
+    return pipeline_cls([cache, UnloadedGhostStore()], transformers)
+
+
+def report(name: str, pipeline) -> None:
+    query = {"name": "Crimack", "region": "EUW"}
+    pipeline.get(Summoner, query)  # Warm up any lazily built state
+    seconds = min(timeit.repeat(lambda: pipeline.get(Summoner, query), number=N_GETS, repeat=5)) / N_GETS
+    print("{:<25} {:>8.2f} us/get".format(name, seconds * 1e6))
+
+
+def main():
+    report("DataPipeline", make_pipeline(DataPipeline))
+    report("CompiledDataPipeline", make_pipeline(CompiledDataPipeline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Microbenchmarks of the CPU-bound parts of a `get`: the league and profile icon transformers, building core objects
+and their data, and query validation. Each one runs on a realistically sized payload (a 300 entry challenger league,
+a 200 entry page of league entries, 1000 profile icons) and also records, per element, how many memory blocks the
+result keeps allocated and the peak memory used while building it.
+
+Needs pytest-benchmark. Run from the repository root with:
+
+    python -m pytest benchmarks/test_micro.py --benchmark-autosave
+
+which stores the results under .benchmarks/ (named after the current commit). Compare runs with:
+
+    python -m pytest benchmarks/test_micro.py --benchmark-compare
+    pytest-benchmark compare --columns=min,mean,stddev
+"""
+
+import tracemalloc
+from typing import Callable
+
+import pytest
+from datapipelines import validate_query
+
+from lissandra.core.league import LeagueEntry, LeagueEntryData
+from lissandra.core.staticdata.profileicon import ProfileIconData
+from lissandra.datastores.riotapi.leagues import LeaguesAPI
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.datastores.util import convert_region_to_platform
+from lissandra.dto.league import LeagueEntriesDto
+from lissandra.dto.staticdata.profileicon import ProfileIconDataDto
+from lissandra.transformers.leagues import LeagueTransformer
+from lissandra.transformers.staticdata import StaticDataTransformer
+
+from .mockserver import profile_icons_payload
+from .transformers import make_challenger_dto, make_entry
+
+pytest.importorskip("pytest_benchmark")
+
+N_CHALLENGER_ENTRIES = 300
+N_PAGE_ENTRIES = 200
+N_PROFILE_ICONS = 1000
+N_QUERIES = 1000
+
+
+def measure(benchmark, function: Callable, n_elements: int):
+    """Benchmarks `function`, and adds its memory use per element to the stored results."""
+    tracemalloc.start()
+    result = function()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    blocks = sum(statistic.count for statistic in snapshot.statistics("filename"))
+    benchmark.extra_info["elements"] = n_elements
+    benchmark.extra_info["allocated_blocks_per_element"] = blocks / n_elements
+    benchmark.extra_info["peak_bytes_per_element"] = peak / n_elements
+    return benchmark(function)
+
+
+def make_page_dto() -> LeagueEntriesDto:
+    entries = [make_entry(i) for i in range(N_PAGE_ENTRIES)]
+    for entry in entries:
+        entry.update({"leagueId": "league-GOLD-I", "queueType": "RANKED_TFT", "tier": "GOLD"})
+    return LeagueEntriesDto(
+        {"region": "EUW", "queue": "RANKED_TFT", "tier": "GOLD", "division": "I", "page": 1, "entries": entries}
+    )
+
+
+def make_profile_icons_dto() -> ProfileIconDataDto:
+    body = profile_icons_payload(N_PROFILE_ICONS)
+    body.update({"region": "EUW", "locale": "en_GB"})
+    for icon in body["data"].values():
+        icon.update({"region": "EUW", "version": body["version"], "locale": "en_GB"})
+    return ProfileIconDataDto(body)
+
+
+# LeagueTransformer
+
+
+def test_challenger_league_dto_to_data(benchmark):
+    transformer, dto = LeagueTransformer(), make_challenger_dto()
+    data = measure(benchmark, lambda: transformer.challenger_league_list_dto_to_data(dto), N_CHALLENGER_ENTRIES)
+    assert len(data.entries) == N_CHALLENGER_ENTRIES
+
+
+def test_challenger_league_data_to_core(benchmark):
+    transformer = LeagueTransformer()
+    data = transformer.challenger_league_list_dto_to_data(make_challenger_dto())
+    # `entries` is built lazily, so include it
+    entries = measure(
+        benchmark, lambda: transformer.challenger_league_list_data_to_core(data).entries, N_CHALLENGER_ENTRIES
+    )
+    assert len(entries) == N_CHALLENGER_ENTRIES
+
+
+def test_league_entries_dto_to_data(benchmark):
+    transformer, dto = LeagueTransformer(), make_page_dto()
+    data = measure(benchmark, lambda: transformer.leagues_entries_dto_to_data(dto), N_PAGE_ENTRIES)
+    assert len(data) == N_PAGE_ENTRIES
+
+
+# Core objects and their data
+
+
+def test_league_entry_from_data(benchmark):
+    data = LeagueTransformer().leagues_entries_dto_to_data(make_page_dto())
+    entries = measure(
+        benchmark, lambda: [LeagueEntry.from_data(entry, loaded_groups={LeagueEntryData}) for entry in data], len(data)
+    )
+    assert entries[0].tier is not None
+
+
+def test_cassiopeia_object_init(benchmark):
+    # `_construct_normally` skips the pipeline lookup, so this is just `__init__`
+    entries = measure(
+        benchmark,
+        lambda: [LeagueEntry._construct_normally(region="EUW") for _ in range(N_PAGE_ENTRIES)],
+        N_PAGE_ENTRIES,
+    )
+    assert len(entries) == N_PAGE_ENTRIES
+
+
+def test_core_data_call(benchmark):
+    entries = make_challenger_dto()["entries"]
+    data = measure(benchmark, lambda: [LeagueEntryData(**entry) for entry in entries], len(entries))
+    assert data[0].summonerId == "summoner-0"
+
+
+def test_profile_icons_dto_to_data(benchmark):
+    transformer, dto = StaticDataTransformer(), make_profile_icons_dto()
+    data = measure(benchmark, lambda: transformer.profile_icon_data_dto_to_data(dto), N_PROFILE_ICONS)
+    assert len(data) == N_PROFILE_ICONS
+
+
+def test_profile_icon_data(benchmark):
+    icons = list(make_profile_icons_dto()["data"].values())
+    data = measure(benchmark, lambda: [ProfileIconData(**icon) for icon in icons], N_PROFILE_ICONS)
+    assert data[0].id == 0
+
+
+# validate_query
+
+
+@validate_query(SummonerAPI._validate_get_summoner_query, convert_region_to_platform)
+def validated_summoner_query(self, query, context=None):
+    return query
+
+
+@validate_query(LeaguesAPI._validate_get_league_entries_query, convert_region_to_platform)
+def validated_league_entries_query(self, query, context=None):
+    return query
+
+
+def test_validate_summoner_query(benchmark):
+    queries = measure(
+        benchmark,
+        lambda: [validated_summoner_query(None, {"name": "Crimack", "region": "EUW"}) for _ in range(N_QUERIES)],
+        N_QUERIES,
+    )
+    assert queries[0]["platform"].value == "EUW1"
+
+
+def test_validate_league_entries_query(benchmark):
+    queries = measure(
+        benchmark,
+        lambda: [
+            validated_league_entries_query(None, {"tier": "GOLD", "division": "I", "page": 1, "region": "EUW"})
+            for _ in range(N_QUERIES)
+        ],
+        N_QUERIES,
+    )
+    assert queries[0]["platform"].value == "EUW1"
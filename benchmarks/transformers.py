@@ -0,0 +1,91 @@
+"""Measures how long the league transformers take per entry.
+
+Run from the repository root with:
+
+    python -m benchmarks.transformers
+"""
+
+import timeit
+
+from lissandra.dto.league import ChallengerLeagueListDto, LeagueEntriesDto, LeagueSummonerEntriesDto
+from lissandra.transformers.leagues import LeagueTransformer
+
+N_ENTRIES = 300
+
+
+def make_entry(i: int) -> dict:
+    return {
+        "summonerId": "summoner-{}".format(i),
+        "summonerName": "Summoner {}".format(i),
+        "leaguePoints": 1000 - i,
+        "rank": "I",
+        "wins": 200,
+        "losses": 150,
+        "veteran": True,
+        "inactive": False,
+        "freshBlood": False,
+        "hotStreak": bool(i % 2),
+        "region": "EUW",
+    }
+
+
+def make_challenger_dto() -> ChallengerLeagueListDto:
+    return ChallengerLeagueListDto(
+        {
+            "tier": "CHALLENGER",
+            "leagueId": "5d24b9a1-6667-4445-bc51-fa28e5b293cb",
+            "queue": "RANKED_TFT",
+            "name": "Challenger",
+            "region": "EUW",
+            "entries": [make_entry(i) for i in range(N_ENTRIES)],
+        }
+    )
+
+
+def make_entries_dto() -> LeagueEntriesDto:
+    return LeagueEntriesDto(
+        {
+            "region": "EUW",
+            "queue": "RANKED_TFT",
+            "tier": "GOLD",
+            "division": "I",
+            "page": 1,
+            "entries": [make_entry(i) for i in range(N_ENTRIES)],
+        }
+    )
+
+
+def make_summoner_entries_dto() -> LeagueSummonerEntriesDto:
+    return LeagueSummonerEntriesDto(
+        {"summonerId": "summoner-0", "region": "EUW", "entries": [make_entry(i) for i in range(N_ENTRIES)]}
+    )
+
+
+def report(name: str, function, number: int = 20) -> None:
+    seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+    print("{:<45} {:>8.2f} us/entry".format(name, seconds / N_ENTRIES * 1e6))
+
+
+def main():
+    transformer = LeagueTransformer()
+
+    challenger = transformer.challenger_league_list_dto_to_data(make_challenger_dto())
+    report(
+        "ChallengerLeagueListData -> ChallengerLeague",
+        lambda: transformer.challenger_league_list_data_to_core(challenger),
+    )
+
+    entries = transformer.leagues_entries_dto_to_data(make_entries_dto())
+    report(
+        "LeagueEntryData -> LeagueEntry", lambda: [transformer.league_entry_data_to_core(entry) for entry in entries]
+    )
+
+    summoner_entries = make_summoner_entries_dto()
+    report(
+        "LeagueSummonerEntriesDto -> Data",
+        lambda: transformer.leagues_summoner_entries_dto_to_data(summoner_entries),
+    )
+
+
+if __name__ == "__main__":
+    main()
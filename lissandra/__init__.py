@@ -11,6 +11,8 @@ from .core import (
     LeagueEntries,
     LeagueSummonerEntries,
     Locales,
+    Match,
+    MatchHistory,
     MasterLeague,
     Patch,
     ProfileIcon,
@@ -31,18 +33,21 @@ from .lissandra import (
     get_league_entries,
     get_locales,
     get_master_league,
+    get_match,
+    get_match_history,
+    get_matches,
     get_paginated_league_entries,
     get_profile_icons,
+    get_rate_limits,
     get_realms,
     get_status,
     get_summoner,
+    get_summoners,
     get_verification_string,
     get_version,
     get_versions,
+    monitor_rate_limits,
     print_calls,
     set_default_region,
     set_riot_api_key,
 )
-
-print(configuration.settings.__dict__)
-apply_settings(configuration.settings)
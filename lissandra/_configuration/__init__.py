@@ -26,9 +26,10 @@ class LissandraConfiguration(object, metaclass=MetaConfiguration):
     @property
     def settings(self):
         if self._settings is None:
-            config = load_config()  # Use default
-            settings = Settings(config)
-            self._settings = settings
+            # The default settings are applied on first use rather than when lissandra is imported
+            from ..lissandra import apply_settings
+
+            apply_settings(load_config())  # Use default
         return self._settings
 
 
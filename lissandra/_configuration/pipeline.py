@@ -0,0 +1,296 @@
+import sys
+from contextlib import ExitStack
+from typing import Iterator, TypeVar, Type, Mapping, Any, Iterable, List, Tuple, Callable, Optional, Sequence, Union
+
+from datapipelines import DataPipeline, DataSource, DataSink, DataTransformer, CompositeDataSource, NotFoundError
+from datapipelines.pipelines import NoConversionError, _SinkHandler, _identity
+
+from ..datastores.util import PartialNotFoundError, list_many_query
+from .. import deadlines, tracing
+
+T = TypeVar("T")
+
+# (sink.put or sink.put_many, the type the sink stores, the transform to that type)
+_SinkRoute = Tuple[Callable, Type, Callable]
+# (source.get or source.get_many, the type the source provides, the transform to the requested type,
+#  sinks to put the result in before it's transformed, sinks to put the result in after it's transformed)
+_Route = Tuple[Callable, Type, Callable, Tuple[_SinkRoute, ...], Tuple[_SinkRoute, ...]]
+
+
+def _provides_many(source: DataSource, type: Type) -> bool:
+    """Whether `source.get_many` can actually handle `type` (rather than falling through to the unregistered default)."""
+    if isinstance(source, CompositeDataSource):
+        return any(_provides_many(child, type) for child in source._sources.get(type, ()))
+    try:
+        return type in source.__class__.get_many._provides
+    except AttributeError:
+        # Not a dispatching source, so it handles whatever it's asked for
+        return True
+
+
+def _compile_sinks(handlers: Iterable[_SinkHandler], many: bool, traced: bool) -> Tuple[_SinkRoute, ...]:
+    routes = []
+    for handler in handlers:
+        put = handler._sink.put_many if many else handler._sink.put
+        transform = handler._transform
+        if traced:
+            put = _traced_put(put, handler._sink, many)
+            transform = _traced_transform(transform)
+        routes.append((put, handler._store_type, transform))
+    return tuple(routes)
+
+
+def _traced_get(get: Callable, source: DataSource, many: bool) -> Callable:
+    name = "datastore.get_many" if many else "datastore.get"
+    datastore = source.__class__.__name__
+
+    def traced_get(type: Type[T], query: Mapping[str, Any], context):
+        with tracing.span(name, {"lissandra.datastore": datastore, "lissandra.type": type.__name__}) as span:
+            try:
+                result = get(type, query, context)
+            except PartialNotFoundError:
+                span.set_attribute("lissandra.result", "partial")
+                raise
+            except NotFoundError:
+                span.set_attribute("lissandra.result", "miss")
+                raise
+            span.set_attribute("lissandra.result", "hit")
+            return result
+
+    traced_get.datastore = datastore
+    # Sources that are also sinks (like the `Cache`) only have what was put in them, so they count as caches
+    traced_get.cache = isinstance(source, DataSink)
+    return traced_get
+
+
+def _traced_put(put: Callable, sink: DataSink, many: bool) -> Callable:
+    name = "datastore.put_many" if many else "datastore.put"
+    datastore = sink.__class__.__name__
+
+    def traced_put(type: Type[T], item: Any, context):
+        with tracing.span(name, {"lissandra.datastore": datastore, "lissandra.type": type.__name__}):
+            return put(type, item, context)
+
+    return traced_put
+
+
+def _traced_transform(transform: Callable) -> Callable:
+    if transform is _identity:
+        return transform
+
+    def traced_transform(data: Any, context):
+        with tracing.span("transform", {"lissandra.from": data.__class__.__name__}) as span:
+            result = transform(data=data, context=context)
+            span.set_attribute("lissandra.to", result.__class__.__name__)
+            return result
+
+    return traced_transform
+
+
+class _TracedStream(object):
+    """Iterates over a streamed `get_many` result, whose items are loaded as they're iterated over, and ends the
+    `pipeline.get_many` span (held open by `span`) once they've all been loaded, or the result is closed.
+    """
+
+    def __init__(self, items: Iterator[T], span: ExitStack):
+        self._items = items
+        self._span = span
+
+    def __iter__(self) -> "_TracedStream":
+        return self
+
+    def __next__(self) -> T:
+        try:
+            return next(self._items)
+        except StopIteration:
+            self._span.close()
+            raise
+        except BaseException:
+            self._span.__exit__(*sys.exc_info())
+            raise
+
+    def close(self) -> None:
+        close = getattr(self._items, "close", None)
+        if close is not None:
+            close()
+        self._span.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+class CompiledDataPipeline(DataPipeline):
+    """A `DataPipeline` that compiles the sources, transformers and sinks for each requested type into a flat route
+    table the first time that type is requested, and then just walks the table.
+
+    The pipelines we build never change after `create_pipeline`, so the routes never need to be invalidated. Unlike
+    `DataPipeline`, this doesn't format log messages (which call `str` on every result) or deep copy the query for
+    each source; sources get a shallow copy, as they only ever replace top level keys.
+
+    Routes are keyed by the requested type alone, because the query doesn't change which sources can be asked: a
+    source that can't handle a query fails validation rather than being skipped. While tracing is on, a second set of
+    routes is used whose steps are wrapped in spans, so that the untraced routes don't pay for it.
+
+    `get` and `get_many` take an optional `deadline` (a `time.monotonic()` time), which bounds the rate limiter waits,
+    HTTP requests and retries made for the call; see `lissandra.deadlines`.
+    """
+
+    def __init__(
+        self, elements: Sequence[Union[DataSource, DataSink]], transformers: Iterable[DataTransformer] = None
+    ) -> None:
+        super().__init__(elements, transformers)
+        self._get_routes = {}
+        self._get_many_routes = {}
+        self._traced_get_routes = {}
+        self._traced_get_many_routes = {}
+
+    def _compile_routes(self, type: Type[T], many: bool, traced: bool) -> Optional[List[_Route]]:
+        try:
+            handlers = self._get_handlers(type)
+        except NoConversionError:
+            return None
+        routes = []
+        for handler in handlers:
+            source = handler._source
+            if many and not _provides_many(source, handler._source_type):
+                continue
+            get = source.get_many if many else source.get
+            transform = handler._transform
+            if traced:
+                get = _traced_get(get, source, many)
+                transform = _traced_transform(transform)
+            routes.append(
+                (
+                    get,
+                    handler._source_type,
+                    transform,
+                    _compile_sinks(handler._before_transform, many, traced),
+                    _compile_sinks(handler._after_transform, many, traced),
+                )
+            )
+        return routes or None
+
+    def _routes(self, type: Type[T], many: bool, traced: bool = False) -> List[_Route]:
+        if traced:
+            route_table = self._traced_get_many_routes if many else self._traced_get_routes
+        else:
+            route_table = self._get_many_routes if many else self._get_routes
+        try:
+            routes = route_table[type]
+        except KeyError:
+            routes = route_table[type] = self._compile_routes(type, many, traced)
+        if routes is None:
+            raise NoConversionError('No source can provide "{type}"'.format(type=type.__name__))
+        return routes
+
+    def get(self, type: Type[T], query: Mapping[str, Any], deadline: float = None) -> T:
+        if deadline is not None:
+            with deadlines.deadline(at=deadline):
+                return self.get(type, query)
+        if tracing._tracer is None:
+            return self._get(self._routes(type, many=False), query)
+        with tracing.span("pipeline.get", tracing.query_attributes(type, query)) as span:
+            return self._get(self._routes(type, many=False, traced=True), query, span)
+
+    def _get(self, routes: List[_Route], query: Mapping[str, Any], span=None) -> T:
+        context = self._new_context()
+        for get, source_type, transform, before_transform, after_transform in routes:
+            try:
+                result = get(source_type, dict(query), context)
+                for put, store_type, to_store_type in before_transform:
+                    put(store_type, to_store_type(data=result, context=context), context)
+                result = transform(data=result, context=context)
+                for put, store_type, to_store_type in after_transform:
+                    put(store_type, to_store_type(data=result, context=context), context)
+                if span is not None:
+                    span.set_attribute("lissandra.datastore", get.datastore)
+                    span.set_attribute("lissandra.cache", "hit" if get.cache else "miss")
+                return result
+            except NotFoundError:
+                pass
+
+        raise NotFoundError("No source returned a query result!")
+
+    def get_many(
+        self, type: Type[T], query: Mapping[str, Any], streaming: bool = False, deadline: float = None
+    ) -> Iterable[T]:
+        # Every source is asked for the same identifiers, in the same order, so a set or generator is only read once
+        query = list_many_query(query)
+        if deadline is not None:
+            # A streamed result is loaded as it's iterated over, after this returns, so only its first request is bounded
+            with deadlines.deadline(at=deadline):
+                return self.get_many(type, query, streaming)
+        if tracing._tracer is None:
+            return self._get_many(self._routes(type, many=True), query, streaming)
+        with ExitStack() as span:
+            span.enter_context(tracing.span("pipeline.get_many", tracing.query_attributes(type, query)))
+            result = self._get_many(self._routes(type, many=True, traced=True), query, streaming)
+            if not streaming:
+                return result
+            return _TracedStream(result, span.pop_all())
+
+    def _get_many(self, routes: List[_Route], query: Mapping[str, Any], streaming: bool) -> Iterable[T]:
+        context = self._new_context()
+        # When a source can only find some of the items, the rest are asked for from the following sources and merged
+        # back into `merged` (at the positions in `missing`), so that the results stay in the requested order.
+        merged = None  # type: Optional[List[T]]
+        missing = None  # type: Optional[List[int]]
+        errors = {}  # The errors that sources reported for the items at each position of `merged`
+        for get_many, source_type, transform, before_transform, after_transform in routes:
+            try:
+                result = get_many(source_type, dict(query), context)
+                if streaming and merged is None:
+                    return self._get_many_generator(result, transform, before_transform, after_transform, context)
+                result = self._process_many(list(result), transform, before_transform, after_transform, context)
+            except PartialNotFoundError as error:
+                found = [position for position, item in enumerate(error.results) if item is not None]
+                items = self._process_many(
+                    [error.results[position] for position in found],
+                    transform,
+                    before_transform,
+                    after_transform,
+                    context,
+                )
+                if merged is None:
+                    merged = [None] * len(error.results)
+                    missing = list(range(len(error.results)))
+                for position, item in zip(found, items):
+                    merged[missing[position]] = item
+                for position, item_error in error.errors.items():
+                    errors[missing[position]] = item_error
+                missing = [missing[position] for position in error.missing]
+                query = error.missing_query
+                continue
+            except NotFoundError:
+                continue
+
+            if merged is not None:
+                for position, item in zip(missing, result):
+                    merged[position] = item
+                result = merged
+            return iter(result) if streaming else result
+
+        if merged is not None:
+            errors = {position: errors[position] for position in missing if position in errors}
+            raise PartialNotFoundError(merged, missing, query, errors)
+        raise NotFoundError("No source returned a query result!")
+
+    @staticmethod
+    def _process_many(result, transform, before_transform, after_transform, context):
+        for put_many, store_type, to_store_type in before_transform:
+            put_many(store_type, (to_store_type(data=item, context=context) for item in result), context)
+        result = [transform(data=item, context=context) for item in result]
+        for put_many, store_type, to_store_type in after_transform:
+            put_many(store_type, (to_store_type(data=item, context=context) for item in result), context)
+        return result
+
+    @staticmethod
+    def _get_many_generator(result, transform, before_transform, after_transform, context):
+        # Streaming results are put into the sinks one at a time, so we need the single item `put`s.
+        for item in result:
+            for put_many, store_type, to_store_type in before_transform:
+                put_many(store_type, [to_store_type(data=item, context=context)], context)
+            item = transform(data=item, context=context)
+            for put_many, store_type, to_store_type in after_transform:
+                put_many(store_type, [to_store_type(data=item, context=context)], context)
+            yield item
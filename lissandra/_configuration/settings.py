@@ -1,19 +1,21 @@
-from typing import TypeVar, Type, Dict, Union, List
+from typing import TYPE_CHECKING, TypeVar, Type, Dict, Union, List, Any
 import logging
 import importlib
 import inspect
 import copy
 
-from datapipelines import DataPipeline, DataSink, DataSource, CompositeDataTransformer, DataTransformer
-
 from ..data import Region, Platform
 
+if TYPE_CHECKING:
+    from datapipelines import DataPipeline, DataTransformer
+
 T = TypeVar("T")
 
-logging.basicConfig(format="%(asctime)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S", level=logging.WARNING)
 
+def create_pipeline(service_configs: Dict, verbose: int = 0) -> "DataPipeline":
+    from datapipelines import DataSink, DataSource
+    from .pipeline import CompiledDataPipeline
 
-def create_pipeline(service_configs: Dict, verbose: int = 0) -> DataPipeline:
     transformers = []
 
     # Always use the Riot API transformers
@@ -56,7 +58,7 @@ def create_pipeline(service_configs: Dict, verbose: int = 0) -> DataPipeline:
             services.insert(0, UnloadedGhostStore())
 
     services.append(MerakiAnalyticsCDN())
-    pipeline = DataPipeline(services, transformers)
+    pipeline = CompiledDataPipeline(services, transformers)
 
     # Manually put the cache on the pipeline.
     for datastore in services:
@@ -85,7 +87,7 @@ def create_pipeline(service_configs: Dict, verbose: int = 0) -> DataPipeline:
     return pipeline
 
 
-def register_transformer_conversion(transformer: DataTransformer, from_type, to_type):
+def register_transformer_conversion(transformer: "DataTransformer", from_type, to_type):
     # Find the method that takes a `from_type` and returns a `to_type` and register it
     methods = inspect.getmembers(transformer, predicate=inspect.ismethod)
     for name, method in methods:
@@ -115,6 +117,7 @@ def get_default_config():
 
 class Settings(object):
     def __init__(self, settings):
+        logging.basicConfig(format="%(asctime)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S", level=logging.WARNING)
         _defaults = get_default_config()
         globals_ = settings.get("global", _defaults["global"])
         self.__version_from_match = globals_.get(
@@ -147,7 +150,7 @@ class Settings(object):
         self.__default_region = region
 
     @property
-    def pipeline(self) -> DataPipeline:
+    def pipeline(self) -> "DataPipeline":
         if self.__pipeline is None:
             self.__pipeline = create_pipeline(service_configs=self.__pipeline_args, verbose=0)
         return self.__pipeline
@@ -176,6 +179,16 @@ class Settings(object):
                 if isinstance(source, RiotAPI):
                     source.set_api_key(key)
 
+    def rate_limits(self) -> List[Dict[str, Any]]:
+        from ..datastores.riotapi import RiotAPI
+
+        snapshots = []
+        for sources in self.pipeline._sources:
+            for source in sources:
+                if isinstance(source, RiotAPI):
+                    snapshots.extend(source.rate_limits())
+        return snapshots
+
     def clear_sinks(self, type: Type[T] = None):
         types = {type}
         if type is not None:
@@ -192,6 +205,10 @@ class Settings(object):
             for type in types:
                 sink.clear(type)
 
+        from ..core.common import clear_latest_versions
+
+        clear_latest_versions()
+
     def expire_sinks(self, type: Type[T] = None):
         types = {type}
         if type is not None:
@@ -207,3 +224,7 @@ class Settings(object):
         for sink in self.pipeline._sinks:
             for type in types:
                 sink.expire(type)
+
+        from ..core.common import clear_latest_versions
+
+        clear_latest_versions()
@@ -4,3 +4,4 @@ from .league import League, ChallengerLeague, GrandmasterLeague, MasterLeague, L
 from .patch import Patch
 from .thirdpartycode import VerificationString
 from .summoner import Summoner
+from .match import Match, MatchHistory
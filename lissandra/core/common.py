@@ -1,21 +1,28 @@
 from abc import abstractmethod, abstractclassmethod
+import copy
 import types
-from typing import Mapping, Set, Union, Optional, Type, Generator
+from typing import Any, BinaryIO, Callable, Dict, Mapping, Set, Tuple, Union, Optional, Type, Generator
 import functools
 import logging
+import sys
+import time
 from enum import Enum
-import arrow
 import datetime
 import inspect
 
 from merakicommons.ghost import Ghost, ghost_load_on as _ghost_load_on
-from merakicommons.container import SearchableLazyList
 
 from .. import configuration
 from ..data import Region, Platform
+from .container import IndexedSearchableLazyList
 
 import json  # Can't use ujson here because of the encoder
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 LOGGER = logging.getLogger("core")
 
@@ -57,16 +64,54 @@ def provide_default_region(method):
     return default_region_wrapper
 
 
+# Region -> (the pipeline it was fetched with, when it expires, Realms)
+_latest_realms = {}
+
+
 def get_latest_version(region: Union[Region, str], endpoint: Optional[str]):
     from .staticdata.realm import Realms
 
+    if not isinstance(region, Region):
+        region = Region(region)
+    # Realms is memoized per region (for as long as the cache would keep it) so that constructing objects that need a
+    # version doesn't require a trip through the pipeline every time.
+    pipeline = configuration.settings.pipeline
+    now = time.monotonic()
+    try:
+        fetched_with, expires, realms = _latest_realms[region]
+        if fetched_with is not pipeline or now >= expires:
+            raise KeyError(region)
+    except KeyError:
+        realms = Realms(region=region)
+        _latest_realms[region] = (pipeline, now + _get_realms_ttl(pipeline), realms)
+
     if endpoint is not None:
-        return Realms(region=region).latest_versions[endpoint]
+        return realms.latest_versions[endpoint]
     else:
-        return Realms(region=region).version
+        return realms.version
+
+
+def _get_realms_ttl(pipeline) -> float:
+    from .staticdata.realm import Realms
+    from ..datastores.cache import default_expirations
+
+    cache = getattr(pipeline, "_cache", None)
+    ttl = default_expirations[Realms] if cache is None else cache._expirations.get(Realms, -1)
+    if isinstance(ttl, datetime.timedelta):
+        ttl = ttl.total_seconds()
+    if ttl == -1:  # Never expires
+        return float("inf")
+    return ttl
+
+
+def clear_latest_versions() -> None:
+    """Forgets the memoized latest versions, e.g. because the cached Realms have been cleared."""
+    _latest_realms.clear()
 
 
 class CoreData(object):
+    __slots__ = ()
+
     @property
     @abstractclassmethod
     def _renamed(cls) -> Mapping[str, str]:
@@ -82,25 +127,111 @@ class CoreData(object):
         return self
 
     def to_dict(self):
-        d = {}
-        attrs = {attrname for attrname in dir(self)} - {attrname for attrname in dir(self.__class__)}
-        for attr in attrs:
-            v = getattr(self, attr)
-            if isinstance(v, CoreData):
-                v = v.to_dict()
-            elif hasattr(v, "__iter__") and not isinstance(v, str):
-                if isinstance(v, dict):
-                    new_v = {}
-                    for k, vi in v.items():
-                        if isinstance(vi, CoreData):
-                            new_v[k] = vi.to_dict()
-                        else:
-                            new_v[k] = vi
-                    v = new_v
-                else:
-                    v = [vi.to_dict() if isinstance(vi, CoreData) else vi for vi in v]
-            d[attr] = v
-        return d
+        return _data_serializer(self.__class__)(self)
+
+
+# Python only shares the ints up to 256. The win, loss and LP counts in `SlottedCoreData._interned` fields go higher, so
+# they share these instead; larger ints are kept as they are.
+_SHARED_INTS = tuple(range(2048))
+
+
+class _CoreDataSchema(type):
+    """Metaclass for `SlottedCoreData`. Turns the `_fields` a class declares (using the DTO names) into `__slots__`,
+    with `_renamed` already applied, so instances don't need a per-instance `__dict__`. `_interned` is renamed the same
+    way.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        slots = []
+        for base in bases:
+            for attr in getattr(base, "_slots", ()):
+                if attr not in slots:
+                    slots.append(attr)
+        if "__slots__" not in namespace:
+            renamed = namespace.get("_renamed")
+            if renamed is None:
+                renamed = next(
+                    (base._renamed for base in bases if isinstance(getattr(base, "_renamed", None), dict)), {}
+                )
+            new_slots = []
+            for field in namespace.get("_fields", ()):
+                attr = renamed.get(field, field)
+                if attr not in slots and attr not in new_slots:
+                    new_slots.append(attr)
+            namespace["__slots__"] = tuple(new_slots)
+            slots.extend(new_slots)
+        namespace["_slots"] = tuple(slots)
+        if "_interned" in namespace:
+            renamed = namespace.get("_renamed")
+            if renamed is None:
+                renamed = next(
+                    (base._renamed for base in bases if isinstance(getattr(base, "_renamed", None), dict)), {}
+                )
+            namespace["_interned"] = frozenset(renamed.get(field, field) for field in namespace["_interned"])
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class SlottedCoreData(CoreData, metaclass=_CoreDataSchema):
+    """A `CoreData` with a declared schema.
+
+    Subclasses list the fields of their DTO in `_fields`; these become `__slots__` (under their `_renamed` names), so
+    instances don't have a `__dict__`, and `to_dict` walks the schema instead of diffing `dir()`. Fields that aren't
+    declared (e.g. ones Riot adds to an endpoint later) are still accepted by `__call__` and are kept in a small
+    overflow dict, which is only created if one is set.
+
+    Fields listed in `_interned` hold values that many instances share (a tier, a league id, a number of wins). Their
+    strings are interned, and their ints below 2048 are taken from a fixed table, so that each distinct value is kept
+    once rather than once per instance.
+    """
+
+    __slots__ = ("_extra",)
+    _renamed = {}
+    _fields = ()
+    _interned = ()
+
+    def __call__(self, **kwargs):
+        renamed = self._renamed
+        interned = self._interned
+        for key, value in kwargs.items():
+            key = renamed.get(key, key)
+            if key in interned:
+                if type(value) is str:
+                    value = sys.intern(value)
+                elif type(value) is int and 0 <= value < len(_SHARED_INTS):
+                    value = _SHARED_INTS[value]
+            try:
+                setattr(self, key, value)
+            except AttributeError:
+                try:
+                    self._extra[key] = value
+                except AttributeError:
+                    self._extra = {key: value}
+        return self
+
+    def __copy__(self):
+        # The default copy would share the overflow dict, so setting an undeclared field on the copy would change this
+        # one too
+        cls = self.__class__
+        copied = cls.__new__(cls)
+        for attr in cls._slots:
+            try:
+                object.__setattr__(copied, attr, object.__getattribute__(self, attr))
+            except AttributeError:
+                pass
+        try:
+            copied._extra = dict(object.__getattribute__(self, "_extra"))
+        except AttributeError:
+            pass
+        return copied
+
+    def __getattr__(self, name):
+        # Only called when `name` isn't a set slot, so we just need to check the fields we didn't know about.
+        if name != "_extra":
+            try:
+                return self._extra[name]
+            except (AttributeError, KeyError):
+                pass
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
 
 
 class CoreDataList(list, CoreData):
@@ -119,28 +250,39 @@ class CassiopeiaObject(object):
         # Note: Dto names are not allowed to be passed in.
         self._data = {_type: None for _type in self._data_types}
         # Re-implement __call__ code here so that __call__ can be overridden in subclasses
-        results = {_type: {} for _type in self._data_types}
-        found = False
+        for _type, insert_this in self._route_kwargs(kwargs).items():
+            self._data[_type] = _type(**insert_this)
+
+    @classmethod
+    def _route_kwargs(cls, kwargs: Mapping[str, Any]) -> Dict[type, Dict[str, Any]]:
+        """Splits `kwargs` up by the data type(s) that accept each key.
+
+        Which types accept a key only depends on the class, so the answer is computed once per (class, key) and cached
+        on the class.
+        """
+        try:
+            routes = cls.__dict__["_key_routes"]
+        except KeyError:
+            routes = {}
+            cls._key_routes = routes
+        results = {_type: {} for _type in cls._data_types}
         for key, value in kwargs.items():
-            # We don't know which type to put the piece of data under, so put it in any type that supports this key
-            for _type in self._data_types:
-                if issubclass(_type, CoreData) or key in dir(_type):
-                    results[_type][key] = value
-                    found = True
-            if not found:
+            try:
+                types = routes[key]
+            except KeyError:
+                # We don't know which type to put the piece of data under, so put it in any type that supports this key
+                types = tuple(_type for _type in cls._data_types if issubclass(_type, CoreData) or key in dir(_type))
+                routes[key] = types
+            if not types:
                 # The user passed in a value that we don't know anything about -- raise a warning.
                 LOGGER.warning(
                     "When initializing {}, key `{}` is not in type(s) {}. Not set.".format(
-                        self.__class__.__name__, key, self._data_types
+                        cls.__name__, key, cls._data_types
                     )
                 )
-
-        # Now that we've parsed the data and know where to put it all, we can update our data.
-        for _type, insert_this in results.items():
-            if self._data[_type] is not None:
-                self._data[_type] = self._data[_type](**insert_this)
-            else:
-                self._data[_type] = _type(**insert_this)
+            for _type in types:
+                results[_type][key] = value
+        return results
 
     def __str__(self) -> str:
         # This is a bit strange because we'll print a list of dict-like objects rather than one joined dict, but we've decided it's appropriate.
@@ -176,28 +318,15 @@ class CassiopeiaObject(object):
                 champion(champData={"tags"}).tags  # only pulls the tag data
         """
         # Update underlying data and deconstruct any Enums the user passed in.
-        results = {_type: {} for _type in self._data_types}
-        found = False
-        for key, value in kwargs.items():
-            # We don't know which type to put the piece of data under, so put it in any type that supports this key
-            for _type in self._data_types:
-                if issubclass(_type, CoreData) or key in dir(_type):
-                    results[_type][key] = value
-                    found = True
-            if not found:
-                # The user passed in a value that we don't know anything about -- raise a warning.
-                LOGGER.warning(
-                    "When initializing {}, key `{}` is not in type(s) {}. Not set.".format(
-                        self.__class__.__name__, key, self._data_types
-                    )
-                )
-
+        results = self._route_kwargs(kwargs)
         # Now that we've parsed the data and know where to put it all, we can update our data.
+        # Data objects aren't copied when they're transformed into core objects, so they can be shared (e.g. with the
+        # object in the cache). Copy on write rather than updating them in place.
         for _type, insert_this in results.items():
-            if self._data[_type] is not None:
-                self._data[_type] = self._data[_type](**insert_this)
-            else:
+            if self._data[_type] is None:
                 self._data[_type] = _type(**insert_this)
+            elif insert_this:
+                self._data[_type] = copy.copy(self._data[_type])(**insert_this)
         return self
 
     def to_dict(self):
@@ -207,20 +336,33 @@ class CassiopeiaObject(object):
             d.update(new)
         return d
 
-    def to_json(self, **kwargs):
+    def to_json(self, **kwargs) -> str:
         return json.dumps(self.to_dict(), cls=CassiopeiaJsonEncoder, **kwargs)
 
+    def to_json_bytes(self) -> bytes:
+        """Like `to_json`, but returns compact, UTF-8 encoded JSON, and uses orjson (which is faster) if it's
+        installed.
+        """
+        return _dumps(self)
+
     def __json__(self, **kwargs):
         return self.to_json(**kwargs)
 
 
 class GetFromPipeline(type):
     def __call__(cls: "CassiopeiaPipelineObject", *args, **kwargs):
-        if "region" in inspect.signature(cls.__get_query_from_kwargs__).parameters:
+        try:
+            takes_region, needs_version = cls.__dict__["_pipeline_call_plan"]
+        except KeyError:
+            # This only depends on the class, so work it out once rather than inspecting it on every construction.
+            takes_region = "region" in inspect.signature(cls.__get_query_from_kwargs__).parameters
+            needs_version = hasattr(cls, "version") and cls.__name__ not in ["Realms", "Match"]
+            cls._pipeline_call_plan = (takes_region, needs_version)
+        if takes_region:
             kwargs = add_region_to_kwargs(kwargs)
         pipeline = configuration.settings.pipeline
         query = cls.__get_query_from_kwargs__(**kwargs)
-        if hasattr(cls, "version") and query.get("version", None) is None and cls.__name__ not in ["Realms", "Match"]:
+        if needs_version and query.get("version", None) is None:
             query["version"] = get_latest_version(region=query["region"], endpoint=None)
         return pipeline.get(cls, query=query)
 
@@ -290,7 +432,7 @@ class CassiopeiaGhost(CassiopeiaPipelineObject, Ghost):
             if (
                 hasattr(self.__class__, "version")
                 and "version" not in query
-                and not self.__class__.__name__ == "Realms"
+                and self.__class__.__name__ not in ["Realms", "Match"]
             ):
                 query["version"] = get_latest_version(region=query["region"], endpoint=None)
             data = configuration.settings.pipeline.get(type=self._load_types[load_group], query=query)
@@ -334,7 +476,7 @@ class CassiopeiaGhost(CassiopeiaPipelineObject, Ghost):
         self._data[load_group] = data
 
 
-class CassiopeiaLazyList(SearchableLazyList, CassiopeiaPipelineObject):
+class CassiopeiaLazyList(IndexedSearchableLazyList, CassiopeiaPipelineObject):
     def __init__(self, *args, **kwargs):
         if "generator" in kwargs:
             generator = kwargs.pop("generator")
@@ -348,7 +490,7 @@ class CassiopeiaLazyList(SearchableLazyList, CassiopeiaPipelineObject):
                         yield arg
 
                 generator = generator(args)
-        SearchableLazyList.__init__(self, generator)
+        IndexedSearchableLazyList.__init__(self, generator)
         # Something feels very wrong; this is meant to work with MatchHistory.from_generator
         if self.__class__ is not CassiopeiaLazyList:
             self.__init__(**kwargs)
@@ -369,15 +511,209 @@ class CassiopeiaLazyList(SearchableLazyList, CassiopeiaPipelineObject):
         return id(self)
 
     def __str__(self):
-        return SearchableLazyList.__str__(self)
+        return IndexedSearchableLazyList.__str__(self)
+
+    def iter_json(self) -> Generator[bytes, None, None]:
+        """Serializes the elements of this list to JSON one at a time, pulling them from the generator as it goes."""
+        for element in self:
+            yield _dumps(element)
+
+    def write_json(self, fp: BinaryIO, lines: bool = False) -> None:
+        """Streams the elements of this list to the binary file `fp`, either as a JSON array or, if `lines` is True, as
+        newline-delimited JSON (one element per line).
+        """
+        if lines:
+            for element in self.iter_json():
+                fp.write(element)
+                fp.write(b"\n")
+        else:
+            fp.write(b"[")
+            for i, element in enumerate(self.iter_json()):
+                if i:
+                    fp.write(b",")
+                fp.write(element)
+            fp.write(b"]")
 
 
 class CassiopeiaJsonEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, Enum):
             return obj.name
-        elif isinstance(obj, (datetime.datetime, arrow.Arrow)):
+        elif isinstance(obj, datetime.datetime) or hasattr(obj, "isoformat"):  # datetime.datetime, arrow.Arrow
             return obj.isoformat()
         elif isinstance(obj, datetime.timedelta):
             return obj.seconds
         return json.JSONEncoder.default(self, obj)
+
+
+#################
+# Serialization #
+#################
+
+# Serializers are compiled once per type, so serializing a large number of objects of the same type doesn't have to
+# repeat the `dir()` calls and type checks for each one. There are two of each: the `to_dict` ones only turn data into
+# dicts (and containers into dicts and lists), leaving other values as they are, and the JSON ones also convert enums,
+# datetimes and timedeltas the way `CassiopeiaJsonEncoder` does.
+_dict_serializers = {}  # type: Dict[type, Callable[[Any], Any]]
+_json_serializers = {}  # type: Dict[type, Callable[[Any], Any]]
+_data_serializers = {}  # type: Dict[Tuple[Type[CoreData], bool], Callable[[CoreData], Dict[str, Any]]]
+
+
+def _to_dict_value(value: Any) -> Any:
+    try:
+        serializer = _dict_serializers[value.__class__]
+    except KeyError:
+        serializer = _dict_serializers[value.__class__] = _compile_serializer(value.__class__, for_json=False)
+    return serializer(value)
+
+
+def _to_json_value(value: Any) -> Any:
+    """Converts `value` into JSON-compatible builtins (dicts, lists, strs, numbers, bools and None)."""
+    try:
+        serializer = _json_serializers[value.__class__]
+    except KeyError:
+        serializer = _json_serializers[value.__class__] = _compile_serializer(value.__class__, for_json=True)
+    return serializer(value)
+
+
+def _compile_serializer(cls: type, for_json: bool) -> Callable[[Any], Any]:
+    if issubclass(cls, (str, int, float, type(None))):
+        return _serialize_identity
+    elif issubclass(cls, CoreData):
+        if cls.to_dict is not CoreData.to_dict:
+            return _serialize_to_dict_for_json if for_json else cls.to_dict
+        return _data_serializer(cls, for_json)
+    elif issubclass(cls, CassiopeiaObject):
+        if not for_json:
+            return _serialize_identity
+        if cls.to_dict is not CassiopeiaObject.to_dict:
+            return _serialize_to_dict_for_json
+        return _serialize_object_for_json
+    elif not for_json:
+        if issubclass(cls, Mapping):
+            return _serialize_mapping
+        elif hasattr(cls, "__iter__") and not issubclass(cls, (bytes, Enum)):
+            return _serialize_iterable
+        return _serialize_identity
+    elif issubclass(cls, Enum):
+        return _serialize_enum
+    elif issubclass(cls, datetime.timedelta):
+        return _serialize_timedelta
+    elif hasattr(cls, "isoformat"):  # datetime.datetime, datetime.date, arrow.Arrow
+        return _serialize_datetime
+    elif issubclass(cls, Mapping):
+        return _serialize_mapping_for_json
+    elif hasattr(cls, "__iter__"):
+        return _serialize_iterable_for_json
+    else:
+        return _serialize_identity
+
+
+def _data_serializer(cls: Type[CoreData], for_json: bool = False) -> Callable[[CoreData], Dict[str, Any]]:
+    """Returns the serializer that walks the fields of a `CoreData` type (ignoring any override of `to_dict`)."""
+    try:
+        return _data_serializers[cls, for_json]
+    except KeyError:
+        serialize_value = _to_json_value if for_json else _to_dict_value
+        if issubclass(cls, SlottedCoreData):
+            serializer = _compile_slotted_core_data_serializer(cls, serialize_value)
+        else:
+            serializer = _compile_core_data_serializer(cls, serialize_value)
+        _data_serializers[cls, for_json] = serializer
+        return serializer
+
+
+def _compile_core_data_serializer(
+    cls: Type[CoreData], serialize_value: Callable[[Any], Any]
+) -> Callable[[CoreData], Dict[str, Any]]:
+    # The data is whatever was set on the instance, minus anything that's defined on the class.
+    class_attributes = frozenset(dir(cls))
+
+    def serialize(data: CoreData) -> Dict[str, Any]:
+        return {attr: serialize_value(value) for attr, value in vars(data).items() if attr not in class_attributes}
+
+    return serialize
+
+
+def _compile_slotted_core_data_serializer(
+    cls: Type[SlottedCoreData], serialize_value: Callable[[Any], Any]
+) -> Callable[[SlottedCoreData], Dict[str, Any]]:
+    # Read the slots through their descriptors so that unset slots raise immediately rather than going through
+    # `SlottedCoreData.__getattr__`.
+    getters = []
+    for attr in cls._slots:
+        for klass in cls.__mro__:
+            if attr in klass.__dict__:
+                getters.append((attr, klass.__dict__[attr].__get__))
+                break
+    get_extra = SlottedCoreData.__dict__["_extra"].__get__
+
+    def serialize(data: SlottedCoreData) -> Dict[str, Any]:
+        d = {}
+        for attr, get in getters:
+            try:
+                value = get(data)
+            except AttributeError:
+                continue
+            d[attr] = serialize_value(value)
+        try:
+            extra = get_extra(data)
+        except AttributeError:
+            return d
+        for attr, value in extra.items():
+            d[attr] = serialize_value(value)
+        return d
+
+    return serialize
+
+
+def _serialize_identity(value: Any) -> Any:
+    return value
+
+
+def _serialize_mapping(value: Mapping) -> Dict[Any, Any]:
+    return {k: _to_dict_value(v) for k, v in value.items()}
+
+
+def _serialize_iterable(value: Any) -> list:
+    return [_to_dict_value(v) for v in value]
+
+
+def _serialize_to_dict_for_json(value: Any) -> Any:
+    return _to_json_value(value.to_dict())
+
+
+def _serialize_object_for_json(value: "CassiopeiaObject") -> Dict[str, Any]:
+    # Like `CassiopeiaObject.to_dict`, without building the plain dicts first
+    d = {}
+    for data_type in value._data_types:
+        d.update(_to_json_value(value._data[data_type]))
+    return d
+
+
+def _serialize_enum(value: Enum) -> str:
+    return value.name
+
+
+def _serialize_datetime(value: datetime.datetime) -> str:
+    return value.isoformat()
+
+
+def _serialize_timedelta(value: datetime.timedelta) -> int:
+    return value.seconds
+
+
+def _serialize_mapping_for_json(value: Mapping) -> Dict[Any, Any]:
+    return {k.name if isinstance(k, Enum) else k: _to_json_value(v) for k, v in value.items()}
+
+
+def _serialize_iterable_for_json(value: Any) -> list:
+    return [_to_json_value(v) for v in value]
+
+
+def _dumps(value: Any) -> bytes:
+    """Serializes `value` to compact JSON. orjson is only used to make it faster: the output is the same without it."""
+    value = _to_json_value(value)
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
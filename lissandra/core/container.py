@@ -0,0 +1,179 @@
+"""Hash-indexed versions of the merakicommons searchable containers.
+
+``merakicommons.container.SearchableList.find`` walks every element and asks each one whether it contains the search
+item, so ``profile_icons.find(588)`` or ``entries.find(Division.one)`` are linear scans. The lists in this module build
+a ``value -> positions`` index the first time an item of a given type is searched for, using the attributes that the
+element's class declared in its ``@searchable`` map, and answer later searches for that type with a dictionary lookup.
+
+Only item types that ``@searchable`` compares purely by equality are indexed (ints, floats, bools and enums). A ``str``
+search key also matches substrings, and other types may be delegated to an attribute's own ``__contains__``, so those
+searches keep using the linear scan.
+"""
+
+import functools
+from enum import Enum
+from typing import Any, Generator, Iterable, List, Mapping, Optional, Tuple, Type, Union
+
+from merakicommons.container import SearchableList, SearchableLazyList, searchable as _searchable
+
+_INDEXABLE_ITEM_TYPES = (int, float, Enum)
+
+# Attribute values that can never contain an indexable item, so equality is the only way they can match one.
+_INDEXABLE_VALUE_TYPES = (int, float, Enum, str, bytes, type(None))
+
+
+def searchable(search_key_types: Mapping[Type, Union[str, Iterable[str]]]):
+    """Same as ``merakicommons.container.searchable``, but also records the search map on the decorated class (as
+    ``_search_keys``) so that the indexed containers below know which attributes to index.
+    """
+    decorator = _searchable(search_key_types)
+
+    def wrapper(cls):
+        # If the class already defines __contains__, `@searchable` chains to it and we can't predict what it matches.
+        index_safe = not hasattr(cls, "__contains__")
+        cls = decorator(cls)
+        search_keys = {}
+        for key_type, attributes in search_key_types.items():
+            if isinstance(attributes, str):
+                attributes = [attributes]
+            search_keys[key_type] = tuple(tuple(attribute.split(".")) for attribute in attributes)
+        cls._search_keys = search_keys
+        cls._search_index_safe = index_safe
+        return cls
+
+    return wrapper
+
+
+class _SearchIndex(object):
+    """Maps attribute values to the positions of the elements that have them, for one search item type."""
+
+    def __init__(self, item_type: Type):
+        self.item_type = item_type
+        self.positions = {}  # Attribute value -> the positions of the elements with it
+        self.size = 0  # The number of leading elements of the list that have been indexed
+        self.usable = True
+
+    def add(self, element: Any) -> None:
+        position = self.size
+        self.size += 1
+        try:
+            if not element.__class__._search_index_safe:
+                self.usable = False
+                return
+            attributes = element.__class__._search_keys.get(self.item_type, ())
+        except AttributeError:
+            # Not a `@searchable` class, so we can't know how it would compare to the search item.
+            self.usable = False
+            return
+
+        for attribute in attributes:
+            value = element
+            try:
+                for sub_attribute in attribute:
+                    value = getattr(value, sub_attribute)
+            except AttributeError:
+                continue
+            if not isinstance(value, _INDEXABLE_VALUE_TYPES):
+                self.usable = False
+                return
+            positions = self.positions.setdefault(value, [])
+            if not positions or positions[-1] != position:
+                positions.append(position)
+
+    def lookup(self, item: Any) -> List[int]:
+        return self.positions.get(item, [])
+
+
+def _invalidates_indexes(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._reset_indexes()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class IndexedSearchableList(SearchableList):
+    """A ``SearchableList`` that answers equality-only searches from lazily built per-type hash indexes.
+
+    Appending only leaves the new tail unindexed (it is picked up on the next search); any other mutation, which can
+    move or replace existing elements, throws the indexes away.
+    """
+
+    def _reset_indexes(self) -> None:
+        self.__dict__.pop("_indexes", None)
+
+    def _get_index(self, item_type: Type) -> Optional[_SearchIndex]:
+        if not issubclass(item_type, _INDEXABLE_ITEM_TYPES):
+            return None
+        indexes = self.__dict__.setdefault("_indexes", {})
+        try:
+            index = indexes[item_type]
+        except KeyError:
+            index = _SearchIndex(item_type)
+            indexes[item_type] = index
+        length = list.__len__(self)
+        while index.usable and index.size < length:
+            index.add(list.__getitem__(self, index.size))
+        return index if index.usable else None
+
+    def _generate_next(self) -> bool:
+        """Makes one more element available to the index. Returns False if there are no more elements."""
+        return False
+
+    def enumerate(self, item: Any, reverse: bool = False) -> Generator[Tuple[int, Any], None, None]:
+        index = None if reverse else self._get_index(type(item))
+        if index is None:
+            yield from SearchableList.enumerate(self, item, reverse=reverse)
+            return
+        for position in index.lookup(item):
+            yield position, list.__getitem__(self, position)
+        # Keep indexing (and yielding) any elements that are produced while we're being iterated over.
+        while self._generate_next() or index.size < list.__len__(self):
+            while index.size < list.__len__(self):
+                position = index.size
+                index.add(list.__getitem__(self, position))
+                if not index.usable:
+                    # Fall back to the linear scan for this element and everything after it.
+                    self._reset_indexes()
+                    for later_position, x in SearchableList.enumerate(self, item):
+                        if later_position >= position:
+                            yield later_position, x
+                    return
+                if position in index.lookup(item):
+                    yield position, list.__getitem__(self, position)
+
+    __setitem__ = _invalidates_indexes(SearchableList.__setitem__)
+    __delitem__ = _invalidates_indexes(SearchableList.__delitem__)
+    insert = _invalidates_indexes(SearchableList.insert)
+    pop = _invalidates_indexes(SearchableList.pop)
+    remove = _invalidates_indexes(SearchableList.remove)
+    clear = _invalidates_indexes(SearchableList.clear)
+    sort = _invalidates_indexes(SearchableList.sort)
+    reverse = _invalidates_indexes(SearchableList.reverse)
+
+
+class IndexedSearchableLazyList(SearchableLazyList, IndexedSearchableList):
+    """A ``SearchableLazyList`` with the indexed searches of ``IndexedSearchableList``.
+
+    Searches only generate as many elements as the linear scan would have: the already generated elements are answered
+    from the index, and further elements are indexed one at a time as they are pulled from the generator.
+    """
+
+    def _generate_next(self) -> bool:
+        if self._empty:
+            return False
+        try:
+            next(self)
+        except StopIteration:
+            return False
+        return True
+
+    __setitem__ = _invalidates_indexes(SearchableLazyList.__setitem__)
+    __delitem__ = _invalidates_indexes(SearchableLazyList.__delitem__)
+    insert = _invalidates_indexes(SearchableLazyList.insert)
+    pop = _invalidates_indexes(SearchableLazyList.pop)
+    remove = _invalidates_indexes(SearchableLazyList.remove)
+    clear = _invalidates_indexes(SearchableLazyList.clear)
+    sort = _invalidates_indexes(SearchableLazyList.sort)
+    reverse = _invalidates_indexes(SearchableLazyList.reverse)
@@ -1,13 +1,14 @@
 from typing import List, Union, Optional, Generator, Set, Type
 
 from merakicommons.cache import lazy_property, lazy
-from merakicommons.container import searchable, SearchableList
+from .container import searchable, IndexedSearchableList
 
 from .. import configuration
 from ..data import Region, Platform, Tier, Division, Queue
 from .common import (
     CoreData,
     CoreDataList,
+    SlottedCoreData,
     CassiopeiaObject,
     CassiopeiaGhost,
     CassiopeiaLazyList,
@@ -44,11 +45,29 @@ class LeagueData(CoreData):
         return self
 
 
-class LeagueEntryData(CoreData):
+class LeagueEntryData(SlottedCoreData):
     """Contains the data for one entry (summoner) in a League."""
 
     _dto_type = LeagueEntryDto
     _renamed = {"rank": "division"}
+    _fields = (
+        "leagueId",
+        "summonerId",
+        "summonerName",
+        "queueType",
+        "tier",
+        "rank",
+        "leaguePoints",
+        "wins",
+        "losses",
+        "hotStreak",
+        "veteran",
+        "freshBlood",
+        "inactive",
+        "miniSeries",
+        "region",
+    )
+    _interned = ("leagueId", "queueType", "tier", "rank", "leaguePoints", "wins", "losses", "region")
 
     def __call__(self, **kwargs):
         if "summonerId" in kwargs:
@@ -375,7 +394,7 @@ class League(CassiopeiaGhost):
             entry.leagueId = self.id
             entry = LeagueEntry.from_data(data=entry, loaded_groups={LeagueEntriesData})
             entries.append(entry)
-        return SearchableList(entries)
+        return IndexedSearchableList(entries)
 
 
 class ChallengerLeague(CassiopeiaGhost):
@@ -428,7 +447,9 @@ class ChallengerLeague(CassiopeiaGhost):
     @ghost_load_on
     @lazy
     def entries(self) -> List[LeagueEntry]:
-        return SearchableList([LeagueEntry.from_data(entry) for entry in self._data[ChallengerLeagueListData].entries])
+        return IndexedSearchableList(
+            [LeagueEntry.from_data(entry) for entry in self._data[ChallengerLeagueListData].entries]
+        )
 
 
 class GrandmasterLeague(CassiopeiaGhost):
@@ -487,7 +508,9 @@ class GrandmasterLeague(CassiopeiaGhost):
     @ghost_load_on
     @lazy
     def entries(self) -> List[LeagueEntry]:
-        return SearchableList([LeagueEntry.from_data(entry) for entry in self._data[GrandmasterLeagueListData].entries])
+        return IndexedSearchableList(
+            [LeagueEntry.from_data(entry) for entry in self._data[GrandmasterLeagueListData].entries]
+        )
 
 
 class MasterLeague(CassiopeiaGhost):
@@ -546,4 +569,6 @@ class MasterLeague(CassiopeiaGhost):
     @ghost_load_on
     @lazy
     def entries(self) -> List[LeagueEntry]:
-        return SearchableList([LeagueEntry.from_data(entry) for entry in self._data[MasterLeagueListData].entries])
+        return IndexedSearchableList(
+            [LeagueEntry.from_data(entry) for entry in self._data[MasterLeagueListData].entries]
+        )
@@ -0,0 +1,387 @@
+import datetime
+from typing import List, Union
+
+from merakicommons.cache import lazy, lazy_property
+from merakicommons.container import SearchableList
+
+from ..data import Region, Platform, Queue, QUEUE_IDS
+from .common import (
+    SlottedCoreData,
+    CoreDataList,
+    CassiopeiaObject,
+    CassiopeiaGhost,
+    CassiopeiaLazyList,
+    provide_default_region,
+    add_region_to_kwargs,
+    ghost_load_on,
+)
+from .container import searchable
+from .summoner import Summoner
+from ..dto.match import MatchDto, MatchListDto
+
+
+def _region_from_match_id(id: str) -> Union[Region, None]:
+    # Match ids are prefixed with the platform they were played on, e.g. "EUW1_4567891234"
+    try:
+        return Platform(id.split("_", 1)[0]).region
+    except (AttributeError, ValueError):
+        return None
+
+
+##############
+# Data Types #
+##############
+
+
+class MatchListData(CoreDataList):
+    """The ids of a summoner's most recent matches."""
+
+    _dto_type = MatchListDto
+    _renamed = {}
+
+
+class CompanionData(SlottedCoreData):
+    _renamed = {"content_ID": "content_id", "skin_ID": "skin_id"}
+    _fields = ("content_ID", "skin_ID", "species")
+
+
+class TraitData(SlottedCoreData):
+    _renamed = {}
+    _fields = ("name", "num_units", "style", "tier_current", "tier_total")
+
+
+class UnitData(SlottedCoreData):
+    _renamed = {}
+    _fields = ("character_id", "items", "name", "rarity", "tier")
+
+
+class ParticipantData(SlottedCoreData):
+    _renamed = {}
+    _fields = (
+        "puuid",
+        "placement",
+        "level",
+        "gold_left",
+        "last_round",
+        "players_eliminated",
+        "time_eliminated",
+        "total_damage_to_players",
+        "companion",
+        "traits",
+        "units",
+        "region",
+    )
+
+    def __call__(self, **kwargs):
+        if "companion" in kwargs:
+            self.companion = CompanionData(**kwargs.pop("companion"))
+        if "traits" in kwargs:
+            self.traits = [TraitData(**trait) for trait in kwargs.pop("traits")]
+        if "units" in kwargs:
+            self.units = [UnitData(**unit) for unit in kwargs.pop("units")]
+        super().__call__(**kwargs)
+        return self
+
+
+class MatchData(SlottedCoreData):
+    """The match-v1 `metadata` and `info` objects, flattened into one.
+
+    The participants are kept as the dicts the Riot API returned, and are only turned into `ParticipantData` when a
+    `Match`'s participants are first used, so loading a match just to read its metadata stays cheap.
+    """
+
+    _dto_type = MatchDto
+    _renamed = {"match_id": "id", "participants": "participant_dtos"}
+    _fields = (
+        "match_id",
+        "data_version",
+        "puuids",
+        "game_datetime",
+        "game_length",
+        "game_variation",
+        "game_version",
+        "queue_id",
+        "tft_set_number",
+        "participants",
+        "region",
+    )
+
+    def __call__(self, **kwargs):
+        if "metadata" in kwargs:
+            metadata = dict(kwargs.pop("metadata"))
+            # The metadata and info objects both have "participants", but the metadata only lists their puuids
+            metadata["puuids"] = metadata.pop("participants", [])
+            kwargs = dict(metadata, **kwargs)
+        if "info" in kwargs:
+            kwargs = dict(kwargs.pop("info"), **kwargs)
+        super().__call__(**kwargs)
+        return self
+
+
+##############
+# Core Types #
+##############
+
+
+class Companion(CassiopeiaObject):
+    _data_types = {CompanionData}
+
+    @property
+    def content_id(self) -> str:
+        return self._data[CompanionData].content_id
+
+    @property
+    def skin_id(self) -> int:
+        return self._data[CompanionData].skin_id
+
+    @property
+    def species(self) -> str:
+        return self._data[CompanionData].species
+
+
+@searchable({str: ["name"], int: ["tier_current"]})
+class Trait(CassiopeiaObject):
+    _data_types = {TraitData}
+
+    @property
+    def name(self) -> str:
+        return self._data[TraitData].name
+
+    @property
+    def num_units(self) -> int:
+        return self._data[TraitData].num_units
+
+    @property
+    def style(self) -> int:
+        return self._data[TraitData].style
+
+    @property
+    def tier_current(self) -> int:
+        return self._data[TraitData].tier_current
+
+    @property
+    def tier_total(self) -> int:
+        return self._data[TraitData].tier_total
+
+
+@searchable({str: ["character_id", "name"], int: ["tier", "rarity"]})
+class Unit(CassiopeiaObject):
+    _data_types = {UnitData}
+
+    @property
+    def character_id(self) -> str:
+        return self._data[UnitData].character_id
+
+    @property
+    def name(self) -> str:
+        return self._data[UnitData].name
+
+    @property
+    def items(self) -> List[int]:
+        return self._data[UnitData].items
+
+    @property
+    def rarity(self) -> int:
+        return self._data[UnitData].rarity
+
+    @property
+    def tier(self) -> int:
+        return self._data[UnitData].tier
+
+
+@searchable({str: ["puuid"], int: ["placement", "level"], Summoner: ["summoner"]})
+class Participant(CassiopeiaObject):
+    _data_types = {ParticipantData}
+
+    @property
+    def puuid(self) -> str:
+        return self._data[ParticipantData].puuid
+
+    @lazy_property
+    def summoner(self) -> Summoner:
+        return Summoner(puuid=self.puuid, region=self._data[ParticipantData].region)
+
+    @property
+    def placement(self) -> int:
+        return self._data[ParticipantData].placement
+
+    @property
+    def level(self) -> int:
+        return self._data[ParticipantData].level
+
+    @property
+    def gold_left(self) -> int:
+        return self._data[ParticipantData].gold_left
+
+    @property
+    def last_round(self) -> int:
+        return self._data[ParticipantData].last_round
+
+    @property
+    def players_eliminated(self) -> int:
+        return self._data[ParticipantData].players_eliminated
+
+    @property
+    def time_eliminated(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self._data[ParticipantData].time_eliminated)
+
+    @property
+    def total_damage_to_players(self) -> int:
+        return self._data[ParticipantData].total_damage_to_players
+
+    @lazy_property
+    def companion(self) -> Companion:
+        return Companion.from_data(self._data[ParticipantData].companion)
+
+    @lazy_property
+    def traits(self) -> List[Trait]:
+        return SearchableList([Trait.from_data(trait) for trait in self._data[ParticipantData].traits])
+
+    @lazy_property
+    def units(self) -> List[Unit]:
+        return SearchableList([Unit.from_data(unit) for unit in self._data[ParticipantData].units])
+
+
+@searchable({str: ["id", "region", "platform"], Region: ["region"], Platform: ["platform"], Queue: ["queue"]})
+class Match(CassiopeiaGhost):
+    _data_types = {MatchData}
+
+    def __init__(self, *, id: str = None, region: Union[Region, str] = None):
+        kwargs = add_region_to_kwargs({"region": region or _region_from_match_id(id)})
+        kwargs["id"] = id
+        super().__init__(**kwargs)
+
+    @classmethod
+    def __get_query_from_kwargs__(cls, *, id: str, **kwargs) -> dict:
+        # The region isn't in the signature, so that it's taken from the match id rather than the default region
+        if kwargs.get("region") is None and kwargs.get("platform") is None:
+            kwargs["region"] = _region_from_match_id(id)
+        kwargs = add_region_to_kwargs(kwargs)
+        return {"region": kwargs["region"], "id": id}
+
+    def __get_query__(self):
+        return {"region": self.region, "platform": self.platform, "id": self.id}
+
+    def __eq__(self, other: "Match"):
+        if not isinstance(other, Match) or self.region != other.region:
+            return False
+        return self.id == other.id
+
+    __hash__ = CassiopeiaGhost.__hash__
+
+    def __str__(self):
+        return "Match(id={id_}, region='{region}')".format(id_=self.id, region=self.region.value)
+
+    @lazy_property
+    def region(self) -> Region:
+        return Region(self._data[MatchData].region)
+
+    @lazy_property
+    def platform(self) -> Platform:
+        return self.region.platform
+
+    @property
+    def id(self) -> str:
+        return self._data[MatchData].id
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def data_version(self) -> str:
+        return self._data[MatchData].data_version
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def puuids(self) -> List[str]:
+        """The puuids of the participants, in the same order as `participants`."""
+        return self._data[MatchData].puuids
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    @lazy
+    def participants(self) -> List[Participant]:
+        region = self.region.value
+        return SearchableList(
+            [
+                Participant.from_data(ParticipantData(region=region, **participant))
+                for participant in self._data[MatchData].participant_dtos
+            ]
+        )
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def creation(self) -> datetime.datetime:
+        import arrow
+
+        return arrow.get(self._data[MatchData].game_datetime / 1000)
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def duration(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self._data[MatchData].game_length)
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def variation(self) -> str:
+        return getattr(self._data[MatchData], "game_variation", None)
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def version(self) -> str:
+        return self._data[MatchData].game_version
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def queue(self) -> Queue:
+        return {id: queue for queue, id in QUEUE_IDS.items()}[self._data[MatchData].queue_id]
+
+    @CassiopeiaGhost.property(MatchData)
+    @ghost_load_on
+    def set_number(self) -> int:
+        return self._data[MatchData].tft_set_number
+
+
+class MatchHistory(CassiopeiaLazyList):  # type List[Match]
+    """A summoner's most recent matches, newest first. The matches themselves are only loaded when they're used."""
+
+    _data_types = {MatchListData}
+
+    @provide_default_region
+    def __init__(self, *, puuid: str = None, count: int = 20, region: Union[Region, str] = None):
+        kwargs = {"region": region, "puuid": puuid, "count": count}
+        CassiopeiaObject.__init__(self, **kwargs)
+
+    @classmethod
+    @provide_default_region
+    def __get_query_from_kwargs__(
+        cls, *, puuid: str = None, count: int = 20, region: Union[Region, str] = None
+    ) -> dict:
+        return {"region": region, "puuid": puuid, "count": count}
+
+    @classmethod
+    def from_generator(cls, generator, puuid: str = None, count: int = 20, region: Union[Region, str] = None, **kwargs):
+        self = cls.__new__(cls)
+        kwargs["region"] = region
+        kwargs["puuid"] = puuid
+        kwargs["count"] = count
+        CassiopeiaLazyList.__init__(self, generator=generator, **kwargs)
+        return self
+
+    @lazy_property
+    def region(self) -> Region:
+        return Region(self._data[MatchListData].region)
+
+    @lazy_property
+    def platform(self) -> Platform:
+        return self.region.platform
+
+    @property
+    def puuid(self) -> str:
+        return self._data[MatchListData].puuid
+
+    @lazy_property
+    def summoner(self) -> Summoner:
+        return Summoner(puuid=self.puuid, region=self.region)
+
+    @property
+    def count(self) -> int:
+        return self._data[MatchListData].count
@@ -1,7 +1,6 @@
-from typing import Union, Optional
+from typing import TYPE_CHECKING, Union, Optional
 from functools import total_ordering
 from collections import defaultdict
-import arrow
 from itertools import tee
 
 from .. import configuration
@@ -14,6 +13,9 @@ except ImportError:
 
 from ..data import Region
 
+if TYPE_CHECKING:
+    import arrow
+
 
 def pairwise(iterable):
     "s -> (s0,s1), (s1,s2), (s2, s3), ..."
@@ -30,9 +32,11 @@ class Patch(object):
         self,
         region: Union[str, Region],
         name: str,
-        start: Union[arrow.Arrow, float],
-        end: Optional[Union[arrow.Arrow, float]],
+        start: Union["arrow.Arrow", float],
+        end: Optional[Union["arrow.Arrow", float]],
     ):
+        import arrow
+
         if not isinstance(start, arrow.Arrow):
             start = arrow.get(start)
         if end is not None and not isinstance(end, arrow.Arrow):
@@ -62,7 +66,9 @@ class Patch(object):
             raise ValueError("Unknown patch name {}".format(string))
 
     @classmethod
-    def from_date(cls, date: Union[arrow.Arrow], region: Union[Region, str] = None) -> "Patch":
+    def from_date(cls, date: "arrow.Arrow", region: Union[Region, str] = None) -> "Patch":
+        import arrow
+
         if not cls.__patches:
             cls.__load__()
         if region is None:
@@ -86,6 +92,8 @@ class Patch(object):
 
     @classmethod
     def __load__(cls):
+        import arrow
+
         data = configuration.settings.pipeline.get(PatchListDto, query={})
         patches = data["patches"]
         shifts = data["shifts"]
@@ -118,11 +126,11 @@ class Patch(object):
         return self._name
 
     @property
-    def start(self) -> arrow.Arrow:
+    def start(self) -> "arrow.Arrow":
         return self._start
 
     @property
-    def end(self) -> arrow.Arrow:
+    def end(self) -> "arrow.Arrow":
         return self._end
 
     @property
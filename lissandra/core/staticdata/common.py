@@ -1,10 +1,14 @@
-from merakicommons.container import searchable
+from typing import TYPE_CHECKING
+
+from ..container import searchable
 from merakicommons.cache import lazy_property
-from PIL.Image import Image as PILImage
 
 from ... import configuration
 from ..common import CoreData, CassiopeiaObject
 
+if TYPE_CHECKING:
+    import PIL.Image
+
 
 class SpriteData(CoreData):
     _renamed = {"h": "height", "w": "width"}
@@ -49,7 +53,9 @@ class Sprite(CassiopeiaObject):
         )
 
     @lazy_property
-    def image(self) -> PILImage:
+    def image(self) -> "PIL.Image.Image":
+        from PIL.Image import Image as PILImage
+
         return configuration.settings.pipeline.get(PILImage, query={"url": self.url})
 
 
@@ -76,7 +82,9 @@ class Image(CassiopeiaObject):
         )
 
     @lazy_property
-    def image(self) -> PILImage:
+    def image(self) -> "PIL.Image.Image":
+        from PIL.Image import Image as PILImage
+
         return configuration.settings.pipeline.get(PILImage, query={"url": self.url})
 
     @lazy_property
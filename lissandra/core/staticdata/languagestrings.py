@@ -1,7 +1,7 @@
 from typing import Dict, Union
 
 from merakicommons.cache import lazy_property
-from merakicommons.container import searchable
+from ..container import searchable
 
 from ...data import Region, Platform
 from ..common import CoreData, CassiopeiaGhost, get_latest_version, provide_default_region, ghost_load_on
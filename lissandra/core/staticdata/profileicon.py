@@ -1,9 +1,8 @@
 import os
-from PIL.Image import Image as PILImage
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from merakicommons.cache import lazy_property, lazy
-from merakicommons.container import searchable
+from ..container import searchable
 
 from ... import configuration
 from ...data import Region, Platform
@@ -25,6 +24,9 @@ try:
 except ImportError:
     import json
 
+if TYPE_CHECKING:
+    import PIL.Image
+
 _profile_icon_names = None
 
 
@@ -82,7 +84,7 @@ class ProfileIcons(CassiopeiaLazyList):
         return self._data[ProfileIconListData].locale
 
 
-@searchable({int: ["id"], str: ["name", "url"], PILImage: ["image"]})
+@searchable({int: ["id"], str: ["name", "url"]})
 class ProfileIcon(CassiopeiaGhost):
     _data_types = {ProfileIconData}
     _load_types = {ProfileIconData: ProfileIconListData}
@@ -186,5 +188,7 @@ class ProfileIcon(CassiopeiaGhost):
     @CassiopeiaGhost.property(ProfileIconData)
     @ghost_load_on
     @lazy
-    def image(self) -> PILImage:
+    def image(self) -> "PIL.Image.Image":
+        from PIL.Image import Image as PILImage
+
         return configuration.settings.pipeline.get(PILImage, query={"url": self.url})
@@ -1,10 +1,11 @@
 from typing import List, Union
 
 from merakicommons.cache import lazy
-from merakicommons.container import searchable, SearchableList
+from merakicommons.container import SearchableList
 
 from ..data import Region, Platform
-from .common import CoreData, CassiopeiaObject, CassiopeiaGhost, provide_default_region, ghost_load_on
+from .common import SlottedCoreData, CassiopeiaObject, CassiopeiaGhost, provide_default_region, ghost_load_on
+from .container import searchable
 
 
 ##############
@@ -12,12 +13,14 @@ from .common import CoreData, CassiopeiaObject, CassiopeiaGhost, provide_default
 ##############
 
 
-class TranslationData(CoreData):
+class TranslationData(SlottedCoreData):
     _renamed = {}
+    _fields = ("locale", "heading", "content", "updated_at")
 
 
-class MessageData(CoreData):
+class MessageData(SlottedCoreData):
     _renamed = {"created_at": "created", "updated_at": "updated"}
+    _fields = ("id", "author", "heading", "content", "severity", "created_at", "updated_at", "translations")
 
     def __call__(self, **kwargs):
         if "translations" in kwargs:
@@ -26,8 +29,9 @@ class MessageData(CoreData):
         return self
 
 
-class IncidentData(CoreData):
+class IncidentData(SlottedCoreData):
     _renamed = {"created_at": "created"}
+    _fields = ("id", "active", "created_at", "updates")
 
     def __call__(self, **kwargs):
         if "updates" in kwargs:
@@ -36,8 +40,9 @@ class IncidentData(CoreData):
         return self
 
 
-class ServiceData(CoreData):
+class ServiceData(SlottedCoreData):
     _renamed = {}
+    _fields = ("name", "slug", "status", "incidents")
 
     def __call__(self, **kwargs):
         if "incidents" in kwargs:
@@ -46,8 +51,9 @@ class ServiceData(CoreData):
         return self
 
 
-class ShardStatusData(CoreData):
+class ShardStatusData(SlottedCoreData):
     _renamed = {"region_tag": "platform"}
+    _fields = ("name", "slug", "hostname", "locales", "region_tag", "services", "region")
 
     def __call__(self, **kwargs):
         if "services" in kwargs:
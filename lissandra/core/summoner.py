@@ -1,13 +1,11 @@
-import arrow
 import datetime
 from typing import Union
 
-from datapipelines import NotFoundError
 from merakicommons.cache import lazy_property
-from merakicommons.container import searchable
+from .container import searchable
 
 from ..data import Region, Platform, Rank
-from .common import CoreData, CassiopeiaObject, CassiopeiaGhost, provide_default_region, ghost_load_on
+from .common import SlottedCoreData, CassiopeiaObject, CassiopeiaGhost, provide_default_region, ghost_load_on
 from .staticdata import ProfileIcon
 from ..dto.summoner import SummonerDto
 
@@ -17,9 +15,10 @@ from ..dto.summoner import SummonerDto
 ##############
 
 
-class SummonerData(CoreData):
+class SummonerData(SlottedCoreData):
     _dto_type = SummonerDto
     _renamed = {"summonerLevel": "level"}
+    _fields = ("id", "accountId", "puuid", "name", "profileIconId", "revisionDate", "summonerLevel", "region")
 
 
 ##############
@@ -109,6 +108,10 @@ class Summoner(CassiopeiaGhost):
             s["accountId"] = self.account_id
         if hasattr(other._data[SummonerData], "accountId"):
             o["accountId"] = other.account_id
+        if hasattr(self._data[SummonerData], "puuid"):
+            s["puuid"] = self.puuid
+        if hasattr(other._data[SummonerData], "puuid"):
+            o["puuid"] = other.puuid
         if any(s.get(key, "s") == o.get(key, "o") for key in s):
             return True
         else:
@@ -135,6 +138,8 @@ class Summoner(CassiopeiaGhost):
 
     @property
     def exists(self):
+        from datapipelines import NotFoundError
+
         try:
             if not self._Ghost__all_loaded:
                 self.__load__()
@@ -190,6 +195,8 @@ class Summoner(CassiopeiaGhost):
     @CassiopeiaGhost.property(SummonerData)
     @ghost_load_on
     def revision_date(self) -> datetime.datetime:
+        import arrow
+
         return arrow.get(self._data[SummonerData].revisionDate / 1000)
 
     @property
@@ -197,3 +204,9 @@ class Summoner(CassiopeiaGhost):
         from .league import LeagueSummonerEntries
 
         return LeagueSummonerEntries(summoner=self)
+
+    @property
+    def match_history(self):
+        from .match import MatchHistory
+
+        return MatchHistory(puuid=self.puuid, region=self.region)
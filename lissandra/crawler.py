@@ -0,0 +1,462 @@
+"""A breadth-first crawler over the TFT match graph.
+
+Starting from some summoners (usually the ladder), the crawler requests each summoner's recent match ids, then each of
+those matches, then the match histories of everyone else who played in them, and so on, until it runs out of summoners
+or hits one of its budgets. Every match is only fetched once, and every summoner's history is only requested once.
+
+Each region is crawled by its own thread, with at most `concurrency` requests in flight at a time (for both match
+histories and matches), so a slow or rate limited region doesn't hold the others up. Every request also goes through
+the Riot API datastore, so `RiotAPIService.max_concurrent_requests` caps the requests in flight across all regions.
+The crawl's state can be checkpointed to disk and resumed later.
+"""
+
+import base64
+import collections
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Union
+
+from . import configuration
+from .core.league import LeagueEntry, LeagueEntryData
+from .core.match import Match, MatchHistory
+from .core.summoner import Summoner
+from .data import Region
+
+_CHECKPOINT_VERSION = 1
+
+
+class BloomFilter(object):
+    """A fixed size set of strings that can have false positives (at about `error_rate` once `capacity` items have
+    been added), but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, bits: bytearray = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self._bits = bits if bits is not None else bytearray((self.n_bits + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing: the k positions are h1 + i * h2 for two independent hashes
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def copy(self) -> "BloomFilter":
+        return BloomFilter(self.capacity, self.error_rate, bytearray(self._bits))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "bits": base64.b64encode(bytes(self._bits)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "BloomFilter":
+        return cls(data["capacity"], data["error_rate"], bytearray(base64.b64decode(data["bits"])))
+
+
+class SeenSet(object):
+    """The set of ids the crawler has already seen.
+
+    Lookups go to a Bloom filter first, which cheaply rules out ids that are definitely new. Its positives are
+    checked against an exact set, so there are no false positives while the exact set is kept. Once more than
+    `exact_capacity` ids have been added the exact set is dropped to bound memory, and the Bloom filter alone answers,
+    at its `error_rate` (a small fraction of new ids will then be wrongly skipped).
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001, exact_capacity: Optional[int] = 1000000):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact_capacity = exact_capacity
+        self._exact = set()  # None once there are too many items to keep exactly
+        self._n_items = 0
+
+    def __len__(self) -> int:
+        return self._n_items
+
+    @property
+    def is_exact(self) -> bool:
+        return self._exact is not None
+
+    def __contains__(self, item: str) -> bool:
+        if item not in self.bloom:
+            return False
+        return item in self._exact if self._exact is not None else True
+
+    def add(self, item: str) -> bool:
+        """Adds `item`, and returns whether it was new."""
+        if item in self:
+            return False
+        self.bloom.add(item)
+        self._n_items += 1
+        if self._exact is not None:
+            self._exact.add(item)
+            if self.exact_capacity is not None and len(self._exact) > self.exact_capacity:
+                self._exact = None
+        return True
+
+    def copy(self) -> "SeenSet":
+        copied = self.__class__.__new__(self.__class__)
+        copied.bloom = self.bloom.copy()
+        copied.exact_capacity = self.exact_capacity
+        copied._exact = set(self._exact) if self._exact is not None else None
+        copied._n_items = self._n_items
+        return copied
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bloom": self.bloom.to_dict(),
+            "exact_capacity": self.exact_capacity,
+            "exact": sorted(self._exact) if self._exact is not None else None,
+            "n_items": self._n_items,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SeenSet":
+        self = cls.__new__(cls)
+        self.bloom = BloomFilter.from_dict(data["bloom"])
+        self.exact_capacity = data["exact_capacity"]
+        self._exact = set(data["exact"]) if data["exact"] is not None else None
+        self._n_items = data["n_items"]
+        return self
+
+
+class MatchCrawler(object):
+    """Crawls the match graph breadth first. See the module docstring.
+
+    `on_match` is called (from the crawling threads, one at a time) with each `Match` as it's fetched, e.g. to add it
+    to a `lissandra.export.matchstore.MatchStore`. The crawl stops when there's nothing left to fetch, or when one of
+    the budgets is reached: `max_matches` matches fetched, `max_summoners` match histories requested, or
+    `max_seconds` spent crawling.
+
+    If `checkpoint_path` is given, the crawl's state is written there every `checkpoint_every` matches and when the
+    crawl stops, and `MatchCrawler.resume` picks it back up.
+
+    If `on_match` raises (or a region's thread fails some other way), the match it was given and everything not yet
+    crawled stay queued, the other regions stop, and `crawl` raises the error once they have. Errors loading a single
+    match or match history are only counted in `n_errors`.
+    """
+
+    def __init__(
+        self,
+        on_match: Callable[[Match], Any] = None,
+        *,
+        matches_per_summoner: int = 20,
+        concurrency: Union[int, Mapping[Union[Region, str], int]] = 4,
+        match_batch_size: int = 20,
+        max_matches: int = None,
+        max_summoners: int = None,
+        max_seconds: float = None,
+        checkpoint_path: str = None,
+        checkpoint_every: int = 1000,
+        seen_capacity: int = 1000000,
+        seen_error_rate: float = 0.001,
+    ):
+        self.on_match = on_match
+        self.matches_per_summoner = matches_per_summoner
+        self.concurrency = concurrency
+        self.match_batch_size = match_batch_size
+        self.max_matches = max_matches
+        self.max_summoners = max_summoners
+        self.max_seconds = max_seconds
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+        self.seen_puuids = SeenSet(seen_capacity, seen_error_rate)
+        self.seen_matches = SeenSet(seen_capacity, seen_error_rate)
+        # Region -> the puuids whose match histories haven't been requested yet, and the match ids that haven't been
+        # fetched yet, in the order they were found
+        self._puuids = {}  # type: Dict[Region, Deque[str]]
+        self._match_ids = {}  # type: Dict[Region, Deque[str]]
+
+        self.n_matches = 0
+        self.n_summoners = 0
+        self.n_errors = 0
+        self._lock = threading.RLock()
+        # Held while a checkpoint is saved, so that checkpoints are written one at a time and in order, without holding
+        # up the crawl
+        self._checkpoint_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._deadline = None  # type: Optional[float]
+        self._last_checkpoint = 0
+        self._failures = []  # type: List[BaseException]
+
+    # Seeding
+
+    def _frontiers(self, region: Region):
+        with self._lock:
+            if region not in self._puuids:
+                self._puuids[region] = collections.deque()
+                self._match_ids[region] = collections.deque()
+            return self._puuids[region], self._match_ids[region]
+
+    def add_puuid(self, puuid: str, region: Union[Region, str]) -> bool:
+        """Queues a summoner's match history to be requested, unless it already has been. Returns whether it was
+        queued.
+        """
+        region = Region(region)
+        puuids, _ = self._frontiers(region)
+        with self._lock:
+            if not self.seen_puuids.add(puuid):
+                return False
+            puuids.append(puuid)
+            return True
+
+    def add_match_id(self, id: str, region: Union[Region, str]) -> bool:
+        """Queues a match to be fetched, unless it already has been. Returns whether it was queued."""
+        region = Region(region)
+        _, match_ids = self._frontiers(region)
+        with self._lock:
+            if not self.seen_matches.add(id):
+                return False
+            match_ids.append(id)
+            return True
+
+    def seed(
+        self, summoners: Iterable[Union[Summoner, LeagueEntry, Mapping[str, Any]]], region: Union[Region, str] = None
+    ):
+        """Queues the match histories of `summoners` to be requested.
+
+        `summoners` can contain `Summoner`s, or ladder entries (`LeagueEntry`s or `LeagueEntryDto`-like dicts, e.g.
+        from a `League`, `LeagueEntries` or `lissandra.export.iter_league_entries`), whose summoners are loaded in bulk
+        to find their puuids. `region` is used for dicts without a region.
+        """
+        if region is None:
+            region = configuration.settings.default_region
+        summoner_ids = collections.defaultdict(list)  # type: Dict[Region, List[str]]
+        for summoner in summoners:
+            if isinstance(summoner, Summoner):
+                self.add_puuid(summoner.puuid, summoner.region)
+            elif isinstance(summoner, LeagueEntry):
+                summoner_ids[summoner.region].append(summoner._data[LeagueEntryData].summonerId)
+            else:
+                summoner_ids[Region(summoner.get("region", region))].append(summoner["summonerId"])
+
+        from .lissandra import get_summoners
+
+        for summoner_region, ids in summoner_ids.items():
+            for summoner in get_summoners(ids=ids, region=summoner_region):
+                if isinstance(summoner, Summoner):
+                    self.add_puuid(summoner.puuid, summoner_region)
+                else:
+                    with self._lock:
+                        self.n_errors += 1
+
+    # Crawling
+
+    def _budget_spent(self) -> bool:
+        if self.max_matches is not None and self.n_matches >= self.max_matches:
+            return True
+        if self.max_summoners is not None and self.n_summoners >= self.max_summoners:
+            return True
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _take(self, frontier: Deque[str], n: int) -> List[str]:
+        with self._lock:
+            return [frontier.popleft() for _ in range(min(n, len(frontier)))]
+
+    def _concurrency_for(self, region: Region) -> int:
+        if isinstance(self.concurrency, Mapping):
+            for key, value in self.concurrency.items():
+                if Region(key) is region:
+                    return value
+            return 1
+        return self.concurrency
+
+    def _fetch_match_ids(self, puuid: str, region: Region) -> List[str]:
+        history = MatchHistory(puuid=puuid, count=self.matches_per_summoner, region=region)
+        return [match.id for match in history]
+
+    def _handle_match(self, match: Match, region: Region) -> bool:
+        # Returns False, without counting the match, if the budget has been used up. The match is only counted once
+        # `on_match` has taken it, so if that raises, the match can be put back and fetched again.
+        with self._lock:
+            if self._budget_spent():
+                return False
+            if self.on_match is not None:
+                self.on_match(match)
+            self.n_matches += 1
+            for puuid in match.puuids:
+                self.add_puuid(puuid, region)
+            checkpoint = (
+                self.checkpoint_path is not None and self.n_matches - self._last_checkpoint >= self.checkpoint_every
+            )
+            if checkpoint:
+                # So that the other threads don't save one too
+                self._last_checkpoint = self.n_matches
+        if checkpoint:
+            self.save_checkpoint()
+        return True
+
+    def _fetch_matches(self, ids: List[str], region: Region, match_ids: Deque[str], concurrency: int) -> None:
+        from .lissandra import get_matches
+
+        handled = 0
+        try:
+            # get_matches requests all of its ids at once, so give it `concurrency` at a time
+            while handled < len(ids):
+                end = handled + concurrency
+                for match in get_matches(ids[handled:end], region=region):
+                    if not isinstance(match, Match):
+                        with self._lock:
+                            self.n_errors += 1
+                    elif not self._handle_match(match, region):
+                        # The budget ran out (perhaps in another region) mid-batch
+                        return
+                    handled += 1
+        finally:
+            # Put back whatever wasn't handled, so a resume fetches it
+            with self._lock:
+                match_ids.extendleft(reversed(ids[handled:]))
+
+    def _fetch_histories(
+        self, executor: ThreadPoolExecutor, batch: List[str], region: Region, puuids: Deque[str]
+    ) -> None:
+        futures = [executor.submit(self._fetch_match_ids, puuid, region) for puuid in batch]
+        done = 0
+        try:
+            for future in futures:
+                try:
+                    ids = future.result()
+                except Exception:
+                    with self._lock:
+                        self.n_errors += 1
+                else:
+                    for id in ids:
+                        self.add_match_id(id, region)
+                done += 1
+        finally:
+            if done < len(batch):
+                with self._lock:
+                    puuids.extendleft(reversed(batch[done:]))
+                    self.n_summoners -= len(batch) - done
+
+    def _crawl_region(self, region: Region) -> None:
+        puuids, match_ids = self._frontiers(region)
+        concurrency = self._concurrency_for(region)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                while not self._stopped.is_set():
+                    if self._budget_spent():
+                        break
+                    # Finish the matches that have been found before looking further out, so the crawl stays breadth
+                    # first
+                    ids = self._take(match_ids, self.match_batch_size)
+                    if ids:
+                        self._fetch_matches(ids, region, match_ids, concurrency)
+                        continue
+
+                    with self._lock:
+                        n = len(puuids)
+                        if self.max_summoners is not None:
+                            n = min(n, self.max_summoners - self.n_summoners)
+                        batch = self._take(puuids, min(n, concurrency))
+                        self.n_summoners += len(batch)
+                    if not batch:
+                        break
+                    self._fetch_histories(executor, batch, region, puuids)
+        except BaseException as error:
+            with self._lock:
+                self._failures.append(error)
+            self._stopped.set()
+
+    def crawl(self) -> None:
+        """Crawls until there's nothing left to fetch or a budget is reached. Raises the first error that stopped a
+        region's thread (see the class docstring), after the crawl's state has been checkpointed.
+        """
+        self._stopped.clear()
+        self._failures = []
+        if self.max_seconds is not None:
+            self._deadline = time.monotonic() + self.max_seconds
+        threads = [
+            threading.Thread(target=self._crawl_region, args=(region,), name="crawl-{}".format(region.value))
+            for region in list(self._puuids)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            self._deadline = None
+            if self.checkpoint_path is not None:
+                self.save_checkpoint()
+        if self._failures:
+            raise self._failures[0]
+
+    def stop(self) -> None:
+        """Asks a running crawl to stop once the requests in flight have finished."""
+        self._stopped.set()
+
+    # Checkpoints
+
+    def save_checkpoint(self, path: str = None) -> None:
+        """Writes the crawl's state to `path` (by default `checkpoint_path`). The file is replaced atomically, so an
+        interrupted write leaves the previous checkpoint in place.
+
+        The crawl only waits while the state is copied; it carries on while the copy is serialized and written.
+        """
+        path = path or self.checkpoint_path
+        with self._checkpoint_lock:
+            with self._lock:
+                state = {
+                    "version": _CHECKPOINT_VERSION,
+                    "n_matches": self.n_matches,
+                    "n_summoners": self.n_summoners,
+                    "n_errors": self.n_errors,
+                    "regions": {
+                        region.value: {"puuids": list(self._puuids[region]), "match_ids": list(self._match_ids[region])}
+                        for region in self._puuids
+                    },
+                }
+                seen_puuids = self.seen_puuids.copy()
+                seen_matches = self.seen_matches.copy()
+                self._last_checkpoint = self.n_matches
+            state["seen_puuids"] = seen_puuids.to_dict()
+            state["seen_matches"] = seen_matches.to_dict()
+            temporary_path = path + ".tmp"
+            with open(temporary_path, "w") as fp:
+                json.dump(state, fp)
+            os.replace(temporary_path, path)
+
+    def load_checkpoint(self, path: str = None) -> None:
+        """Replaces the crawl's state with a checkpoint written by `save_checkpoint`."""
+        path = path or self.checkpoint_path
+        with open(path) as fp:
+            state = json.load(fp)
+        if state["version"] != _CHECKPOINT_VERSION:
+            raise ValueError("Unsupported crawl checkpoint version {}".format(state["version"]))
+        with self._lock:
+            self.n_matches = self._last_checkpoint = state["n_matches"]
+            self.n_summoners = state["n_summoners"]
+            self.n_errors = state["n_errors"]
+            self._puuids = {Region(region): collections.deque(s["puuids"]) for region, s in state["regions"].items()}
+            self._match_ids = {
+                Region(region): collections.deque(s["match_ids"]) for region, s in state["regions"].items()
+            }
+            self.seen_puuids = SeenSet.from_dict(state["seen_puuids"])
+            self.seen_matches = SeenSet.from_dict(state["seen_matches"])
+
+    @classmethod
+    def resume(cls, checkpoint_path: str, on_match: Callable[[Match], Any] = None, **kwargs) -> "MatchCrawler":
+        """Creates a crawler that carries on from the checkpoint at `checkpoint_path` (and keeps checkpointing there).
+        The budgets in `kwargs` count what was crawled before the checkpoint too.
+        """
+        self = cls(on_match, checkpoint_path=checkpoint_path, **kwargs)
+        self.load_checkpoint()
+        return self
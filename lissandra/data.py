@@ -1,5 +1,4 @@
 from enum import Enum
-import arrow
 
 
 class RoutingRegion(Enum):
@@ -20,6 +20,7 @@ from ..core.league import (
     GrandmasterLeague,
 )
 from ..core.summoner import SummonerData, Summoner
+from ..core.match import MatchData, Match
 from ..core.status import ShardStatusData, ShardStatus
 
 T = TypeVar("T")
@@ -33,6 +34,7 @@ default_expirations = {
     LanguageStrings: datetime.timedelta(days=20),
     ProfileIcons: datetime.timedelta(days=20),
     Summoner: datetime.timedelta(days=1),
+    Match: datetime.timedelta(hours=3),
 }
 
 
@@ -86,15 +88,27 @@ class Cache(DataSource, DataSink):
         query: Mapping[str, Any],
         key_generator: Callable[[Mapping[str, Any]], Any],
         context: PipelineContext = None,
-    ) -> Generator[T, None, None]:
+    ) -> Iterable[T]:
+        # Look everything up before returning anything, so that a partial hit can hand the misses to the next source.
+        # The positions of the misses are positions in the listed identifiers, so those are what's narrowed down.
+        query = util.list_many_query(query)
+        results = []
+        missing = []
         for keys in key_generator(query):
             for key in keys:
                 try:
-                    yield self._cache.get(type, key)
+                    results.append(self._cache.get(type, key))
+                    break
                 except KeyError:
                     pass
             else:
-                raise NotFoundError
+                missing.append(len(results))
+                results.append(None)
+        if not missing:
+            return results
+        if len(missing) == len(results):
+            raise NotFoundError
+        raise util.PartialNotFoundError(results, missing, util.restrict_many_query(query, missing, len(results)))
 
     @staticmethod
     def _put_many_generator(
@@ -319,11 +333,43 @@ class Cache(DataSource, DataSink):
 
     @put.register(Summoner)
     def put_summoner(self, item: Summoner, context: PipelineContext = None) -> None:
+        self._forget_old_summoner_name(item)
         self._put(Summoner, item, uniquekeys.for_summoner, context=context)
 
     @put_many.register(Summoner)
     def put_many_summoner(self, items: Iterable[Summoner], context: PipelineContext = None) -> None:
-        self._put_many(Summoner, items, uniquekeys.for_summoner, context=context)
+        for item in items:
+            self.put_summoner(item, context)
+
+    @put.register(SummonerData)
+    def put_summoner_data(self, item: SummonerData, context: PipelineContext = None) -> None:
+        # The data for a summoner has just been loaded. Whichever identifier it was loaded by, cache one loaded
+        # summoner under all of its identifiers, so later lookups by any of the others don't need to load it again.
+        self.put_summoner(Summoner.from_data(item), context)
+
+    @put_many.register(SummonerData)
+    def put_many_summoner_data(self, items: Iterable[SummonerData], context: PipelineContext = None) -> None:
+        for item in items:
+            self.put_summoner_data(item, context)
+
+    def _forget_old_summoner_name(self, item: Summoner) -> None:
+        # If a summoner has been renamed, its old name must no longer find it.
+        try:
+            platform = item.platform.value
+            data = item._data[SummonerData]
+            key = (platform, "id", data.id)
+            name = uniquekeys.sanitize_summoner_name(data.name)
+            cached = self._cache.get(Summoner, key)
+            old_name = uniquekeys.sanitize_summoner_name(cached._data[SummonerData].name)
+        except (AttributeError, KeyError):
+            return
+        if old_name != name:
+            old_key = (platform, "name", old_name)
+            try:
+                if self._cache.get(Summoner, old_key) is cached:
+                    self._cache.delete(Summoner, old_key)
+            except KeyError:
+                pass
 
     @get.register(SummonerData)
     @validate_query(uniquekeys.validate_summoner_query, util.convert_region_to_platform)
@@ -334,6 +380,37 @@ class Cache(DataSource, DataSink):
         else:
             raise NotFoundError
 
+    #############
+    # Match API #
+    #############
+
+    @get.register(Match)
+    @validate_query(uniquekeys.validate_match_query, util.convert_region_to_platform)
+    def get_match(self, query: Mapping[str, Any], context: PipelineContext = None) -> Match:
+        return self._get(Match, query, uniquekeys.for_match_query, context)
+
+    @get_many.register(Match)
+    @validate_query(uniquekeys.validate_many_match_query, util.convert_region_to_platform)
+    def get_many_match(self, query: Mapping[str, Any], context: PipelineContext = None) -> Generator[Match, None, None]:
+        return self._get_many(Match, query, uniquekeys.for_many_match_query, context)
+
+    @put.register(Match)
+    def put_match(self, item: Match, context: PipelineContext = None) -> None:
+        self._put(Match, item, uniquekeys.for_match, context=context)
+
+    @put_many.register(Match)
+    def put_many_match(self, items: Iterable[Match], context: PipelineContext = None) -> None:
+        self._put_many(Match, items, uniquekeys.for_match, context=context)
+
+    @get.register(MatchData)
+    @validate_query(uniquekeys.validate_match_query, util.convert_region_to_platform)
+    def get_match_data(self, query: Mapping[str, Any], context: PipelineContext = None) -> MatchData:
+        result = self.get_match(query=query, context=context)
+        if result._data[MatchData] is not None and result._Ghost__is_loaded(MatchData):
+            return result._data[MatchData]
+        else:
+            raise NotFoundError
+
     ##############
     # League API #
     ##############
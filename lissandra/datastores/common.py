@@ -1,22 +1,27 @@
 import re
+import sys
 import zlib
+import logging
 from contextlib import contextmanager, ExitStack
 from io import BytesIO
-from typing import Mapping, MutableMapping, Any, Union, Dict, List
+from typing import Mapping, MutableMapping, Any, Union, Dict, List, Tuple
 from urllib.parse import urlencode
 
 try:
-    from pycurl import Curl
+    from pycurl import Curl, error as CurlError, E_OPERATION_TIMEDOUT
 
     USE_PYCURL = True
 except ImportError:
     import requests
+    from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
 
     USE_PYCURL = False
     Curl = None  # This might break a few type hints but they are all internal and not user-facing.
 
 from merakicommons.ratelimits import RateLimiter
 
+from .. import deadlines, tracing
+
 try:
     import certifi
 except ImportError:
@@ -28,10 +33,68 @@ except ImportError:
     import json
 
 
+LOGGER = logging.getLogger("datastores.calls")
+
 _print_calls = True
 _print_api_key = False
 
 
+class _StdoutHandler(logging.StreamHandler):
+    # Like logging's last resort handler, but for stdout: always writes to the current sys.stdout
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_print_handler = _StdoutHandler()
+
+
+def print_calls(calls: bool, api_key: bool = False) -> None:
+    """Every HTTP call is logged (at INFO) to the "datastores.calls" logger. If `calls` is set, they're also printed
+    to stdout, as "Making call: <url>", rather than passed on to the parent loggers' handlers.
+    """
+    global _print_calls, _print_api_key
+    _print_calls = calls
+    _print_api_key = api_key
+    if calls:
+        LOGGER.setLevel(logging.INFO)
+        LOGGER.addHandler(_print_handler)
+        LOGGER.propagate = False
+    else:
+        LOGGER.setLevel(logging.NOTSET)
+        LOGGER.removeHandler(_print_handler)
+        LOGGER.propagate = True
+
+
+print_calls(_print_calls, _print_api_key)
+
+
+def _log_call(url: Union[str, bytes], headers: Mapping[str, str]) -> None:
+    _url = url
+    if isinstance(_url, bytes):
+        _url = str(_url)[2:-1]
+    if _print_api_key and ".api.riotgames.com/lol" in _url:
+        if "?" not in _url:
+            _url += "?api_key={}".format(headers["X-Riot-Token"])
+        else:
+            _url += "&api_key={}".format(headers["X-Riot-Token"])
+    LOGGER.info("Making call: %s", _url, extra={"url": _url})
+
+
+def _span_attributes(url: Union[str, bytes]) -> Dict[str, str]:
+    if not tracing.enabled():
+        return {}
+    return {"http.method": "GET", "http.url": url.decode("utf-8") if isinstance(url, bytes) else url}
+
+
 class HTTPError(RuntimeError):
     def __init__(self, message, code, response_headers: Dict[str, str] = None):
         super().__init__(message)
@@ -39,9 +102,35 @@ class HTTPError(RuntimeError):
         self.response_headers = response_headers or {}
 
 
+# The seconds to wait to connect to a server, and for each read of its response, unless a deadline is sooner
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+
+def _timeouts(connect_timeout: float, read_timeout: float) -> Tuple[float, float, bool]:
+    # Returns the connect and read timeouts for a request made now, and whether they're cut short by the deadline
+    left = deadlines.remaining()
+    if left is None:
+        return connect_timeout, read_timeout, False
+    deadlines.check("sending the request")
+    return min(connect_timeout, left), min(read_timeout, left), left < read_timeout
+
+
+def _timed_out(url: Union[str, bytes], read_timeout: float, by_deadline: bool) -> Exception:
+    if isinstance(url, bytes):
+        url = url.decode("utf-8")
+    if by_deadline:
+        return deadlines.DeadlineExceededError("The request to {} didn't finish before the deadline".format(url))
+    # Handled like an HTTP error, by the "timeout" error handler
+    return HTTPError("The request to {} timed out after {} seconds".format(url, read_timeout), "timeout")
+
+
 if USE_PYCURL:
 
     class HTTPClient(object):
+        connect_timeout = CONNECT_TIMEOUT
+        read_timeout = READ_TIMEOUT
+
         @staticmethod
         def _execute(curl: Curl, close_connection: bool) -> int:
             curl.perform()
@@ -56,6 +145,7 @@ if USE_PYCURL:
             headers: Mapping[str, str] = None,
             rate_limiters: List[RateLimiter] = None,
             connection: Curl = None,
+            timeouts: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
         ) -> (int, bytes, dict):
             if not headers:
                 request_headers = ["Accept-Encoding: gzip"]
@@ -88,25 +178,34 @@ if USE_PYCURL:
             if certifi:
                 curl.setopt(curl.CAINFO, certifi.where())
 
-            if _print_calls:
-                _url = url
-                if isinstance(_url, bytes):
-                    _url = str(_url)[2:-1]
-                if _print_api_key and ".api.riotgames.com/lol" in _url:
-                    if "?" not in _url:
-                        _url += "?api_key={}".format(headers["X-Riot-Token"])
-                    else:
-                        _url += "&api_key={}".format(headers["X-Riot-Token"])
-                print("Making call: {}".format(_url))
+            if LOGGER.isEnabledFor(logging.INFO):
+                _log_call(url, headers)
+            exit_limiters = None
             if rate_limiters:
                 with ExitStack() as stack:
                     # Enter each context manager / rate limiter
-                    limiters = [stack.enter_context(rate_limiter) for rate_limiter in rate_limiters]
+                    with tracing.span("rate_limiter.wait"):
+                        limiters = [stack.enter_context(rate_limiter) for rate_limiter in rate_limiters]
                     exit_limiters = stack.pop_all().__exit__
-                    status_code = HTTPClient._execute(curl, connection is None)
-                exit_limiters(None, None, None)
-            else:
-                status_code = HTTPClient._execute(curl, connection is None)
+            try:
+                # The timeouts are worked out after waiting for the rate limiters, which may have used up the deadline
+                connect_timeout, read_timeout, by_deadline = _timeouts(*timeouts)
+                curl.setopt(curl.CONNECTTIMEOUT_MS, max(1, int(connect_timeout * 1000)))
+                # Curl doesn't have a read timeout, so give up if nothing is received for that long instead
+                curl.setopt(curl.LOW_SPEED_LIMIT, 1)
+                curl.setopt(curl.LOW_SPEED_TIME, max(1, int(read_timeout)))
+                curl.setopt(curl.TIMEOUT_MS, max(1, int(read_timeout * 1000)) if by_deadline else 0)
+                with tracing.span("http.get", _span_attributes(url)) as span:
+                    try:
+                        status_code = HTTPClient._execute(curl, connection is None)
+                    except CurlError as error:
+                        if error.args[0] == E_OPERATION_TIMEDOUT:
+                            raise _timed_out(url, read_timeout, by_deadline) from error
+                        raise
+                    span.set_attribute("http.status_code", status_code)
+            finally:
+                if exit_limiters is not None:
+                    exit_limiters(None, None, None)
 
             body = buffer.getvalue()
 
@@ -135,7 +234,9 @@ if USE_PYCURL:
                     parameters = urlencode(parameters, doseq=True)
                 url = "{url}?{params}".format(url=url, params=parameters)
 
-            status_code, body, response_headers = HTTPClient._get(url, headers, rate_limiters, connection)
+            status_code, body, response_headers = HTTPClient._get(
+                url, headers, rate_limiters, connection, (self.connect_timeout, self.read_timeout)
+            )
 
             content_type = response_headers.get("Content-Type", "application/octet-stream").upper()
 
@@ -172,10 +273,16 @@ if USE_PYCURL:
 else:  # Use requests
 
     class HTTPClient(object):
+        connect_timeout = CONNECT_TIMEOUT
+        read_timeout = READ_TIMEOUT
+
         @staticmethod
         def _get(
-            url: str, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None
-        ) -> (int, bytes, dict):
+            url: str,
+            headers: Mapping[str, str] = None,
+            rate_limiters: List[RateLimiter] = None,
+            timeouts: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        ) -> requests.Response:
             if not headers:
                 request_headers = {"Accept-Encoding": "gzip"}
             else:
@@ -183,28 +290,64 @@ else:  # Use requests
                 if "Accept-Encoding" not in headers:
                     request_headers["Accept-Encoding"] = "gzip"
 
-            if _print_calls:
-                _url = url
-                if isinstance(_url, bytes):
-                    _url = str(_url)[2:-1]
-                if _print_api_key and ".api.riotgames.com/lol" in _url:
-                    if "?" not in _url:
-                        _url += "?api_key={}".format(headers["X-Riot-Token"])
-                    else:
-                        _url += "&api_key={}".format(headers["X-Riot-Token"])
-                print("Making call: {}".format(_url))
+            if LOGGER.isEnabledFor(logging.INFO):
+                _log_call(url, headers)
+            exit_limiters = None
             if rate_limiters:
                 with ExitStack() as stack:
                     # Enter each context manager / rate limiter
-                    limiters = [stack.enter_context(rate_limiter) for rate_limiter in rate_limiters]
+                    with tracing.span("rate_limiter.wait"):
+                        limiters = [stack.enter_context(rate_limiter) for rate_limiter in rate_limiters]
                     exit_limiters = stack.pop_all().__exit__
-                    r = requests.get(url, headers=request_headers)
-                exit_limiters(None, None, None)
-            else:
-                r = requests.get(url, headers=request_headers)
+            try:
+                # The timeouts are worked out after waiting for the rate limiters, which may have used up the deadline
+                connect_timeout, read_timeout, by_deadline = _timeouts(*timeouts)
+                with tracing.span("http.get", _span_attributes(url)) as span:
+                    try:
+                        r = requests.get(
+                            url, headers=request_headers, timeout=(connect_timeout, read_timeout), stream=True
+                        )
+                    except requests.Timeout as error:
+                        raise _timed_out(url, read_timeout, by_deadline) from error
+                    span.set_attribute("http.status_code", r.status_code)
+                    HTTPClient._read_body(r, url, read_timeout, by_deadline)
+            finally:
+                if exit_limiters is not None:
+                    exit_limiters(None, None, None)
 
             return r
 
+        @staticmethod
+        def _read_body(r: requests.Response, url: str, read_timeout: float, by_deadline: bool) -> None:
+            # The body is read here rather than by `r.content`, which would raise a read timeout as a
+            # `requests.ConnectionError` that the "timeout" error handler never sees. The read timeout also only bounds
+            # each read from the socket, so a response that trickles in could take past the deadline. It's read a
+            # little at a time instead, checking the deadline before each read, and then stored where `r.content` (and
+            # so `r.text` and `r.json()`) would have put it.
+            # urllib3 2's `read1` makes at most one read from the socket; older versions can make a few per chunk.
+            read = getattr(r.raw, "read1", None) or r.raw.read
+            has_deadline = deadlines.current() is not None
+            chunks = []
+            try:
+                while True:
+                    if has_deadline and deadlines.remaining() <= 0:
+                        raise _timed_out(url, read_timeout, True)
+                    chunk = read(16384, decode_content=True)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            # The other errors are raised as the exceptions `r.content` would have raised
+            except ReadTimeoutError as error:
+                raise _timed_out(url, read_timeout, by_deadline) from error
+            except ProtocolError as error:
+                raise requests.exceptions.ChunkedEncodingError(error) from error
+            except DecodeError as error:
+                raise requests.exceptions.ContentDecodingError(error) from error
+            finally:
+                r.close()
+            r._content = b"".join(chunks)
+            r._content_consumed = True
+
         def get(
             self,
             url: str,
@@ -221,7 +364,7 @@ else:  # Use requests
                 url = "{url}?{params}".format(url=url, params=parameters)
 
             # status_code, body, response_headers = HTTPClient._get(url, headers, rate_limiters)
-            r = HTTPClient._get(url, headers, rate_limiters)
+            r = HTTPClient._get(url, headers, rate_limiters, (self.connect_timeout, self.read_timeout))
             response_headers = r.headers
 
             # Handle errors
@@ -1,6 +1,5 @@
 from typing import Type, TypeVar, MutableMapping, Any, Iterable, Union
 import arrow
-import copy
 
 from datapipelines import DataSource, PipelineContext, Query, validate_query
 
@@ -20,6 +19,8 @@ from ..core import (
     LeagueEntries,
     VerificationString,
     Summoner,
+    Match,
+    MatchHistory,
 )
 from ..core.league import (
     LeagueEntry,
@@ -28,6 +29,7 @@ from ..core.league import (
     LeagueSummonerEntries,
     LeagueSummonerEntriesData,
 )
+from ..core.match import MatchListData
 from ..core.staticdata.profileicon import ProfileIconListData
 from ..core.staticdata.language import LanguagesData
 from ..core.staticdata.version import VersionListData
@@ -119,6 +121,12 @@ class UnloadedGhostStore(DataSource):
         .as_(Platform)
     )
 
+    _validate_get_match_query = Query.has("id").as_(str).also.has("platform").as_(Platform)
+
+    _validate_get_match_history_query = (
+        Query.has("puuid").as_(str).also.has("platform").as_(Platform).also.can_have("count").as_(int)
+    )
+
     _validate_get_verification_string_query = Query.has("platform").as_(Platform).also.has("summoner.id").as_(str)
 
     @get.register(Realms)
@@ -142,12 +150,28 @@ class UnloadedGhostStore(DataSource):
     @get.register(Summoner)
     @validate_query(_validate_get_summoner_query, convert_region_to_platform)
     def get_summoner(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Summoner:
-        kwargs = copy.deepcopy(query)
+        kwargs = dict(query)
         kwargs["region"] = kwargs.pop("platform").region
         if "accountId" in kwargs:
             kwargs["account_id"] = kwargs.pop("accountId")
         return Summoner._construct_normally(**kwargs)
 
+    @get.register(Match)
+    @validate_query(_validate_get_match_query, convert_region_to_platform)
+    def get_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Match:
+        return Match._construct_normally(id=query["id"], region=query["platform"].region)
+
+    @get.register(MatchHistory)
+    @validate_query(_validate_get_match_history_query, convert_region_to_platform)
+    def get_match_history(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> MatchHistory:
+        def match_history_generator(query):
+            data = context[context.Keys.PIPELINE].get(MatchListData, query)
+            for id in data:
+                yield Match(id=id, region=data.region)
+
+        kwargs = {"puuid": query["puuid"], "count": query.get("count", 20), "region": query["region"]}
+        return MatchHistory.from_generator(generator=match_history_generator(query), **kwargs)
+
     @get.register(ShardStatus)
     @validate_query(_validate_get_shard_status_query, convert_region_to_platform)
     def get_shard_status(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> ShardStatus:
@@ -193,7 +217,7 @@ class UnloadedGhostStore(DataSource):
         def generate_entries(original_query):
             page = 1
             while True:
-                new_query = copy.deepcopy(original_query)
+                new_query = dict(original_query)
                 new_query["page"] = page
                 data = context[context.Keys.PIPELINE].get(LeagueEntriesData, query=new_query)
                 n_new_results = len(data)
@@ -206,7 +230,7 @@ class UnloadedGhostStore(DataSource):
                     break
                 page += 1
 
-        original_query = copy.deepcopy(query)
+        original_query = dict(query)
         return LeagueEntries.from_generator(
             generator=generate_entries(original_query),
             region=query["region"],
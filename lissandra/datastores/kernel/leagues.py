@@ -2,7 +2,7 @@ from typing import Type, TypeVar, MutableMapping, Any, Iterable, Generator
 
 from datapipelines import DataSource, PipelineContext, Query, NotFoundError, validate_query
 from .common import KernelSource, APINotFoundError
-from ...data import Platform, Tier, Division
+from ...data import Platform, Tier, Division, Queue
 from ...dto.league import (
     LeagueEntriesDto,
     LeagueDto,
@@ -58,6 +58,7 @@ class LeaguesAPI(KernelSource):
             entries=data,
             page=query["page"],
             region=query["region"].value,
+            queue=Queue.ranked_tft.value,
             tier=query["tier"].value,
             division=query["division"].value,
         )
@@ -1,12 +1,21 @@
-from typing import Iterable, Set, Dict
+from typing import Iterable, Set, Dict, Type, TypeVar, Mapping, Any, List, Callable, Union
 import os
+import threading
 
-from datapipelines import CompositeDataSource
-from .common import RiotAPIService, RiotAPIRateLimiter
+from datapipelines import CompositeDataSource, DataSource, NotFoundError, PipelineContext
+from ..util import PartialNotFoundError
+from .common import RiotAPIService, RiotAPIRateLimiter, LOGGER, window_limiter
+
+T = TypeVar("T")
 
 
 def _default_services(
-    api_key: str, limiting_share: float = 1.0, request_error_handling: Dict = None
+    api_key: str,
+    limiting_share: float = 1.0,
+    request_error_handling: Dict = None,
+    adaptive_rate_limiting: Union[bool, Dict] = True,
+    rate_limiter: Union[str, Dict] = "fixed_window",
+    hedging: Union[bool, Dict] = False,
 ) -> Set[RiotAPIService]:
     from ..common import HTTPClient
     from ..image import ImageDataSource
@@ -14,9 +23,25 @@ def _default_services(
     from .leagues import LeaguesAPI
     from .thirdpartycode import ThirdPartyCodeAPI
     from .summoner import SummonerAPI
-    from ...data import Platform
+    from .match import MatchAPI
+    from ...data import Platform, RoutingRegion
 
-    app_rate_limiter = {platform: RiotAPIRateLimiter(limiting_share=limiting_share) for platform in Platform}
+    new_window_limiter = window_limiter(rate_limiter)
+    app_rate_limiter = {
+        platform: RiotAPIRateLimiter(
+            limiting_share=limiting_share, platform=platform, window_limiter=new_window_limiter
+        )
+        for platform in Platform
+    }
+    # The match endpoints are limited per routing region, so they get their own application limiters
+    app_rate_limiter.update(
+        {
+            region: RiotAPIRateLimiter(
+                limiting_share=limiting_share, platform=region, window_limiter=new_window_limiter
+            )
+            for region in RoutingRegion
+        }
+    )
 
     client = HTTPClient()
     services = {
@@ -26,24 +51,45 @@ def _default_services(
             app_rate_limiter=app_rate_limiter,
             request_error_handling=request_error_handling,
             http_client=client,
+            adaptive_rate_limiting=adaptive_rate_limiting,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
         ),
         LeaguesAPI(
             api_key,
             app_rate_limiter=app_rate_limiter,
             request_error_handling=request_error_handling,
             http_client=client,
+            adaptive_rate_limiting=adaptive_rate_limiting,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
         ),
         ThirdPartyCodeAPI(
             api_key,
             app_rate_limiter=app_rate_limiter,
             request_error_handling=request_error_handling,
             http_client=client,
+            adaptive_rate_limiting=adaptive_rate_limiting,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
         ),
         SummonerAPI(
             api_key,
             app_rate_limiter=app_rate_limiter,
             request_error_handling=request_error_handling,
             http_client=client,
+            adaptive_rate_limiting=adaptive_rate_limiting,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
+        ),
+        MatchAPI(
+            api_key,
+            app_rate_limiter=app_rate_limiter,
+            request_error_handling=request_error_handling,
+            http_client=client,
+            adaptive_rate_limiting=adaptive_rate_limiting,
+            rate_limiter=rate_limiter,
+            hedging=hedging,
         ),
     }
 
@@ -57,6 +103,9 @@ class RiotAPI(CompositeDataSource):
         services: Iterable[RiotAPIService] = None,
         limiting_share: float = 1.0,
         request_error_handling: Dict = None,
+        adaptive_rate_limiting: Union[bool, Dict] = True,
+        rate_limiter: Union[str, Dict] = "fixed_window",
+        hedging: Union[bool, Dict] = False,
     ) -> None:
         if api_key is None:
             api_key = "RIOT_API_KEY"  # Use this env variable.
@@ -65,13 +114,74 @@ class RiotAPI(CompositeDataSource):
 
         if services is None:
             services = _default_services(
-                api_key=api_key, limiting_share=limiting_share, request_error_handling=request_error_handling
+                api_key=api_key,
+                limiting_share=limiting_share,
+                request_error_handling=request_error_handling,
+                adaptive_rate_limiting=adaptive_rate_limiting,
+                rate_limiter=rate_limiter,
+                hedging=hedging,
             )
 
         super().__init__(services)
 
+    def get_many(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        # Unlike CompositeDataSource.get_many, this lets a partial result through (rather than turning it into a plain
+        # NotFoundError) so the pipeline can fill in the rest, and only asks the services that have a get_many for
+        # this type.
+        try:
+            sources = self._sources[type]
+        except KeyError as error:
+            raise DataSource.unsupported(type) from error
+
+        for source in sources:
+            if type not in getattr(source.__class__.get_many, "_provides", (type,)):
+                continue
+            try:
+                return source.get_many(type, dict(query), context)
+            except PartialNotFoundError:
+                raise
+            except NotFoundError:
+                continue
+        raise NotFoundError()
+
     def set_api_key(self, key: str):
         for sources in self._sources.values():
             for source in sources:
                 if isinstance(source, RiotAPIService):
                     source._headers["X-Riot-Token"] = key
+
+    def rate_limits(self) -> List[Dict[str, Any]]:
+        """Returns a `RiotAPIRateLimiter.snapshot` of every rate limiter that's been used so far."""
+        limiters = {}
+        for sources in self._sources.values():
+            for source in sources:
+                if isinstance(source, RiotAPIService):
+                    for limiter in source.rate_limiters():
+                        limiters[id(limiter)] = limiter
+        return [limiter.snapshot() for limiter in limiters.values()]
+
+
+class RateLimitMonitor(threading.Thread):
+    """Calls `callback` with the rate limit snapshots from `snapshot` every `interval` seconds, until it's stopped."""
+
+    def __init__(
+        self,
+        callback: Callable[[List[Dict[str, Any]]], Any],
+        snapshot: Callable[[], List[Dict[str, Any]]],
+        interval: float = 1.0,
+    ):
+        super().__init__(name="lissandra-rate-limit-monitor", daemon=True)
+        self.callback = callback
+        self.snapshot = snapshot
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.callback(self.snapshot())
+            except Exception:
+                LOGGER.exception("The rate limit monitor's callback failed")
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -1,16 +1,29 @@
+import math
 import time
 import copy
+import logging
+import threading
 import functools
 import collections
+import collections.abc
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from abc import abstractmethod, ABC
-from typing import MutableMapping, Any, Union, TypeVar, Iterable, Type, List, Tuple, Dict, Callable
+from typing import MutableMapping, Any, Union, TypeVar, Iterable, Type, List, Tuple, Dict, Callable, Optional
 
-from datapipelines import DataSource, PipelineContext
-from merakicommons.ratelimits import FixedWindowRateLimiter, MultiRateLimiter
+from datapipelines import DataSource, PipelineContext, NotFoundError
+from merakicommons.ratelimits import FixedWindowRateLimiter, MultiRateLimiter, RateLimiter
 
 from ..common import HTTPClient, HTTPError, Curl
-from ...data import Platform
+from ... import deadlines
+from ...data import Platform, RoutingRegion
 from ...dto.staticdata.realm import RealmDto
+from ...metrics import REQUESTS, REQUEST_DURATION, RESPONSE_BYTES, RETRIES, RATE_LIMITER_WAIT, HEDGED_REQUESTS
+from ..util import restrict_many_query, PartialNotFoundError
+
+LOGGER = logging.getLogger("datastores.riotapi")
+
+# How long the current thread has spent waiting for rate limiters, so that request durations can leave it out
+_limiter_waits = threading.local()
 
 
 def _get_latest_version(query: MutableMapping[str, Any], context: PipelineContext) -> str:
@@ -39,6 +52,10 @@ class APIForbiddenError(APINotFoundError):
     pass
 
 
+class APITimeoutError(HTTPError):
+    pass
+
+
 _ERROR_CODES = {
     400: APIRequestError,
     401: APIForbiddenError,
@@ -50,45 +67,544 @@ _ERROR_CODES = {
     502: APIError,
     503: APIError,
     504: APIError,
+    "timeout": APITimeoutError,
 }
 
 T = TypeVar("T")
 
 
+class FixedWindowLimiter(FixedWindowRateLimiter):
+    """A `FixedWindowRateLimiter` that keeps track of how many requests are waiting for it, how long they've waited,
+    and when its window resets, so that its state can be reported by `snapshot`.
+    """
+
+    def __init__(self, window_seconds: int, window_permits: int, timeout: int = -1) -> None:
+        super().__init__(window_seconds=window_seconds, window_permits=window_permits, timeout=timeout)
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._wait_seconds = 0.0
+
+    def __enter__(self) -> "FixedWindowLimiter":
+        with self._stats_lock:
+            self._waiting += 1
+        start = time.perf_counter()
+        try:
+            # Don't wait past the deadline for a permit
+            left = deadlines.remaining()
+            timeout = self._timeout
+            if left is not None:
+                timeout = max(0.0, left if timeout < 0 else min(left, timeout))
+            if not self._permitter.acquire(timeout=timeout):
+                deadlines.check("a rate limiter permit was available")
+                raise TimeoutError("Rate Limiter timed out!")
+            with self._total_permits_issued_lock:
+                self._total_permits_issued += 1
+            with self._currently_processing_lock:
+                self._currently_processing += 1
+            return self
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._waiting -= 1
+                self._wait_seconds += waited
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        super().__exit__(exc_type, exc_val, exc_tb)
+        self._mark_reset(self._window_seconds, only_if_new=True)
+
+    def restrict_for(self, seconds: int) -> None:
+        super().restrict_for(seconds)
+        self._mark_reset(seconds)
+
+    def seed(self, used: int) -> None:
+        """Starts a window with `used` of its permits already used (by requests made before this limiter existed)."""
+        with self._resetter_lock:
+            self._permitter.drain(used)
+            if not self._resetter:
+                self._resetter = threading.Timer(self._window_seconds, self._reset)
+                self._resetter.cancelled = False
+                self._resetter.daemon = True
+                self._resetter.start()
+        self._mark_reset(self._window_seconds, only_if_new=True)
+
+    def _mark_reset(self, seconds: float, only_if_new: bool = False) -> None:
+        # The resetter is a Timer, which doesn't say when it will fire, so we note that on it when it's started
+        resetter = self._resetter
+        if resetter is not None and not (only_if_new and hasattr(resetter, "resets_at")):
+            resetter.resets_at = time.monotonic() + seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        permits = self._window_permits
+        remaining = max(0, min(self._permitter._permits, permits))
+        resetter = self._resetter
+        resets_at = getattr(resetter, "resets_at", None)
+        with self._stats_lock:
+            waiting, wait_seconds = self._waiting, self._wait_seconds
+        return {
+            "window_seconds": self._window_seconds,
+            "permits": permits,
+            "used": permits - remaining,
+            "remaining": remaining,
+            "utilisation": (permits - remaining) / permits if permits else 0.0,
+            # None if the window hasn't started, i.e. nothing has been sent since it last reset
+            "seconds_until_reset": None if resets_at is None else max(0.0, resets_at - time.monotonic()),
+            "waiting": waiting,
+            "wait_seconds": wait_seconds,
+            "permits_issued": self.permits_issued,
+        }
+
+
+class GCRALimiter(RateLimiter):
+    """Spreads a window's permits evenly over the window, rather than letting them all go at the start of it as a
+    `FixedWindowLimiter` does.
+
+    This is the generic cell rate algorithm: a permit is issued every `window_seconds / n` seconds, where n leaves room
+    for a burst of up to `burst` (as a fraction of the permits) at once, so that no span of `window_seconds` gets more
+    than `window_permits`, however it's aligned with the Riot API's own windows. The permits are spread over
+    `margin` more seconds than the window, so that requests that take longer than others to reach the Riot API don't
+    land in the same window as the ones sent after them.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int,
+        window_permits: int,
+        burst: float = 0.05,
+        margin: float = 0.05,
+        timeout: float = -1,
+    ) -> None:
+        if not 0.0 <= burst <= 1.0:
+            raise ValueError("burst must be between 0 and 1")
+        self._window_seconds = window_seconds
+        self._burst = burst
+        self._margin = margin
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._theoretical_arrival = -math.inf  # When the next permit would be issued if nothing were bursting
+        self._restricted_until = -math.inf
+        self._issued = collections.deque()  # When each of the permits issued in the last window was issued
+        self._total_permits_issued = 0
+        self._waiting = 0
+        self._wait_seconds = 0.0
+        self.set_permits(window_permits)
+
+    def set_permits(self, permits: int) -> None:
+        with self._lock:
+            self._window_permits = permits
+            burst = max(1, int(permits * self._burst))
+            # A burst of b, then one permit every interval, puts b + (window / interval) - 1 permits in a window
+            self._interval = (self._window_seconds + self._margin) / max(permits - burst + 1, 1e-9)
+            self._tolerance = (burst - 1) * self._interval
+
+    def __enter__(self) -> "GCRALimiter":
+        start = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    issue_at = max(self._theoretical_arrival - self._tolerance, self._restricted_until)
+                    if now >= issue_at:
+                        # Spaced from when the permit is actually issued, so that a late request doesn't bunch up
+                        # with the next ones
+                        self._theoretical_arrival = max(self._theoretical_arrival, now) + self._interval
+                        while self._issued and self._issued[0] <= now - self._window_seconds:
+                            self._issued.popleft()
+                        self._issued.append(now)
+                        self._total_permits_issued += 1
+                        return self
+                if 0 <= self._timeout < issue_at - start:
+                    raise TimeoutError("Rate Limiter timed out!")
+                left = deadlines.remaining()
+                if left is not None and left < issue_at - now:
+                    raise deadlines.DeadlineExceededError(
+                        "The next rate limiter permit is {:.3f} seconds away, after the deadline".format(issue_at - now)
+                    )
+                time.sleep(issue_at - now)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                self._wait_seconds += time.monotonic() - start
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def seed(self, used: int) -> None:
+        """Counts `used` permits as issued just now (by requests made before this limiter existed)."""
+        with self._lock:
+            self._theoretical_arrival = max(self._theoretical_arrival, time.monotonic()) + used * self._interval
+
+    def restrict_for(self, seconds: int) -> None:
+        with self._lock:
+            self._restricted_until = max(self._restricted_until, time.monotonic() + seconds)
+            self._theoretical_arrival = max(self._theoretical_arrival, self._restricted_until)
+
+    @property
+    def permits_issued(self) -> int:
+        with self._lock:
+            return self._total_permits_issued
+
+    def reset_permits_issued(self) -> None:
+        with self._lock:
+            self._total_permits_issued = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._issued and self._issued[0] <= now - self._window_seconds:
+                self._issued.popleft()
+            used = len(self._issued)
+            permits = self._window_permits
+            # The time until a full burst is available again
+            until_reset = max(self._theoretical_arrival, self._restricted_until) - now
+            snapshot = {
+                "window_seconds": self._window_seconds,
+                "permits": permits,
+                "used": used,
+                "remaining": max(0, permits - used),
+                "utilisation": used / permits if permits else 0.0,
+                "seconds_until_reset": until_reset if until_reset > 0 else None,
+                "waiting": self._waiting,
+                "wait_seconds": self._wait_seconds,
+                "permits_issued": self._total_permits_issued,
+            }
+        return snapshot
+
+
+_WINDOW_LIMITERS = {"fixed_window": FixedWindowLimiter, "gcra": GCRALimiter}
+
+
+def window_limiter(config: Union[str, Dict[str, Any]]) -> Callable[..., RateLimiter]:
+    """Returns what to make the limiter for each rate limit window with (called with `window_seconds` and
+    `window_permits`), from the "rate_limiter" setting: "fixed_window" or "gcra", or a dict with that as its
+    "strategy" and the limiter's other arguments.
+    """
+    if isinstance(config, str):
+        config = {"strategy": config}
+    config = dict(config)
+    strategy = config.pop("strategy")
+    try:
+        return functools.partial(_WINDOW_LIMITERS[strategy], **config)
+    except KeyError as error:
+        raise ValueError(
+            'Unknown rate limiter "{}", use one of {}'.format(strategy, ", ".join(sorted(_WINDOW_LIMITERS)))
+        ) from error
+
+
+class AdaptiveRateControl(object):
+    """Adapts the share of a method limiter's permits that we use to the capacity the Riot API actually has.
+
+    Service rate limits (429s that aren't for our application or method limits) mean that the service behind an
+    endpoint is overloaded, whatever our limits say. Each one multiplies the share by `decrease_factor` (but only once
+    per `interval`, as a burst of requests tends to get limited all at once), down to `min_share`. Every `interval`
+    after that without one, responses add `increase` back to the share, until it's back to all of the permits.
+    """
+
+    def __init__(
+        self, decrease_factor: float = 0.5, increase: float = 0.1, interval: float = 1.0, min_share: float = 0.1
+    ):
+        if not 0.0 < decrease_factor < 1.0:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if not 0.0 < min_share <= 1.0:
+            raise ValueError("min_share must be between 0 and 1")
+        self.decrease_factor = decrease_factor
+        self.increase = increase
+        self.interval = interval
+        self.min_share = min_share
+        self.share = 1.0
+        self._changed = -math.inf
+        self._lock = threading.Lock()
+
+    def limited(self) -> bool:
+        """Lowers the share after a service rate limit, and returns whether it changed."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._changed < self.interval or self.share <= self.min_share:
+                return False
+            self.share = max(self.min_share, self.share * self.decrease_factor)
+            self._changed = now
+            return True
+
+    def succeeded(self) -> bool:
+        """Raises the share after a successful response if it's been long enough, and returns whether it changed."""
+        if self.share >= 1.0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._changed < self.interval or self.share >= 1.0:
+                return False
+            self.share = min(1.0, self.share + self.increase)
+            self._changed = now
+            return True
+
+
+class HedgingPolicy(object):
+    """Decides when a request is slow enough to hedge, i.e. to send a second, identical request and use whichever
+    answers first.
+
+    A request is hedged once it's taken longer than the `quantile` of its endpoint's latest `samples` latencies (but
+    at least `min_delay`), once there are `min_samples` of them. Every hedgeable request adds `max_share` of a hedge
+    to a budget (of at most `max_burst`), and each hedge takes one from it, so at most about `max_share` of the
+    requests are hedges. Hedgeable requests are run on a pool of `max_workers` threads.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        samples: int = 200,
+        max_share: float = 0.05,
+        max_burst: float = 5.0,
+        max_workers: int = 20,
+    ):
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        if not 0.0 <= max_share <= 1.0:
+            raise ValueError("max_share must be between 0 and 1")
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.samples = samples
+        self.max_share = max_share
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+        self._latencies = {}  # type: Dict[Tuple[str, str], collections.deque]
+        self._budget = 0.0
+        self._lock = threading.Lock()
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+
+    def observe(self, platform: str, endpoint: str, seconds: float) -> None:
+        """Records the latency of a successful request."""
+        with self._lock:
+            try:
+                latencies = self._latencies[(platform, endpoint)]
+            except KeyError:
+                latencies = self._latencies[(platform, endpoint)] = collections.deque(maxlen=self.samples)
+            latencies.append(seconds)
+
+    def delay(self, platform: str, endpoint: str) -> Optional[float]:
+        """Returns how long to wait for a request before hedging it, or None if there aren't enough samples yet."""
+        with self._lock:
+            latencies = sorted(self._latencies.get((platform, endpoint), ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, latencies[min(len(latencies) - 1, int(self.quantile * len(latencies)))])
+
+    def earn(self) -> None:
+        with self._lock:
+            self._budget = min(self.max_burst, self._budget + self.max_share)
+
+    def spend(self) -> bool:
+        """Takes a hedge from the budget, and returns whether there was one to take."""
+        with self._lock:
+            if self._budget < 1.0:
+                return False
+            self._budget -= 1.0
+            return True
+
+    def refund(self) -> None:
+        with self._lock:
+            self._budget += 1.0
+
+    def submit(self, function: Callable[[], T]) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lissandra-hedge")
+        return self._executor.submit(function)
+
+
+class _HeldPermit(object):
+    # A rate limiter that has already been entered: entering it again does nothing, and exiting it (only the first
+    # time) exits the rate limiter. It lets a request use permits that were taken before it was sent.
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self._exited = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "_HeldPermit":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        with self._lock:
+            if self._exited:
+                return
+            self._exited = True
+        self.limiter.__exit__(exc_type, exc_val, exc_tb)
+
+
+def _enter_now(limiters: List[RateLimiter]) -> Optional[List[_HeldPermit]]:
+    """Enters each of `limiters` if they all have a permit available right now, without waiting."""
+    entered = []
+    try:
+        # A deadline of now stops the window limiters from waiting
+        with deadlines.deadline(0.0):
+            for limiter in limiters:
+                limiter.__enter__()
+                entered.append(limiter)
+    except TimeoutError:
+        for limiter in entered:
+            limiter.__exit__(None, None, None)
+        return None
+    return [_HeldPermit(limiter) for limiter in entered]
+
+
 class RiotAPIRateLimiter(MultiRateLimiter):
     # The application limiter and method limiters will each be an instance of this.
+    # `platform` and `endpoint` (None for application limiters) are only used to label metrics, logs and snapshots.
 
-    def __init__(self, limiting_share):
+    # Method limiters can also have an `AdaptiveRateControl`, which scales down their permits under service rate limits.
+
+    def __init__(
+        self,
+        limiting_share,
+        platform: Union[Platform, RoutingRegion] = None,
+        endpoint: str = None,
+        adaptive: AdaptiveRateControl = None,
+        window_limiter: Callable[..., RateLimiter] = FixedWindowLimiter,
+    ):
         self.limiting_share = limiting_share
+        self.platform = platform
+        self.endpoint = endpoint
+        self.adaptive = adaptive
+        self.window_limiter = window_limiter
+        self._limits = []  # The limits from the latest response headers
         super().__init__()  # Initialize with no underlying limiters
         self._limiters = []  # Make it a list rather than a tuple so we can append
+        # Concurrent requests can all get their first response headers back at once
+        self._construct_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wait_seconds = 0.0
+        self._rate_limited = collections.Counter()  # The number of 429s by limit type
+
+    def __enter__(self) -> "RiotAPIRateLimiter":
+        start = time.perf_counter()
+        entered = []
+        try:
+            for limiter in self._limiters:
+                limiter.__enter__()
+                entered.append(limiter)
+        except BaseException as error:
+            # Exit the windows we got into (e.g. if the deadline passed waiting for the next one), so that they don't
+            # count the request as still in progress
+            for limiter in entered:
+                limiter.__exit__(type(error), error, error.__traceback__)
+            raise
+        with self._total_permits_issued_lock:
+            self._total_permits_issued += 1
+        waited = time.perf_counter() - start
+        RATE_LIMITER_WAIT.observe(
+            waited, platform=_label(self.platform), limiter="application" if self.endpoint is None else self.endpoint
+        )
+        _limiter_waits.seconds = getattr(_limiter_waits, "seconds", 0.0) + waited
+        with self._stats_lock:
+            self._wait_seconds += waited
+        return self
 
     def restrict_for(self, seconds: int) -> None:
         for limiter in self._limiters:
             limiter.restrict_for(seconds)
 
-    def _construct_limiters(self, limits: List[List[int]]):
-        # Creates the necessary FixedWindowRateLimiters from the rates in the headers
+    def record_rate_limited(self, limit_type: str) -> None:
+        """Counts a 429 response of `limit_type` ("application", "method" or "service") against this limiter."""
+        with self._stats_lock:
+            self._rate_limited[limit_type] += 1
+        if limit_type == "service" and self.adaptive is not None and self.adaptive.limited():
+            LOGGER.warning(
+                "Service rate limited on %s %s, lowering its share of the method rate limit to %.2f",
+                _label(self.platform),
+                self.endpoint,
+                self.adaptive.share,
+                extra={"platform": _label(self.platform), "endpoint": self.endpoint, "share": self.adaptive.share},
+            )
+            self._set_permits()
+
+    def record_success(self) -> None:
+        if self.adaptive is not None and self.adaptive.succeeded():
+            LOGGER.info(
+                "Raising %s %s's share of the method rate limit to %.2f",
+                _label(self.platform),
+                self.endpoint,
+                self.adaptive.share,
+                extra={"platform": _label(self.platform), "endpoint": self.endpoint, "share": self.adaptive.share},
+            )
+            self._set_permits()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current state of this limiter and of each of its windows (the limits from the Riot API's headers,
+        which we don't know until the first response).
+
+        Each window reports its `permits` (after the `limiting_share`), how many of them are `used` and `remaining`,
+        the `seconds_until_reset` (None if the window hasn't started), how many requests are `waiting` for a permit and
+        the total `wait_seconds` they've waited. `rate_limited` counts the 429s we've had, by limit type.
+        """
+        with self._stats_lock:
+            wait_seconds, rate_limited = self._wait_seconds, dict(self._rate_limited)
+        return {
+            "platform": _label(self.platform),
+            "endpoint": self.endpoint,
+            "limiting_share": self.limiting_share,
+            # The share of the permits that the adaptive control allows (after the `limiting_share`)
+            "adaptive_share": None if self.adaptive is None else self.adaptive.share,
+            "permits_issued": self.permits_issued,
+            "wait_seconds": wait_seconds,
+            "rate_limited": rate_limited,
+            "windows": [limiter.snapshot() for limiter in list(self._limiters)],
+        }
+
+    def _construct_limiters(self, limits: List[List[int]], counts: List[List[int]] = None):
+        # Creates the necessary window limiters (FixedWindowLimiters unless configured otherwise) from the rates in
+        # the headers. The requests made before then are already counted in Riot's windows, so they're counted in
+        # ours too.
         assert len(self._limiters) == 0
+        used = {window: count for count, window in counts or ()}
         # Create the rate limiters
         for permits, window in limits:
-            self._limiters.append(FixedWindowRateLimiter(window_seconds=window, window_permits=permits))
+            limiter = self.window_limiter(window_seconds=window, window_permits=permits)
+            if used.get(window):
+                limiter.seed(used[window])
+            self._limiters.append(limiter)
 
-    def adjust_rate_limits_if_necessary(self, limits: List[List[int]]) -> None:
+    def adjust_rate_limits_if_necessary(self, limits: List[List[int]], counts: List[List[int]] = None) -> None:
         if len(self._limiters) == 0:
-            self._construct_limiters(limits)
-        for permits, window in limits:
-            permits = permits * self.limiting_share
+            with self._construct_lock:
+                if len(self._limiters) == 0:
+                    self._construct_limiters(limits, counts)
+        self._limits = limits
+        self._set_permits()
+
+    def _set_permits(self) -> None:
+        share = self.limiting_share
+        if self.adaptive is not None and self.adaptive.share < 1.0:
+            share = share * self.adaptive.share
+        for permits, window in self._limits:
+            permits = permits * share
+            if share < self.limiting_share:
+                permits = max(1, int(permits))
             for_window = self._get_specific_limiter_for_window(window)
-            if permits != for_window._window_permits:
+            if for_window is not None and permits != for_window._window_permits:
                 for_window.set_permits(permits)
 
-    def _get_specific_limiter_for_window(self, window: int) -> FixedWindowRateLimiter:
+    def _get_specific_limiter_for_window(self, window: int) -> RateLimiter:
         for limiter in self._limiters:
             if limiter._window_seconds == window:
                 return limiter
 
 
+def _label(platform: Union[Platform, RoutingRegion, None]) -> str:
+    return "" if platform is None else platform.value
+
+
+def _rate_limit_counts(limiter: RiotAPIRateLimiter, response_headers, kind: str):
+    # Only needed (and parsed) when the limiter hasn't been constructed yet
+    if len(limiter) != 0:
+        return None
+    header = response_headers.get("X-{}-Rate-Limit-Count".format(kind))
+    return None if header is None else _split_rate_limit_header(header)
+
+
 def _split_rate_limit_header(header):
     rates = []
     for pw in header.split(","):
@@ -100,14 +616,31 @@ def _split_rate_limit_header(header):
 
 
 class RiotAPIService(DataSource):
+    # The most requests that will be in flight at once for a single `get_many`
+    max_concurrent_requests = 10
+
     def __init__(
         self,
         api_key: str,
-        app_rate_limiter: Dict[Platform, RiotAPIRateLimiter],
+        app_rate_limiter: Dict[Union[Platform, RoutingRegion], RiotAPIRateLimiter],
         request_error_handling: Dict = None,
         http_client: HTTPClient = None,
+        adaptive_rate_limiting: Union[bool, Dict] = True,
+        rate_limiter: Union[str, Dict] = "fixed_window",
+        hedging: Union[bool, Dict] = False,
     ):
         self._limiting_share = app_rate_limiter[Platform.north_america].limiting_share
+        self._window_limiter = window_limiter(rate_limiter)
+        # Decides when to hedge the requests made with `_get(..., hedge=True)`, or None to never hedge them
+        if hedging is True:
+            self._hedging = HedgingPolicy()
+        else:
+            self._hedging = HedgingPolicy(**hedging) if hedging else None
+        # The arguments for each method limiter's AdaptiveRateControl, or None to keep to the static limits
+        if adaptive_rate_limiting is True:
+            self._adaptive_rate_limiting = {}
+        else:
+            self._adaptive_rate_limiting = dict(adaptive_rate_limiting) if adaptive_rate_limiting else None
 
         if http_client is None:
             self._client = HTTPClient()
@@ -154,7 +687,7 @@ class RiotAPIService(DataSource):
 
             def recursive_setdefault(d, u):
                 for k, v in u.items():
-                    if isinstance(v, collections.Mapping):
+                    if isinstance(v, collections.abc.Mapping):
                         r = recursive_setdefault(d.get(k, {}), v)
                         d.setdefault(k, r)
                     else:
@@ -182,24 +715,96 @@ class RiotAPIService(DataSource):
                 strategy = config.pop("strategy")
                 self._handlers[code] = functools.partial(new_handler_instance[strategy], **config)
 
-    def _get_rate_limiter(self, platform: Platform, endpoint: str):
+    def _get_rate_limiter(self, platform: Union[Platform, RoutingRegion], endpoint: str):
+        # The regional (match) endpoints are rate limited per routing region rather than per platform
         try:
             method_limiter = self._rate_limiters[(platform, endpoint)]
         except KeyError:
-            method_limiter = RiotAPIRateLimiter(self._limiting_share)
-            self._rate_limiters[(platform, endpoint)] = method_limiter
-        app_limiter = self._rate_limiters["application"][platform]
+            adaptive = None
+            if self._adaptive_rate_limiting is not None:
+                adaptive = AdaptiveRateControl(**self._adaptive_rate_limiting)
+            method_limiter = self._rate_limiters.setdefault(
+                (platform, endpoint),
+                RiotAPIRateLimiter(self._limiting_share, platform, endpoint, adaptive, self._window_limiter),
+            )
+        try:
+            app_limiter = self._rate_limiters["application"][platform]
+        except KeyError:
+            app_limiter = self._rate_limiters["application"].setdefault(
+                platform, RiotAPIRateLimiter(self._limiting_share, platform, window_limiter=self._window_limiter)
+            )
         return app_limiter, method_limiter
 
+    def rate_limiters(self) -> List[RiotAPIRateLimiter]:
+        """Returns the application limiters and this service's method limiters that have learned their limits."""
+        limiters = list(self._rate_limiters["application"].values())
+        limiters.extend(limiter for key, limiter in list(self._rate_limiters.items()) if key != "application")
+        return [limiter for limiter in limiters if len(limiter) > 0]
+
+    def _get_many_concurrently(
+        self,
+        get: Callable[[Any], T],
+        identifiers: List[Any],
+        method_limiter: RiotAPIRateLimiter,
+        query: MutableMapping[str, Any],
+        many_key: str,
+    ) -> List[T]:
+        """Calls `get` for each of `identifiers` concurrently and returns the results in the same order.
+
+        Each call is its own request, but they all share one method limiter (and the application limiter), which keep
+        the requests within the rate limits. Those limiters only learn the limits from the first response's headers,
+        so one request is made on its own first if that hasn't happened yet.
+
+        Raises a NotFoundError if none of the items were found, or a PartialNotFoundError (restricting `query` to the
+        missing items of `query[many_key]`) if only some of them were.
+        """
+        results = [None] * len(identifiers)
+        errors = {}
+
+        positions = list(range(len(identifiers)))
+        if positions and len(method_limiter) == 0:
+            first = positions.pop(0)
+            try:
+                results[first] = get(identifiers[first])
+            except Exception as error:
+                errors[first] = error
+        if positions:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(positions))) as executor:
+                # The requests made in the pool have the same deadline as this one
+                get = deadlines.propagate(get)
+                futures = [(position, executor.submit(get, identifiers[position])) for position in positions]
+            for position, future in futures:
+                try:
+                    results[position] = future.result()
+                except Exception as error:
+                    errors[position] = error
+
+        if not errors:
+            return results
+        for error in errors.values():
+            if isinstance(error, deadlines.DeadlineExceededError):
+                # The whole call is out of time, so there's no point in asking other sources for the missing items
+                raise error
+        if len(errors) == len(results) and all(isinstance(error, NotFoundError) for error in errors.values()):
+            raise NotFoundError("None of the {} were found".format(many_key))
+        missing = sorted(errors)
+        missing_query = restrict_many_query(dict(query, **{many_key: identifiers}), missing, len(identifiers))
+        raise PartialNotFoundError(results, missing, missing_query, errors)
+
     def _adjust_rate_limiters_from_headers(self, app_limiter, method_limiter, response_headers):
         # If Riot changes the # of permits allowed in their response headers, change our rate limiters.
-        # We are currently ignoring the X-*-Rate-Limit-Count headers and assuming our rate limiter logic agrees.
+        # The X-*-Rate-Limit-Count headers are only used to start our windows off when the limiters are first created;
+        # after that we assume our rate limiter logic agrees.
         if "X-App-Rate-Limit" in response_headers:
             limits = _split_rate_limit_header(response_headers["X-App-Rate-Limit"])
-            app_limiter.adjust_rate_limits_if_necessary(limits)
+            app_limiter.adjust_rate_limits_if_necessary(
+                limits, _rate_limit_counts(app_limiter, response_headers, "App")
+            )
         if "X-Method-Rate-Limit" in response_headers:
             limits = _split_rate_limit_header(response_headers["X-Method-Rate-Limit"])
-            method_limiter.adjust_rate_limits_if_necessary(limits)
+            method_limiter.adjust_rate_limits_if_necessary(
+                limits, _rate_limit_counts(method_limiter, response_headers, "Method")
+            )
 
     def _get(
         self,
@@ -208,10 +813,12 @@ class RiotAPIService(DataSource):
         app_limiter: RiotAPIRateLimiter = None,
         method_limiter: RiotAPIRateLimiter = None,
         connection: Curl = None,
+        hedge: bool = False,
     ) -> Union[dict, list, Any]:
         # Make a new RiotAPIRequest and run it until it returns or fails.
         # If it returns, return the result.
         # If it fails, throw an appropriate error.
+        # Latency sensitive lookups can ask to be hedged, which only happens if the "hedging" setting is on.
         request = RiotAPIRequest(
             service=self,
             url=url,
@@ -221,6 +828,8 @@ class RiotAPIService(DataSource):
             connection=connection,
         )
         try:
+            if hedge and self._hedging is not None and connection is None:
+                return self._hedged(request)
             return request()
         except HTTPError as error:
             # The error handlers didn't work, so raise an appropriate error.
@@ -252,6 +861,13 @@ class RiotAPIService(DataSource):
                     ),
                     error.code,
                 )
+            elif new_error_type is APITimeoutError:
+                new_error = APITimeoutError(
+                    'The request to the Riot API timed out. You may want to retry the request after a short wait or continue without the result. The received error was "{message}"'.format(
+                        message=str(error)
+                    ),
+                    error.code,
+                )
             elif new_error_type is APIForbiddenError:
                 new_error = APIForbiddenError(
                     'The Riot API returned a FORBIDDEN error for the request. The received error was {code}: "{message}"'.format(
@@ -264,6 +880,54 @@ class RiotAPIService(DataSource):
 
             raise new_error from error
 
+    def _hedged(self, request: "RiotAPIRequest") -> Union[dict, list, Any]:
+        """Runs `request`, and if it hasn't been answered after the endpoint's usual latency, sends the same request
+        again (a hedge) if the hedging budget and the rate limiters allow it without waiting. Returns the first answer;
+        the hedge is cancelled if it hasn't started, and otherwise its response is thrown away. The first request's
+        answer is used even if it's an error, while a failed hedge is ignored.
+        """
+        hedging = self._hedging
+        request.hedging = hedging
+        hedging.earn()
+        primary = hedging.submit(deadlines.propagate(request))
+        delay = hedging.delay(request.platform, request.endpoint)
+        if delay is None or wait([primary], timeout=delay).done:
+            return primary.result()
+
+        labels = {"platform": request.platform, "endpoint": request.endpoint}
+        if not hedging.spend():
+            HEDGED_REQUESTS.inc(result="over_budget", **labels)
+            return primary.result()
+        permits = _enter_now([request.app_limiter, request.method_limiter])
+        if permits is None:
+            hedging.refund()
+            HEDGED_REQUESTS.inc(result="rate_limited", **labels)
+            return primary.result()
+        hedge_request = RiotAPIRequest(
+            service=self,
+            url=request.url,
+            parameters=request.parameters,
+            app_limiter=request.app_limiter,
+            method_limiter=request.method_limiter,
+            connection=None,
+        )
+        hedge_request.hedging = hedging
+        hedge = hedging.submit(deadlines.propagate(functools.partial(hedge_request.hedge, permits)))
+
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        if primary not in done and hedge.exception() is None:
+            HEDGED_REQUESTS.inc(result="won", **labels)
+            primary.cancel()
+            return hedge.result()
+        if primary in done:
+            HEDGED_REQUESTS.inc(result="lost", **labels)
+            if hedge.cancel():
+                for permit in permits:
+                    permit.__exit__(None, None, None)
+        else:
+            HEDGED_REQUESTS.inc(result="failed", **labels)
+        return primary.result()
+
     @abstractmethod
     def get(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> T:
         pass
@@ -289,10 +953,59 @@ class RiotAPIRequest(object):
         self.app_limiter = app_limiter
         self.method_limiter = method_limiter
         self.connection = connection
+        self.platform = _label(getattr(method_limiter, "platform", None))
+        self.endpoint = getattr(method_limiter, "endpoint", None) or ""
+        # Told the latencies of successful attempts, when the request is hedgeable
+        self.hedging = None  # type: Optional[HedgingPolicy]
+        self._retry_reason = None
+
+    def _request(
+        self, url, parameters, headers, rate_limiters, connection
+    ) -> Tuple[Union[dict, list, str, bytes], dict]:
+        # Makes one attempt at the request, and records it in the metrics and the log
+        if self._retry_reason is not None:
+            RETRIES.inc(platform=self.platform, endpoint=self.endpoint, reason=self._retry_reason)
+        waited = getattr(_limiter_waits, "seconds", 0.0)
+        start = time.perf_counter()
+        status, response_headers = "error", {}
+        try:
+            body, response_headers = self.service._client.get(url, parameters, headers, rate_limiters, connection)
+            status = 200
+            return body, response_headers
+        except HTTPError as error:
+            status, response_headers = error.code, error.response_headers
+            raise
+        except deadlines.DeadlineExceededError:
+            status = "deadline"
+            raise
+        finally:
+            duration = time.perf_counter() - start - (getattr(_limiter_waits, "seconds", 0.0) - waited)
+            n_bytes = int(response_headers.get("Content-Length", 0) or 0)
+            REQUESTS.inc(platform=self.platform, endpoint=self.endpoint, status=status)
+            REQUEST_DURATION.observe(duration, platform=self.platform, endpoint=self.endpoint)
+            if n_bytes:
+                RESPONSE_BYTES.inc(n_bytes, platform=self.platform, endpoint=self.endpoint)
+            if status == 200 and self.hedging is not None:
+                self.hedging.observe(self.platform, self.endpoint, duration)
+            LOGGER.debug(
+                "%s %s %s in %.3f seconds",
+                self.platform,
+                self.endpoint,
+                status,
+                duration,
+                extra={
+                    "platform": self.platform,
+                    "endpoint": self.endpoint,
+                    "status": status,
+                    "duration": duration,
+                    "bytes": n_bytes,
+                    "retry": self._retry_reason,
+                },
+            )
 
     def __call__(self):
         try:
-            body, response_headers = self.service._client.get(
+            body, response_headers = self._request(
                 url=self.url,
                 parameters=self.parameters,
                 headers=self.service._headers,
@@ -302,10 +1015,30 @@ class RiotAPIRequest(object):
             self.service._adjust_rate_limiters_from_headers(
                 app_limiter=self.app_limiter, method_limiter=self.method_limiter, response_headers=response_headers
             )
+            self.method_limiter.record_success()
             return body
         except HTTPError as error:
             return self._retry_request_by_handling_error(error)
 
+    def hedge(self, permits: List[_HeldPermit]):
+        """Makes a single attempt at the request (with no retries), using rate limiter permits already taken for it."""
+        try:
+            body, response_headers = self._request(
+                url=self.url,
+                parameters=self.parameters,
+                headers=self.service._headers,
+                rate_limiters=permits,
+                connection=None,
+            )
+        finally:
+            for permit in permits:
+                permit.__exit__(None, None, None)
+        self.service._adjust_rate_limiters_from_headers(
+            app_limiter=self.app_limiter, method_limiter=self.method_limiter, response_headers=response_headers
+        )
+        self.method_limiter.record_success()
+        return body
+
     def _retry_request_by_handling_error(self, error: HTTPError, handlers=None):
         if handlers is None:
             handlers = []
@@ -324,11 +1057,15 @@ class RiotAPIRequest(object):
                 raise ValueError(
                     "Unknown cause of rate limit; aborting. Headers were: {}".format(error.response_headers)
                 )
+            limiter = self.app_limiter if rate_limiting_type == "application" else self.method_limiter
+            limiter.record_rate_limited(rate_limiting_type)
 
             # Create a new handler
             new_handler = self.service._handlers[429][rate_limiting_type]()  # type: FailedRequestHandler
+            self._retry_reason = "429-" + rate_limiting_type
         else:
             new_handler = self.service._handlers[error.code]()
+            self._retry_reason = str(error.code)
 
         # If we will handle the new error in the same way as we did previously, don't use a new instance
         for handler in handlers:
@@ -342,7 +1079,7 @@ class RiotAPIRequest(object):
             try:
                 body, response_headers = new_handler(
                     error=error,
-                    requester=self.service._client.get,
+                    requester=self._request,
                     url=self.url,
                     parameters=self.parameters,
                     headers=self.service._headers,
@@ -352,6 +1089,7 @@ class RiotAPIRequest(object):
                 self.service._adjust_rate_limiters_from_headers(
                     app_limiter=self.app_limiter, method_limiter=self.method_limiter, response_headers=response_headers
                 )
+                self.method_limiter.record_success()
                 return body
             except HTTPError as error:
                 if new_handler not in handlers:
@@ -381,12 +1119,15 @@ class ExponentialBackoff(FailedRequestHandler):
         if self.attempts >= self.max_attempts:
             self.stop = True
             raise error
-        print(
-            "INFO: Unexpected {} error ({}), backing off for {} seconds.".format(
-                headers.get("X-Rate-Limit-Type", "service"), error.code, self.backoff
-            )
+        limit_type = error.response_headers.get("X-Rate-Limit-Type", "service")
+        LOGGER.warning(
+            "Unexpected %s error (%s), backing off for %s seconds.",
+            limit_type,
+            error.code,
+            self.backoff,
+            extra={"url": url, "status": error.code, "limit_type": limit_type, "backoff": self.backoff},
         )
-        time.sleep(self.backoff)
+        deadlines.sleep(self.backoff, "retrying the request")
         self.backoff = self.backoff * self.factor
         self.attempts += 1
         return requester(url, parameters, headers, rate_limiters, connection)
@@ -405,10 +1146,12 @@ class RetryFromHeaders(object):
             self.stop = True
             raise error
         backoff = int(error.response_headers["Retry-After"])
-        print(
-            "INFO: Unexpected {} rate limit, backing off for {} seconds (from headers).".format(
-                headers.get("X-Rate-Limit-Type", "service"), backoff
-            )
+        limit_type = error.response_headers.get("X-Rate-Limit-Type", "service")
+        LOGGER.warning(
+            "Unexpected %s rate limit, backing off for %s seconds (from headers).",
+            limit_type,
+            backoff,
+            extra={"url": url, "status": error.code, "limit_type": limit_type, "backoff": backoff},
         )
         for rate_limiter in rate_limiters:
             rate_limiter.restrict_for(backoff)
@@ -2,7 +2,7 @@ from typing import Type, TypeVar, MutableMapping, Any, Iterable, Generator
 
 from datapipelines import DataSource, PipelineContext, Query, NotFoundError, validate_query
 from .common import RiotAPIService, APINotFoundError
-from ...data import Platform, Tier, Division
+from ...data import Platform, Tier, Division, Queue
 from ...dto.league import (
     LeagueEntriesDto,
     LeagueDto,
@@ -62,6 +62,7 @@ class LeaguesAPI(RiotAPIService):
             entries=data,
             page=query["page"],
             region=query["region"].value,
+            queue=Queue.ranked_tft.value,
             tier=query["tier"].value,
             division=query["division"].value,
         )
@@ -78,7 +79,7 @@ class LeaguesAPI(RiotAPIService):
         )
         try:
             app_limiter, method_limiter = self._get_rate_limiter(query["platform"], "leagues/summoner-entries")
-            data = self._get(url, app_limiter=app_limiter, method_limiter=method_limiter)
+            data = self._get(url, app_limiter=app_limiter, method_limiter=method_limiter, hedge=True)
         except APINotFoundError:
             data = []
         region = query["platform"].region.value
@@ -0,0 +1,89 @@
+from typing import Type, TypeVar, MutableMapping, Any, Iterable, List
+
+from datapipelines import DataSource, PipelineContext, Query, NotFoundError, validate_query
+from .common import RiotAPIService, APINotFoundError
+from ...data import Platform
+from ...dto.match import MatchDto, MatchListDto
+from ..util import convert_region_to_platform
+
+T = TypeVar("T")
+
+
+class MatchAPI(RiotAPIService):
+    # The match endpoints are served (and rate limited) by routing region (AMERICAS, ASIA, EUROPE) rather than platform
+
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    _validate_get_match_query = Query.has("id").as_(str).also.has("platform").as_(Platform)
+
+    @get.register(MatchDto)
+    @validate_query(_validate_get_match_query, convert_region_to_platform)
+    def get_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> MatchDto:
+        routing_region = query["platform"].routing_region
+        url = "https://{routing}.api.riotgames.com/tft/match/v1/matches/{matchId}".format(
+            routing=routing_region.value.lower(), matchId=query["id"]
+        )
+        try:
+            app_limiter, method_limiter = self._get_rate_limiter(routing_region, "matches/matchId")
+            data = self._get(url, {}, app_limiter=app_limiter, method_limiter=method_limiter)
+        except APINotFoundError as error:
+            raise NotFoundError(str(error)) from error
+
+        data["region"] = query["platform"].region.value
+        return MatchDto(**data)
+
+    _validate_get_many_match_query = Query.has("ids").as_(Iterable).also.has("platform").as_(Platform)
+
+    @get_many.register(MatchDto)
+    @validate_query(_validate_get_many_match_query, convert_region_to_platform)
+    def get_many_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> List[MatchDto]:
+        platform = query["platform"]
+
+        def get_match(id):
+            return self.get_match({"id": id, "platform": platform}, context)
+
+        _, method_limiter = self._get_rate_limiter(platform.routing_region, "matches/matchId")
+        return self._get_many_concurrently(get_match, list(query["ids"]), method_limiter, query, "ids")
+
+    _validate_get_match_list_query = (
+        Query.has("puuid")
+        .as_(str)
+        .also.has("platform")
+        .as_(Platform)
+        .also.can_have("count")
+        .with_default(20)
+        .also.can_have("start")
+        .with_default(0)
+    )
+
+    @get.register(MatchListDto)
+    @validate_query(_validate_get_match_list_query, convert_region_to_platform)
+    def get_match_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> MatchListDto:
+        routing_region = query["platform"].routing_region
+        url = "https://{routing}.api.riotgames.com/tft/match/v1/matches/by-puuid/{puuid}/ids".format(
+            routing=routing_region.value.lower(), puuid=query["puuid"]
+        )
+        try:
+            app_limiter, method_limiter = self._get_rate_limiter(routing_region, "matches/by-puuid/puuid/ids")
+            data = self._get(
+                url,
+                {"count": query["count"], "start": query["start"]},
+                app_limiter=app_limiter,
+                method_limiter=method_limiter,
+            )
+        except APINotFoundError:
+            data = []
+
+        return MatchListDto(
+            ids=data,
+            puuid=query["puuid"],
+            region=query["platform"].region.value,
+            count=query["count"],
+            start=query["start"],
+        )
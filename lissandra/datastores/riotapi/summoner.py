@@ -1,4 +1,4 @@
-from typing import Type, TypeVar, MutableMapping, Any, Iterable
+from typing import Type, TypeVar, MutableMapping, Any, Iterable, List
 
 from datapipelines import DataSource, PipelineContext, Query, NotFoundError, validate_query
 from .common import RiotAPIService, APINotFoundError
@@ -59,9 +59,44 @@ class SummonerAPI(RiotAPIService):
 
         try:
             app_limiter, method_limiter = self._get_rate_limiter(query["platform"], endpoint)
-            data = self._get(url, {}, app_limiter=app_limiter, method_limiter=method_limiter)
+            data = self._get(url, {}, app_limiter=app_limiter, method_limiter=method_limiter, hedge=True)
         except APINotFoundError as error:
             raise NotFoundError(str(error)) from error
 
         data["region"] = query["platform"].region.value
         return SummonerDto(**data)
+
+    _validate_get_many_summoner_query = (
+        Query.has("ids")
+        .as_(Iterable)
+        .or_("accountIds")
+        .as_(Iterable)
+        .or_("puuids")
+        .as_(Iterable)
+        .or_("names")
+        .as_(Iterable)
+        .also.has("platform")
+        .as_(Platform)
+    )
+
+    # The `get_many` query keys, the matching `get` query keys, and the method rate limit each one is under
+    _many_summoner_identifiers = (
+        ("ids", "id", "summoners/summonerId"),
+        ("accountIds", "accountId", "summoners/by-account/accountId"),
+        ("puuids", "puuid", "summoners/by-puuid/puuid"),
+        ("names", "name", "summoners/by-name/name"),
+    )
+
+    @get_many.register(SummonerDto)
+    @validate_query(_validate_get_many_summoner_query, convert_region_to_platform)
+    def get_many_summoner(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> List[SummonerDto]:
+        for many_key, key, endpoint in self._many_summoner_identifiers:
+            if many_key in query:
+                break
+        platform = query["platform"]
+
+        def get_summoner(identifier):
+            return self.get_summoner({key: identifier, "platform": platform}, context)
+
+        _, method_limiter = self._get_rate_limiter(platform, endpoint)
+        return self._get_many_concurrently(get_summoner, list(query[many_key]), method_limiter, query, many_key)
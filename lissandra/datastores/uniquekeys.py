@@ -34,6 +34,7 @@ from ..core.staticdata import (
 )
 from ..core.status import ShardStatus
 from ..core.summoner import Summoner, SummonerData
+from ..core.match import Match, MatchData
 
 from .util import (
     get_default_locale,
@@ -680,6 +681,11 @@ validate_many_summoner_query = (
 )
 
 
+def sanitize_summoner_name(name: str) -> str:
+    # Summoner names are looked up ignoring case and whitespace, so they are cached that way too
+    return name.replace(" ", "").lower()
+
+
 def for_summoner(summoner: Summoner) -> List[Tuple]:
     keys = []
     try:
@@ -687,7 +693,7 @@ def for_summoner(summoner: Summoner) -> List[Tuple]:
     except AttributeError:
         pass
     try:
-        keys.append((summoner.platform.value, "name", summoner._data[SummonerData].name))
+        keys.append((summoner.platform.value, "name", sanitize_summoner_name(summoner._data[SummonerData].name)))
     except AttributeError:
         pass
     try:
@@ -706,7 +712,7 @@ def for_summoner_query(query: Query) -> List[Tuple]:
     if "id" in query:
         keys.append((query["platform"].value, "id", query["id"]))
     if "name" in query:
-        keys.append((query["platform"].value, "name", query["name"]))
+        keys.append((query["platform"].value, "name", sanitize_summoner_name(query["name"])))
     if "accountId" in query:
         keys.append((query["platform"].value, "accountId", query["accountId"]))
     if "puuid" in query:
@@ -717,24 +723,58 @@ def for_summoner_query(query: Query) -> List[Tuple]:
 def for_many_summoner_query(query: Query) -> Generator[List[Tuple], None, None]:
     grouped_identifiers = []
     identifier_types = []
+    identifier_names = []
     if "ids" in query:
         grouped_identifiers.append(query["ids"])
         identifier_types.append(str)
+        identifier_names.append("id")
     elif "accountIds" in query:
         grouped_identifiers.append(query["accountIds"])
         identifier_types.append(str)
+        identifier_names.append("accountId")
     elif "puuids" in query:
         grouped_identifiers.append(query["puuids"])
         identifier_types.append(str)
+        identifier_names.append("puuid")
     elif "names" in query:
         grouped_identifiers.append(query["names"])
         identifier_types.append(str)
+        identifier_names.append("name")
     for identifiers in zip(*grouped_identifiers):
         keys = []
-        for identifier, identifier_type in zip(identifiers, identifier_types):
+        for identifier, identifier_type, identifier_name in zip(identifiers, identifier_types, identifier_names):
             try:
                 identifier = identifier_type(identifier)
-                keys.append((query["platform"].value, identifier))
+                if identifier_name == "name":
+                    identifier = sanitize_summoner_name(identifier)
+                keys.append((query["platform"].value, identifier_name, identifier))
             except ValueError as e:
                 raise QueryValidationError from e
         yield keys
+
+
+#############
+# Match API #
+#############
+
+
+validate_match_query = Query.has("platform").as_(Platform).also.has("id").as_(str)
+
+
+validate_many_match_query = Query.has("platform").as_(Platform).also.has("ids").as_(Iterable)
+
+
+def for_match(match: Match) -> List[Tuple[str, str]]:
+    return [(match.platform.value, match._data[MatchData].id)]
+
+
+def for_match_query(query: Query) -> List[Tuple[str, str]]:
+    return [(query["platform"].value, query["id"])]
+
+
+def for_many_match_query(query: Query) -> Generator[List[Tuple[str, str]], None, None]:
+    for id in query["ids"]:
+        try:
+            yield [(query["platform"].value, str(id))]
+        except ValueError as e:
+            raise QueryValidationError from e
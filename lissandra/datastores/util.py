@@ -1,6 +1,6 @@
 from typing import Any, Generator, Iterable, List, Mapping, MutableMapping, Set, Tuple, Union
 
-from datapipelines import PipelineContext, Query, QueryValidationError
+from datapipelines import PipelineContext, Query, QueryValidationError, NotFoundError
 
 from ..data import Platform, Region
 from ..dto.staticdata import LanguagesDto, LanguageStringsDto, VersionListDto
@@ -10,6 +10,57 @@ from ..dto.staticdata import LanguagesDto, LanguageStringsDto, VersionListDto
 #############
 
 
+class PartialNotFoundError(NotFoundError):
+    """Raised by a `get_many` that could only find some of the requested items.
+
+    `results` has one entry per requested item, in the order they were requested, with `None` for each item that
+    wasn't found. `missing` holds the positions of those items and `missing_query` is a copy of the query that only
+    asks for them, so that the pipeline can pass it on to the next source and merge the results back in. `errors` maps
+    the positions of missing items to the error that was raised for them, where the source knows it.
+    """
+
+    def __init__(
+        self,
+        results: List[Any],
+        missing: List[int],
+        missing_query: Mapping[str, Any],
+        errors: Mapping[int, Exception] = None,
+    ):
+        super().__init__("{} of {} items were not found".format(len(missing), len(results)))
+        self.results = results
+        self.missing = missing
+        self.missing_query = missing_query
+        self.errors = dict(errors) if errors is not None else {}
+
+
+def list_many_query(query: Mapping[str, Any]) -> MutableMapping[str, Any]:
+    """Returns a copy of a `get_many` query with its identifiers as lists.
+
+    The validators accept any iterable of identifiers, but a set or a generator can't be indexed, and a generator can
+    only be iterated over once. Every iterable in the query other than a string is an identifier list, and is turned
+    into a list (in its iteration order, which is the order of the results).
+    """
+    listed = dict(query)
+    for key, value in query.items():
+        if isinstance(value, Iterable) and not isinstance(value, (str, bytes, list, Mapping)):
+            listed[key] = list(value)
+    return listed
+
+
+def restrict_many_query(query: Mapping[str, Any], positions: List[int], n_items: int) -> MutableMapping[str, Any]:
+    """Returns a copy of a `get_many` query that only asks for the items at `positions`.
+
+    The identifiers in a `get_many` query are lists with one entry per requested item (e.g. "ids" or "summoners.id"),
+    so every list or tuple in the query with an entry per requested item is narrowed down to the entries at
+    `positions`. `positions` must index into the identifiers as `list_many_query` lists them.
+    """
+    restricted = dict(query)
+    for key, value in query.items():
+        if isinstance(value, (list, tuple)) and len(value) == n_items:
+            restricted[key] = [value[position] for position in positions]
+    return restricted
+
+
 def rgetattr(obj, key):
     """Recursive getattr for handling dots in keys."""
     for k in key.split("."):
@@ -0,0 +1,91 @@
+"""Deadlines for pipeline calls.
+
+A deadline bounds how long a call (and everything it does: waiting for rate limiters, HTTP requests, retries) can
+take. It's either given to the pipeline directly, as a `time.monotonic()` time:
+
+    pipeline.get(SummonerDto, query, deadline=time.monotonic() + 2.0)
+
+or set for everything in a block, which is how lazily loaded core objects get one:
+
+    with lissandra.deadlines.deadline(2.0):
+        summoner = lissandra.get_summoner(name="Kalturi", region="EUW")
+        summoner.level
+
+Deadlines nest (the earliest one applies), and are kept per thread. Running out of time raises a
+`DeadlineExceededError` rather than waiting any longer.
+
+With pycurl, the whole HTTP request is bounded by the deadline. With requests, a response is read a little at a time
+and the deadline is checked before each read, but a read that has already started can still take up to the read
+timeout, which is at most the time that was left when the request was sent.
+"""
+
+import contextlib
+import functools
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_local = threading.local()
+
+
+class DeadlineExceededError(TimeoutError):
+    pass
+
+
+def current() -> Optional[float]:
+    """Returns the current thread's deadline (as a `time.monotonic()` time), or None if it doesn't have one."""
+    return getattr(_local, "deadline", None)
+
+
+def remaining() -> Optional[float]:
+    """Returns the seconds left until the current deadline (which may be negative), or None if there isn't one."""
+    deadline = getattr(_local, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float = None, at: float = None):
+    """Sets a deadline `seconds` from now, or `at` a `time.monotonic()` time, for the calls made in this block."""
+    if at is None:
+        if seconds is None:
+            raise ValueError("Either seconds or at is required")
+        at = time.monotonic() + seconds
+    outer = getattr(_local, "deadline", None)
+    _local.deadline = at if outer is None else min(outer, at)
+    try:
+        yield _local.deadline
+    finally:
+        _local.deadline = outer
+
+
+def check(doing: str) -> None:
+    """Raises a `DeadlineExceededError` if the current deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("The deadline passed {:.3f} seconds ago, before {}".format(-left, doing))
+
+
+def sleep(seconds: float, doing: str) -> None:
+    """Sleeps, unless that would go past the current deadline, in which case it raises a `DeadlineExceededError`."""
+    left = remaining()
+    if left is not None and left < seconds:
+        raise DeadlineExceededError(
+            "Only {:.3f} seconds were left until the deadline, which isn't enough for {}".format(max(left, 0.0), doing)
+        )
+    time.sleep(seconds)
+
+
+def propagate(function: Callable[..., T]) -> Callable[..., T]:
+    """Wraps `function` so that it runs with the current thread's deadline, e.g. in a thread pool."""
+    at = current()
+    if at is None:
+        return function
+
+    @functools.wraps(function)
+    def with_deadline(*args, **kwargs):
+        with deadline(at=at):
+            return function(*args, **kwargs)
+
+    return with_deadline
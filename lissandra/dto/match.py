@@ -0,0 +1,9 @@
+from .common import DtoObject
+
+
+class MatchDto(DtoObject):
+    pass
+
+
+class MatchListDto(DtoObject):
+    pass
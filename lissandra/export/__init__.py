@@ -0,0 +1 @@
+from .league import LEAGUE_ENTRY_COLUMNS, export_league_entries, iter_league_entries, iter_league_entry_pages
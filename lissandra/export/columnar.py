@@ -0,0 +1,212 @@
+"""Arrow and Parquet writers for league entries and summoners.
+
+These need the optional ``pyarrow`` dependency (6.0 or newer, so that they work on Python 3.6 too). Rows are written in batches as they're produced, so a
+crawl can be written out while it's running, with memory bounded by the batch size rather than the size of the crawl.
+
+Every writer takes the same kinds of rows: Riot API style dicts (e.g. from `iter_league_entries`), or the core objects
+themselves (see `league_entry_rows` and `summoner_rows`).
+"""
+
+from typing import Any, BinaryIO, Dict, Generator, Iterable, Mapping, Union
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from ..core.league import (
+    LeagueEntry,
+    LeagueEntryData,
+    League,
+    ChallengerLeague,
+    GrandmasterLeague,
+    MasterLeague,
+)
+from ..core.summoner import Summoner, SummonerData
+
+# The number of rows in each record batch / Parquet row group
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise ImportError("Exporting to Arrow or Parquet requires pyarrow. Install it with `pip install pyarrow`.")
+
+
+def league_entry_schema() -> "pyarrow.Schema":
+    """The schema of a league entry row, which mirrors `LeagueEntryDto`."""
+    _require_pyarrow()
+    return pyarrow.schema(
+        [
+            ("leagueId", pyarrow.string()),
+            ("queueType", pyarrow.string()),
+            ("tier", pyarrow.string()),
+            ("rank", pyarrow.string()),
+            ("summonerId", pyarrow.string()),
+            ("summonerName", pyarrow.string()),
+            ("leaguePoints", pyarrow.int32()),
+            ("wins", pyarrow.int32()),
+            ("losses", pyarrow.int32()),
+            ("hotStreak", pyarrow.bool_()),
+            ("veteran", pyarrow.bool_()),
+            ("freshBlood", pyarrow.bool_()),
+            ("inactive", pyarrow.bool_()),
+            (
+                "miniSeries",
+                pyarrow.struct(
+                    [
+                        ("target", pyarrow.int32()),
+                        ("wins", pyarrow.int32()),
+                        ("losses", pyarrow.int32()),
+                        ("progress", pyarrow.string()),
+                    ]
+                ),
+            ),
+            ("region", pyarrow.string()),
+        ]
+    )
+
+
+def summoner_schema() -> "pyarrow.Schema":
+    """The schema of a summoner row, which mirrors `SummonerDto`."""
+    _require_pyarrow()
+    return pyarrow.schema(
+        [
+            ("id", pyarrow.string()),
+            ("accountId", pyarrow.string()),
+            ("puuid", pyarrow.string()),
+            ("name", pyarrow.string()),
+            ("profileIconId", pyarrow.int32()),
+            ("revisionDate", pyarrow.int64()),
+            ("summonerLevel", pyarrow.int64()),
+            ("region", pyarrow.string()),
+        ]
+    )
+
+
+def _dto_row(data: Any) -> Dict[str, Any]:
+    # Core data renames some of the DTO fields, so rename them back
+    row = data.to_dict()
+    for dto_name, name in data._renamed.items():
+        if name in row:
+            row[dto_name] = row.pop(name)
+    return row
+
+
+def league_entry_rows(
+    entries: Iterable[Union[LeagueEntry, Mapping[str, Any]]],
+) -> Generator[Dict[str, Any], None, None]:
+    """Turns league entries into rows for `league_entry_schema`.
+
+    `entries` can be any iterable of `LeagueEntry`s or `LeagueEntryDto`-like dicts (e.g. a `LeagueEntries`, which is
+    consumed lazily), or a `League`/apex league, whose league id, queue, tier and region are filled into each row.
+    """
+    defaults = {}
+    if isinstance(entries, (League, ChallengerLeague, GrandmasterLeague, MasterLeague)):
+        league = entries
+        entries = league.entries
+        data = next(data for data in league._data.values() if data is not None)
+        for name, attribute in (("leagueId", "id"), ("queueType", "queue"), ("tier", "tier"), ("region", "region")):
+            value = getattr(data, attribute, None)
+            if value is not None:
+                defaults[name] = value
+    for entry in entries:
+        if isinstance(entry, LeagueEntry):
+            row = _dto_row(entry._data[LeagueEntryData])
+        else:
+            row = dict(entry)
+        for name, value in defaults.items():
+            row.setdefault(name, value)
+        yield row
+
+
+def summoner_rows(summoners: Iterable[Union[Summoner, Mapping[str, Any], Exception]]) -> Generator[Dict, None, None]:
+    """Turns summoners (or `SummonerDto`-like dicts) into rows for `summoner_schema`.
+
+    Anything else is skipped, so the results of `lissandra.get_summoners` can be passed in as they are, and only the
+    summoners that were found will be written.
+    """
+    for summoner in summoners:
+        if isinstance(summoner, Summoner):
+            yield _dto_row(summoner._data[SummonerData])
+        elif isinstance(summoner, Mapping):
+            yield dict(summoner)
+
+
+def iter_record_batches(
+    rows: Iterable[Mapping[str, Any]], schema: "pyarrow.Schema", batch_size: int = DEFAULT_BATCH_SIZE
+) -> Generator["pyarrow.RecordBatch", None, None]:
+    """Groups `rows` into Arrow record batches of `batch_size` rows, yielding each batch as soon as it's full.
+
+    Fields that aren't in `schema` are dropped and missing fields are null.
+    """
+    _require_pyarrow()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield _record_batch(batch, schema)
+            batch = []
+    if batch:
+        yield _record_batch(batch, schema)
+
+
+def _record_batch(rows: Iterable[Mapping[str, Any]], schema: "pyarrow.Schema") -> "pyarrow.RecordBatch":
+    # Built a column at a time, because `RecordBatch.from_pylist` needs pyarrow 7, which doesn't support Python 3.6
+    columns = [pyarrow.array([row.get(field.name) for row in rows], type=field.type) for field in schema]
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_parquet(
+    rows: Iterable[Mapping[str, Any]],
+    destination: Union[str, BinaryIO],
+    schema: "pyarrow.Schema",
+    row_group_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "snappy",
+) -> int:
+    """Writes `rows` to a Parquet file, one row group of `row_group_size` rows at a time as they're produced.
+    Returns the number of rows written.
+    """
+    n_rows = 0
+    with pyarrow.parquet.ParquetWriter(destination, schema, compression=compression) as writer:
+        for batch in iter_record_batches(rows, schema, row_group_size):
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
+
+
+def write_arrow(
+    rows: Iterable[Mapping[str, Any]],
+    destination: Union[str, BinaryIO],
+    schema: "pyarrow.Schema",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Writes `rows` to an Arrow IPC (Feather v2) file, one record batch at a time as they're produced. Returns the
+    number of rows written.
+    """
+    n_rows = 0
+    with pyarrow.ipc.new_file(destination, schema) as writer:
+        for batch in iter_record_batches(rows, schema, batch_size):
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
+
+
+def write_league_entries_parquet(
+    entries: Iterable[Union[LeagueEntry, Mapping[str, Any]]],
+    destination: Union[str, BinaryIO],
+    row_group_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Writes league entries (see `league_entry_rows`) to a Parquet file with `league_entry_schema`."""
+    return write_parquet(league_entry_rows(entries), destination, league_entry_schema(), row_group_size)
+
+
+def write_summoners_parquet(
+    summoners: Iterable[Union[Summoner, Mapping[str, Any], Exception]],
+    destination: Union[str, BinaryIO],
+    row_group_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Writes summoners (see `summoner_rows`) to a Parquet file with `summoner_schema`."""
+    return write_parquet(summoner_rows(summoners), destination, summoner_schema(), row_group_size)
@@ -0,0 +1,70 @@
+import contextlib
+import csv
+import gzip
+import io
+from typing import Any, BinaryIO, Dict, Generator, Iterable, Mapping, Sequence, Union
+
+from ..core.common import _dumps
+
+
+def flatten(row: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flattens nested mappings into one level, joining the keys with dots (e.g. `miniSeries.wins`)."""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, Mapping):
+            flat.update(flatten(value, prefix="{}{}.".format(prefix, key)))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+@contextlib.contextmanager
+def open_destination(destination: Union[str, BinaryIO], compress: bool = None) -> Generator[BinaryIO, None, None]:
+    """Opens `destination` (a path or a binary file object) for writing, gzipping what's written to it if `compress` is
+    True. If `compress` is None, paths ending in `.gz` are gzipped and file objects are not.
+
+    File objects that are passed in are left open.
+    """
+    if isinstance(destination, str):
+        if compress is None:
+            compress = destination.endswith(".gz")
+        with open(destination, "wb") as fp:
+            if compress:
+                with gzip.GzipFile(fileobj=fp, mode="wb") as gzipped:
+                    yield gzipped
+            else:
+                yield fp
+    elif compress:
+        with gzip.GzipFile(fileobj=destination, mode="wb") as gzipped:
+            yield gzipped
+    else:
+        yield destination
+
+
+def write_ndjson(rows: Iterable[Mapping[str, Any]], fp: BinaryIO) -> int:
+    """Writes each row as one line of JSON. Returns the number of rows written."""
+    n_rows = 0
+    for row in rows:
+        fp.write(_dumps(row))
+        fp.write(b"\n")
+        n_rows += 1
+    return n_rows
+
+
+def write_csv(rows: Iterable[Mapping[str, Any]], fp: BinaryIO, columns: Sequence[str]) -> int:
+    """Writes the rows as UTF-8 CSV with a header row of `columns`. Nested values are flattened (see `flatten`) and
+    any values that aren't in `columns` are dropped. Returns the number of rows written.
+    """
+    text = io.TextIOWrapper(fp, encoding="utf-8", newline="")
+    try:
+        writer = csv.DictWriter(text, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        n_rows = 0
+        for row in rows:
+            writer.writerow(flatten(row))
+            n_rows += 1
+        text.flush()
+    finally:
+        # Don't let the wrapper close `fp` when it's garbage collected
+        text.detach()
+    return n_rows
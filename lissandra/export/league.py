@@ -0,0 +1,97 @@
+from typing import Any, BinaryIO, Dict, Generator, Union
+
+from .. import configuration
+from ..data import Division, Region, Tier
+from ..dto.league import LeagueEntriesDto
+from .common import open_destination, write_csv, write_ndjson
+
+# The columns of a CSV export, in order. `miniSeries` is only present for summoners in their promotion series.
+LEAGUE_ENTRY_COLUMNS = (
+    "leagueId",
+    "queueType",
+    "tier",
+    "rank",
+    "summonerId",
+    "summonerName",
+    "leaguePoints",
+    "wins",
+    "losses",
+    "hotStreak",
+    "veteran",
+    "freshBlood",
+    "inactive",
+    "miniSeries.target",
+    "miniSeries.wins",
+    "miniSeries.losses",
+    "miniSeries.progress",
+    "region",
+)
+
+
+def iter_league_entry_pages(
+    tier: Union[Tier, str], division: Union[Division, str], region: Union[Region, str] = None
+) -> Generator[LeagueEntriesDto, None, None]:
+    """Requests the pages of league entries for a division one at a time, as they're iterated over.
+
+    Unlike `LeagueEntries`, nothing is kept once it has been iterated past, so iterating over a whole division only
+    needs the memory for one page.
+    """
+    if region is None:
+        region = configuration.settings.default_region
+    query = {"region": region, "tier": Tier(tier), "division": Division(division)}
+    pipeline = configuration.settings.pipeline
+    page = 1
+    results_per_page = None
+    while True:
+        entries = pipeline.get(LeagueEntriesDto, query=dict(query, page=page))
+        n_results = len(entries["entries"])
+        if n_results == 0:
+            break
+        yield entries
+        # Every page but the last one is full
+        if results_per_page is None:
+            results_per_page = n_results
+        elif n_results < results_per_page:
+            break
+        page += 1
+
+
+def iter_league_entries(
+    tier: Union[Tier, str], division: Union[Division, str], region: Union[Region, str] = None
+) -> Generator[Dict[str, Any], None, None]:
+    """Yields the league entries for a division (as they were returned by the Riot API) one page at a time."""
+    for page in iter_league_entry_pages(tier, division, region):
+        yield from page["entries"]
+
+
+def export_league_entries(
+    destination: Union[str, BinaryIO],
+    tier: Union[Tier, str],
+    division: Union[Division, str],
+    region: Union[Region, str] = None,
+    format: str = "ndjson",
+    compress: bool = None,
+) -> int:
+    """Streams the league entries for a division to `destination` (a path or a binary file object) as they're
+    requested, so memory use doesn't depend on the size of the division.
+
+    `format` is one of "ndjson" (one JSON object per line), "csv" (with the columns in `LEAGUE_ENTRY_COLUMNS`) or
+    "parquet" (with `columnar.league_entry_schema`, which needs pyarrow). If `compress` is True the NDJSON or CSV output
+    is gzipped; by default, only paths ending in `.gz` are. Parquet files are compressed internally instead.
+
+    Returns the number of entries written.
+    """
+    if format not in ("ndjson", "csv", "parquet"):
+        raise ValueError('Unknown export format "{}". Use "ndjson", "csv" or "parquet".'.format(format))
+    entries = iter_league_entries(tier, division, region)
+    if format == "parquet":
+        if compress:
+            raise ValueError("Parquet files can't be gzipped.")
+        from .columnar import write_league_entries_parquet
+
+        return write_league_entries_parquet(entries, destination)
+    with open_destination(destination, compress) as fp:
+        if format == "ndjson":
+            return write_ndjson(entries, fp)
+        else:
+            return write_csv(entries, fp, LEAGUE_ENTRY_COLUMNS)
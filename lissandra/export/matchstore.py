@@ -0,0 +1,413 @@
+"""Compact, columnar in-memory storage for TFT matches.
+
+This needs the optional ``numpy`` dependency. A `MatchStore` keeps one fixed-width record per match and one per
+participant in growable NumPy arrays. Trait, unit and item ids (and the other strings, like puuids) are interned into
+small integer codes, with 0 meaning "no value", so each participant's traits, units and items are stored as
+zero-padded arrays inside its record.
+
+That makes aggregations over many matches vectorized scans over a few arrays (see `trait_frequency_by_placement`),
+rather than walks over nested dicts. Matches can still be read back out as core `Match` objects, which are only
+built when they're asked for.
+"""
+
+import json
+from typing import Any, BinaryIO, Dict, Hashable, Iterable, Iterator, List, Mapping, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..core.match import Match, MatchData, Participant, ParticipantData
+
+# The most traits, units and items (per unit) a participant can have. Participants with more are rejected.
+MAX_TRAITS = 16
+MAX_UNITS = 14
+MAX_ITEMS = 3
+
+# The number of placements in a TFT match
+N_PLACEMENTS = 8
+
+_INITIAL_CAPACITY = 1024
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise ImportError("Columnar match storage requires numpy. Install it with `pip install numpy`.")
+
+
+class Interner(object):
+    """Maps values to small integer codes and back. Code 0 is reserved for `None` (an empty slot)."""
+
+    def __init__(self, values: Iterable[Hashable] = ()):
+        self._values = [None]  # type: List[Hashable]
+        self._codes = {None: 0}  # type: Dict[Hashable, int]
+        for value in values:
+            self.code(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: Hashable) -> bool:
+        return value in self._codes
+
+    def code(self, value: Hashable) -> int:
+        """The code for `value`, which is assigned the next free code if it hasn't been seen before."""
+        try:
+            return self._codes[value]
+        except KeyError:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+            return code
+
+    def get_code(self, value: Hashable) -> int:
+        """The code for `value`, without assigning one. Raises a KeyError if `value` hasn't been seen."""
+        return self._codes[value]
+
+    def value(self, code: int) -> Hashable:
+        return self._values[code]
+
+    @property
+    def values(self) -> List[Hashable]:
+        """All the interned values, indexed by their codes."""
+        return self._values
+
+
+def match_dtype() -> "numpy.dtype":
+    """The record type of a match. `id`, `region`, `data_version` and `game_version` are codes into the store's
+    `strings`.
+    """
+    _require_numpy()
+    return numpy.dtype(
+        [
+            ("id", numpy.uint32),
+            ("region", numpy.uint32),
+            ("data_version", numpy.uint32),
+            ("game_version", numpy.uint32),
+            ("game_datetime", numpy.int64),
+            ("game_length", numpy.float32),
+            ("queue_id", numpy.uint16),
+            ("tft_set_number", numpy.uint8),
+            ("participants_start", numpy.uint32),
+            ("n_participants", numpy.uint8),
+        ]
+    )
+
+
+def participant_dtype(
+    max_traits: int = MAX_TRAITS, max_units: int = MAX_UNITS, max_items: int = MAX_ITEMS
+) -> "numpy.dtype":
+    """The record type of a participant.
+
+    `match` is the position of the participant's match in the store. `trait`, `unit` and `unit_items` are codes into
+    the store's `traits`, `units` and `items`; `puuid` and the companion's `companion_content_id` and
+    `companion_species` are codes into its `strings`. Units' `name`s, which the Riot API leaves empty, aren't stored.
+    """
+    _require_numpy()
+    return numpy.dtype(
+        [
+            ("match", numpy.uint32),
+            ("puuid", numpy.uint32),
+            ("placement", numpy.uint8),
+            ("level", numpy.uint8),
+            ("last_round", numpy.uint8),
+            ("players_eliminated", numpy.uint8),
+            ("gold_left", numpy.uint16),
+            ("total_damage_to_players", numpy.uint16),
+            ("time_eliminated", numpy.float32),
+            ("companion_content_id", numpy.uint32),
+            ("companion_skin_id", numpy.uint16),
+            ("companion_species", numpy.uint32),
+            ("n_traits", numpy.uint8),
+            ("trait", numpy.uint16, (max_traits,)),
+            ("trait_num_units", numpy.uint8, (max_traits,)),
+            ("trait_style", numpy.uint8, (max_traits,)),
+            ("trait_tier_current", numpy.uint8, (max_traits,)),
+            ("trait_tier_total", numpy.uint8, (max_traits,)),
+            ("n_units", numpy.uint8),
+            ("unit", numpy.uint16, (max_units,)),
+            ("unit_rarity", numpy.uint8, (max_units,)),
+            ("unit_tier", numpy.uint8, (max_units,)),
+            ("unit_items", numpy.uint16, (max_units, max_items)),
+        ]
+    )
+
+
+def _match_data(match: Union[Match, MatchData, Mapping[str, Any]]) -> MatchData:
+    if isinstance(match, Match):
+        if not match._Ghost__is_loaded(MatchData):
+            match.load()
+        return match._data[MatchData]
+    if isinstance(match, MatchData):
+        return match
+    return MatchData(**match)
+
+
+class MatchStore(object):
+    """Fixed-width NumPy records for TFT matches and their participants. See the module docstring.
+
+    `matches` and `participants` are views of the records that have been added so far; participants are stored
+    contiguously per match, in the order they were added.
+    """
+
+    def __init__(self, max_traits: int = MAX_TRAITS, max_units: int = MAX_UNITS, max_items: int = MAX_ITEMS):
+        _require_numpy()
+        self.max_traits = max_traits
+        self.max_units = max_units
+        self.max_items = max_items
+        self.traits = Interner()
+        self.units = Interner()
+        self.items = Interner()
+        self.strings = Interner()
+        self._matches = numpy.zeros(_INITIAL_CAPACITY, dtype=match_dtype())
+        self._participants = numpy.zeros(
+            _INITIAL_CAPACITY * N_PLACEMENTS, dtype=participant_dtype(max_traits, max_units, max_items)
+        )
+        self._n_matches = 0
+        self._n_participants = 0
+
+    def __len__(self) -> int:
+        return self._n_matches
+
+    @property
+    def matches(self) -> "numpy.ndarray":
+        return self._matches[: self._n_matches]
+
+    @property
+    def participants(self) -> "numpy.ndarray":
+        return self._participants[: self._n_participants]
+
+    @staticmethod
+    def _grown(array: "numpy.ndarray", size: int) -> "numpy.ndarray":
+        if size <= len(array):
+            return array
+        grown = numpy.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    # Adding matches
+
+    def add(self, match: Union[Match, MatchData, Mapping[str, Any]]) -> int:
+        """Adds a match (a `Match`, which is loaded if it isn't already, its `MatchData`, or a `MatchDto`-like dict)
+        and returns its position in the store.
+        """
+        data = _match_data(match)
+        participants = getattr(data, "participant_dtos", [])
+        rows = [self._participant_row(participant) for participant in participants]
+
+        position = self._n_matches
+        self._matches = self._grown(self._matches, position + 1)
+        self._participants = self._grown(self._participants, self._n_participants + len(rows))
+
+        record = self._matches[position]
+        record["id"] = self.strings.code(data.id)
+        record["region"] = self.strings.code(getattr(data, "region", None))
+        record["data_version"] = self.strings.code(getattr(data, "data_version", None))
+        record["game_version"] = self.strings.code(getattr(data, "game_version", None))
+        record["game_datetime"] = getattr(data, "game_datetime", 0)
+        record["game_length"] = getattr(data, "game_length", 0)
+        record["queue_id"] = getattr(data, "queue_id", 0)
+        record["tft_set_number"] = getattr(data, "tft_set_number", 0)
+        record["participants_start"] = self._n_participants
+        record["n_participants"] = len(rows)
+
+        for row in rows:
+            row["match"] = position
+            self._participants[self._n_participants] = row
+            self._n_participants += 1
+        self._n_matches += 1
+        return position
+
+    def extend(self, matches: Iterable[Union[Match, MatchData, Mapping[str, Any]]]) -> None:
+        for match in matches:
+            self.add(match)
+
+    def _participant_row(self, participant: Mapping[str, Any]) -> "numpy.ndarray":
+        traits = participant.get("traits", [])
+        units = participant.get("units", [])
+        if len(traits) > self.max_traits or len(units) > self.max_units:
+            raise ValueError(
+                "A participant has {} traits and {} units, but the store only has room for {} and {}.".format(
+                    len(traits), len(units), self.max_traits, self.max_units
+                )
+            )
+
+        row = numpy.zeros((), dtype=self._participants.dtype)
+        row["puuid"] = self.strings.code(participant.get("puuid"))
+        for name in ("placement", "level", "last_round", "players_eliminated", "gold_left", "total_damage_to_players"):
+            row[name] = participant.get(name, 0)
+        row["time_eliminated"] = participant.get("time_eliminated", 0)
+        companion = participant.get("companion", {})
+        row["companion_content_id"] = self.strings.code(companion.get("content_ID"))
+        row["companion_skin_id"] = companion.get("skin_ID", 0)
+        row["companion_species"] = self.strings.code(companion.get("species"))
+
+        row["n_traits"] = len(traits)
+        for i, trait in enumerate(traits):
+            row["trait"][i] = self.traits.code(trait["name"])
+            row["trait_num_units"][i] = trait.get("num_units", 0)
+            row["trait_style"][i] = trait.get("style", 0)
+            row["trait_tier_current"][i] = trait.get("tier_current", 0)
+            row["trait_tier_total"][i] = trait.get("tier_total", 0)
+
+        row["n_units"] = len(units)
+        for i, unit in enumerate(units):
+            items = unit.get("items", [])
+            if len(items) > self.max_items:
+                raise ValueError(
+                    "A unit has {} items, but the store only has room for {}.".format(len(items), self.max_items)
+                )
+            row["unit"][i] = self.units.code(unit["character_id"])
+            row["unit_rarity"][i] = unit.get("rarity", 0)
+            row["unit_tier"][i] = unit.get("tier", 0)
+            for j, item in enumerate(items):
+                row["unit_items"][i, j] = self.items.code(item)
+        return row
+
+    # Reading matches back out
+
+    def participant_dto(self, position: int) -> Dict[str, Any]:
+        """Rebuilds the `MatchDto`-style participant dict of the participant at `position`."""
+        if not 0 <= position < self._n_participants:
+            raise IndexError("participant index out of range")
+        row = self._participants[position]
+        participant = {
+            "puuid": self.strings.value(row["puuid"]),
+            "placement": int(row["placement"]),
+            "level": int(row["level"]),
+            "last_round": int(row["last_round"]),
+            "players_eliminated": int(row["players_eliminated"]),
+            "gold_left": int(row["gold_left"]),
+            "total_damage_to_players": int(row["total_damage_to_players"]),
+            "time_eliminated": float(row["time_eliminated"]),
+            "companion": {
+                "content_ID": self.strings.value(row["companion_content_id"]),
+                "skin_ID": int(row["companion_skin_id"]),
+                "species": self.strings.value(row["companion_species"]),
+            },
+            "traits": [
+                {
+                    "name": self.traits.value(row["trait"][i]),
+                    "num_units": int(row["trait_num_units"][i]),
+                    "style": int(row["trait_style"][i]),
+                    "tier_current": int(row["trait_tier_current"][i]),
+                    "tier_total": int(row["trait_tier_total"][i]),
+                }
+                for i in range(int(row["n_traits"]))
+            ],
+            "units": [
+                {
+                    "character_id": self.units.value(row["unit"][i]),
+                    "items": [self.items.value(code) for code in row["unit_items"][i] if code != 0],
+                    "rarity": int(row["unit_rarity"][i]),
+                    "tier": int(row["unit_tier"][i]),
+                }
+                for i in range(int(row["n_units"]))
+            ],
+        }
+        return participant
+
+    def participant(self, position: int) -> Participant:
+        """The core `Participant` for the participant record at `position`."""
+        region = self.strings.value(self.matches[self._participants[position]["match"]]["region"])
+        return Participant.from_data(ParticipantData(region=region, **self.participant_dto(position)))
+
+    def match_data(self, position: int) -> MatchData:
+        """Rebuilds the `MatchData` of the match at `position`."""
+        if not 0 <= position < self._n_matches:
+            raise IndexError("match index out of range")
+        record = self._matches[position]
+        start = int(record["participants_start"])
+        participants = [self.participant_dto(i) for i in range(start, start + int(record["n_participants"]))]
+        return MatchData(
+            match_id=self.strings.value(record["id"]),
+            region=self.strings.value(record["region"]),
+            data_version=self.strings.value(record["data_version"]),
+            game_version=self.strings.value(record["game_version"]),
+            game_datetime=int(record["game_datetime"]),
+            game_length=float(record["game_length"]),
+            queue_id=int(record["queue_id"]),
+            tft_set_number=int(record["tft_set_number"]),
+            puuids=[participant["puuid"] for participant in participants],
+            participants=participants,
+        )
+
+    def __getitem__(self, position: int) -> Match:
+        """The core `Match` at `position`. Its participants are only decoded when they're used."""
+        if position < 0:
+            position += self._n_matches
+        return Match.from_data(self.match_data(position))
+
+    def __iter__(self) -> Iterator[Match]:
+        for position in range(self._n_matches):
+            yield self[position]
+
+    # Aggregations
+
+    def _frequency_by_placement(self, codes: "numpy.ndarray", mask: "numpy.ndarray", n_codes: int) -> "numpy.ndarray":
+        # `codes` and `mask` have a row per participant and a column per slot
+        placements = numpy.broadcast_to(self.participants["placement"][:, None], codes.shape)
+        mask = mask & (codes != 0) & (placements >= 1) & (placements <= N_PLACEMENTS)
+        index = codes[mask].astype(numpy.int64) * N_PLACEMENTS + (placements[mask].astype(numpy.int64) - 1)
+        counts = numpy.bincount(index, minlength=n_codes * N_PLACEMENTS)
+        return counts.reshape(n_codes, N_PLACEMENTS)
+
+    def trait_frequency_by_placement(self, min_tier: int = 1) -> "numpy.ndarray":
+        """Counts how often each trait was active (at `tier_current >= min_tier`) at each placement.
+
+        Returns an array of shape `(len(self.traits), 8)`, where `[code, placement - 1]` is the count for the trait
+        with that code. Row 0 (no trait) is always zero.
+        """
+        participants = self.participants
+        mask = participants["trait_tier_current"] >= min_tier
+        return self._frequency_by_placement(participants["trait"], mask, len(self.traits))
+
+    def unit_frequency_by_placement(self, min_tier: int = 1) -> "numpy.ndarray":
+        """Counts how often each unit (at star level `tier >= min_tier`) was fielded at each placement. The result is
+        laid out like `trait_frequency_by_placement`'s, by unit code.
+        """
+        participants = self.participants
+        mask = participants["unit_tier"] >= min_tier
+        return self._frequency_by_placement(participants["unit"], mask, len(self.units))
+
+    def average_placement(self, frequency_by_placement: "numpy.ndarray") -> "numpy.ndarray":
+        """The average placement for each row of a `*_frequency_by_placement` result (NaN where the count is 0)."""
+        counts = frequency_by_placement.sum(axis=1)
+        totals = frequency_by_placement @ numpy.arange(1, N_PLACEMENTS + 1)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return totals / counts
+
+    # Persistence
+
+    def save(self, destination: Union[str, BinaryIO]) -> None:
+        """Saves the store to a `.npz` file. The interned values are stored as JSON, so they must be JSON types."""
+        tables = {
+            "max_traits": self.max_traits,
+            "max_units": self.max_units,
+            "max_items": self.max_items,
+            "traits": self.traits.values,
+            "units": self.units.values,
+            "items": self.items.values,
+            "strings": self.strings.values,
+        }
+        numpy.savez_compressed(
+            destination,
+            matches=self.matches,
+            participants=self.participants,
+            tables=numpy.frombuffer(json.dumps(tables).encode("utf-8"), dtype=numpy.uint8),
+        )
+
+    @classmethod
+    def load(cls, source: Union[str, BinaryIO]) -> "MatchStore":
+        """Loads a store saved with `save`."""
+        _require_numpy()
+        with numpy.load(source, allow_pickle=False) as arrays:
+            tables = json.loads(arrays["tables"].tobytes().decode("utf-8"))
+            self = cls(tables["max_traits"], tables["max_units"], tables["max_items"])
+            for name in ("traits", "units", "items", "strings"):
+                setattr(self, name, Interner(tables[name][1:]))
+            self._matches = arrays["matches"].copy()
+            self._participants = arrays["participants"].copy()
+        self._n_matches = len(self._matches)
+        self._n_participants = len(self._participants)
+        return self
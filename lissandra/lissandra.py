@@ -1,5 +1,5 @@
-from typing import List, Set, Dict, Union, TextIO
-import arrow
+from typing import TYPE_CHECKING, List, Set, Dict, Union, TextIO, Iterable, Callable, Any
+import collections
 import datetime
 
 from .data import Region, Queue, Tier, Division
@@ -20,11 +20,15 @@ from .core import (
     LeagueEntries,
     Patch,
     VerificationString,
+    Match,
+    MatchHistory,
 )
-from .datastores import common as _common_datastore
 from ._configuration import Settings, load_config, get_default_config
 from . import configuration
 
+if TYPE_CHECKING:
+    from .datastores.riotapi import RateLimitMonitor
+
 
 # Settings endpoints
 
@@ -45,12 +49,9 @@ def apply_settings(config: Union[str, TextIO, Dict, Settings]):
 
     print_calls(settings._Settings__default_print_calls, settings._Settings__default_print_riot_api_key)
 
-    # Overwrite the old settings
+    # Overwrite the old settings. The pipeline is created the first time it's used.
     configuration._settings = settings
 
-    # Initialize the pipeline immediately
-    _ = configuration.settings.pipeline
-
 
 def set_riot_api_key(key: str):
     configuration.settings.set_riot_api_key(key)
@@ -61,8 +62,25 @@ def set_default_region(region: Union[Region, str]):
 
 
 def print_calls(calls: bool, api_key: bool = False):
-    _common_datastore._print_calls = calls
-    _common_datastore._print_api_key = api_key
+    from .datastores import common as _common_datastore
+
+    _common_datastore.print_calls(calls, api_key)
+
+
+def get_rate_limits() -> List[Dict]:
+    """Returns the state of every Riot API rate limiter that's been used; see `RiotAPIRateLimiter.snapshot`."""
+    return configuration.settings.rate_limits()
+
+
+def monitor_rate_limits(callback: Callable[[List[Dict]], Any], interval: float = 1.0) -> "RateLimitMonitor":
+    """Calls `callback` with `get_rate_limits()` every `interval` seconds, in a background thread, until the returned
+    monitor's `stop` is called.
+    """
+    from .datastores.riotapi import RateLimitMonitor
+
+    monitor = RateLimitMonitor(callback, get_rate_limits, interval)
+    monitor.start()
+    return monitor
 
 
 # Data endpoints
@@ -98,6 +116,85 @@ def get_summoner(
     return Summoner(id=id, account_id=account_id, name=name, region=region)
 
 
+def get_summoners(
+    *,
+    ids: Iterable[str] = None,
+    puuids: Iterable[str] = None,
+    names: Iterable[str] = None,
+    region: Union[Region, str] = None
+) -> List[Union[Summoner, Exception]]:
+    """Loads many summoners at once, by exactly one of `ids`, `puuids` or `names`.
+
+    Duplicates are only loaded once. Cached summoners are taken from the cache and the rest are requested from the
+    Riot API concurrently. Returns one item per input, in the same order: the loaded `Summoner`, or the exception that
+    was raised while loading it (e.g. `NotFoundError`).
+    """
+    given = [
+        (key, identifiers)
+        for key, identifiers in (("ids", ids), ("puuids", puuids), ("names", names))
+        if identifiers is not None
+    ]
+    if len(given) != 1:
+        raise ValueError("Exactly one of `ids`, `puuids` or `names` must be provided.")
+    key, identifiers = given[0]
+    return _get_many(Summoner, key, identifiers, region, "summoner")
+
+
+def get_match(id: str, region: Union[Region, str] = None) -> Match:
+    """Gets a TFT match by its id (e.g. "EUW1_4567891234"). The region is taken from the id if it isn't given."""
+    return Match(id=id, region=region)
+
+
+def get_match_history(
+    *, summoner: Summoner = None, puuid: str = None, count: int = 20, region: Union[Region, str] = None
+) -> MatchHistory:
+    """Gets the ids of a summoner's most recent TFT matches, by `summoner` or `puuid`, as (unloaded) `Match`es."""
+    if summoner is not None:
+        puuid = summoner.puuid
+        region = summoner.region
+    return MatchHistory(puuid=puuid, count=count, region=region)
+
+
+def get_matches(ids: Iterable[str], region: Union[Region, str] = None) -> List[Union[Match, Exception]]:
+    """Loads many TFT matches from the same region at once.
+
+    Works like `get_summoners`: duplicates are only loaded once, cached matches are taken from the cache and the rest
+    are requested from the Riot API concurrently. Returns one item per id, in the same order: the loaded `Match`, or
+    the exception that was raised while loading it.
+    """
+    from .core.match import _region_from_match_id
+
+    ids = list(ids)
+    if region is None and ids:
+        region = _region_from_match_id(ids[0])
+    return _get_many(Match, "ids", ids, region, "match")
+
+
+def _get_many(type: type, key: str, identifiers: Iterable, region: Union[Region, str], name: str) -> List:
+    identifiers = list(identifiers)
+    unique_identifiers = list(collections.OrderedDict.fromkeys(identifiers))
+    if region is None:
+        region = configuration.settings.default_region
+    if not unique_identifiers:
+        return []
+
+    from datapipelines import NotFoundError
+    from .datastores.util import PartialNotFoundError
+
+    try:
+        results = configuration.settings.pipeline.get_many(type, {key: unique_identifiers, "region": region})
+    except PartialNotFoundError as error:
+        results = list(error.results)
+        for position in error.missing:
+            results[position] = error.errors.get(
+                position, NotFoundError("No {} was found for {}".format(name, unique_identifiers[position]))
+            )
+    except NotFoundError as error:
+        results = [error] * len(unique_identifiers)
+    by_identifier = dict(zip(unique_identifiers, results))
+    return [by_identifier[identifier] for identifier in identifiers]
+
+
 def get_profile_icons(region: Union[Region, str] = None) -> ProfileIcons:
     return ProfileIcons(region=region)
 
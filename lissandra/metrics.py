@@ -0,0 +1,215 @@
+"""In-process metrics for the requests lissandra makes.
+
+Every request to the Riot API updates the counters and histograms below, labeled by platform and endpoint (the same
+endpoint names the method rate limiters use). They're kept in `REGISTRY`, and can be read with
+`MetricsRegistry.get_sample_value`, or exported in the Prometheus text format with `to_prometheus`, e.g. to serve
+from a `/metrics` endpoint:
+
+    from lissandra.metrics import to_prometheus
+    body = to_prometheus().encode("utf-8")
+"""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in values)
+    return "{" + ",".join('{}="{}"'.format(name, value) for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric(ABC):
+    type = None  # type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # type: Dict[Tuple[str, ...], object]
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError("{} takes the labels {}, got {}".format(self.name, self.labelnames, sorted(labels)))
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as error:
+            raise ValueError(
+                "{} takes the labels {}, got {}".format(self.name, self.labelnames, sorted(labels))
+            ) from error
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """Yields (sample name, labels, value) for every sample of this metric."""
+        pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """A total that only goes up, e.g. the number of requests made."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    """Counts observations (e.g. request latencies) in cumulative buckets, and keeps their count and sum."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            try:
+                counts, total = self._values[key]
+            except KeyError:
+                counts, total = [0] * (len(self.buckets) + 1), 0.0
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = counts, total + value
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield self.name + "_bucket", dict(labels, le=_format_value(bound)), cumulative
+            yield self.name + "_count", labels, cumulative
+            yield self.name + "_sum", labels, total
+
+
+class MetricsRegistry(object):
+    def __init__(self):
+        self._metrics = {}  # type: Dict[str, _Metric]
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError("A metric called {} is already registered".format(metric.name))
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def __getitem__(self, name: str) -> _Metric:
+        return self._metrics[name]
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._metrics.values()))
+
+    def get_sample_value(self, name: str, labels: Mapping[str, str] = None) -> Optional[float]:
+        """Returns the value of the sample called `name` (e.g. "lissandra_requests_total" or
+        "lissandra_request_duration_seconds_count") with exactly these `labels`, or None if there isn't one.
+        """
+        labels = {key: str(value) for key, value in (labels or {}).items()}
+        for metric in self:
+            if not name.startswith(metric.name):
+                continue
+            for sample_name, sample_labels, value in metric.samples():
+                if sample_name == name and sample_labels == labels:
+                    return value
+        return None
+
+    def clear(self) -> None:
+        """Resets every metric (but keeps them registered)."""
+        for metric in self:
+            metric.clear()
+
+    def to_prometheus(self) -> str:
+        """Returns every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self:
+            lines.append("# HELP {} {}".format(metric.name, metric.documentation.replace("\\", "\\\\")))
+            lines.append("# TYPE {} {}".format(metric.name, metric.type))
+            for sample_name, labels, value in metric.samples():
+                lines.append(
+                    "{}{} {}".format(
+                        sample_name, _format_labels(list(labels), list(labels.values())), _format_value(value)
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def to_prometheus(registry: MetricsRegistry = None) -> str:
+    return (registry or REGISTRY).to_prometheus()
+
+
+REQUESTS = REGISTRY.counter(
+    "lissandra_requests_total", "Requests made to the Riot API, by response status.", ("platform", "endpoint", "status")
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "lissandra_request_duration_seconds",
+    "Time from sending a request to the Riot API to getting its response, not counting rate limiter waits.",
+    ("platform", "endpoint"),
+)
+RESPONSE_BYTES = REGISTRY.counter(
+    "lissandra_response_bytes_total",
+    "Bytes received from the Riot API (as sent, before decompression).",
+    ("platform", "endpoint"),
+)
+RETRIES = REGISTRY.counter(
+    "lissandra_retries_total",
+    "Requests to the Riot API that were retried, by the status that caused the retry (and the limit type for 429s).",
+    ("platform", "endpoint", "reason"),
+)
+RATE_LIMITER_WAIT = REGISTRY.histogram(
+    "lissandra_rate_limiter_wait_seconds",
+    'Time spent waiting for a permit from a rate limiter. `limiter` is the endpoint, or "application".',
+    ("platform", "limiter"),
+)
+HEDGED_REQUESTS = REGISTRY.counter(
+    "lissandra_hedged_requests_total",
+    "Requests that were slow enough to hedge, by what happened: the hedge was sent and answered first (won), was "
+    "sent but the first request answered first (lost) or failed (failed), or wasn't sent because the hedging budget "
+    "(over_budget) or the rate limiters (rate_limited) didn't allow it.",
+    ("platform", "endpoint", "result"),
+)
@@ -0,0 +1,170 @@
+"""Optional tracing of where the time in a `get` goes.
+
+When a tracer is set, every `pipeline.get` / `get_many` gets a span, with child spans for each datastore `get`, `put`
+and transform it goes through, and for the rate limiter waits and the HTTP call of every request. Pipeline spans carry
+the requested type and the query, and which datastore answered it; datastore spans say whether that datastore had the
+result ("hit"), didn't ("miss"), or only had some of it ("partial").
+
+Tracers follow OpenTelemetry's API (`tracer.start_as_current_span(name, attributes=...)`), so an OpenTelemetry tracer
+can be used directly:
+
+    lissandra.tracing.use_opentelemetry()  # Or set_tracer(opentelemetry.trace.get_tracer("lissandra"))
+
+`RecordingTracer` keeps the spans in memory instead, which is handy for finding a slow step without any other setup.
+Tracing is off by default, and costs (almost) nothing while it is.
+"""
+
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+try:
+    from opentelemetry import trace as opentelemetry_trace
+except ImportError:
+    opentelemetry_trace = None
+
+_tracer = None
+
+
+def _require_opentelemetry() -> None:
+    if opentelemetry_trace is None:
+        raise ImportError(
+            "Tracing with OpenTelemetry requires the opentelemetry-api package. Install it with `pip install opentelemetry-api`."
+        )
+
+
+def set_tracer(tracer) -> None:
+    """Sends spans to `tracer`, or turns tracing off if it's None."""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def use_opentelemetry(tracer_provider=None) -> None:
+    """Sends spans to OpenTelemetry, using the global tracer provider unless another one is given."""
+    _require_opentelemetry()
+    set_tracer(opentelemetry_trace.get_tracer("lissandra", tracer_provider=tracer_provider))
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+class _NoOpSpan(object):
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException, attributes: Mapping[str, Any] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+def span(name: str, attributes: Mapping[str, Any] = None):
+    """Returns a context manager for a span called `name` (which is a no-op if tracing is off)."""
+    if _tracer is None:
+        return _NO_OP_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def attribute_value(value: Any):
+    """Converts `value` to something span attributes can hold: a str, bool, int, float, or a list of them."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [attribute_value(item) for item in value]
+    value = getattr(value, "value", value)  # Enums
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+def query_attributes(type: type, query: Mapping[str, Any]) -> Dict[str, Any]:
+    attributes = {"lissandra.type": type.__name__}
+    for key, value in query.items():
+        attributes["lissandra.query." + key] = attribute_value(value)
+    return attributes
+
+
+class RecordedSpan(object):
+    def __init__(self, name: str, attributes: Mapping[str, Any], parent: Optional["RecordedSpan"]):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.children = []
+        self.exception = None  # type: Optional[BaseException]
+        self.start = time.perf_counter()
+        self.end = None  # type: Optional[float]
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException, attributes: Mapping[str, Any] = None) -> None:
+        self.exception = exception
+
+    def __repr__(self) -> str:
+        return "RecordedSpan({!r}, {!r})".format(self.name, self.attributes)
+
+
+class RecordingTracer(object):
+    """Keeps every span in memory. `spans` holds them all (in the order they finished) and `roots` the top level
+    ones; each span's `children` are the spans that were started inside it on the same thread.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.roots = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name: str, attributes: Mapping[str, Any] = None):
+        stack = self._local.__dict__.setdefault("stack", [])
+        parent = stack[-1] if stack else None
+        span = RecordedSpan(name, attributes, parent)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.record_exception(error)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            # Usually the last one, but a streamed `get_many` ends its span after the ones started while it was read
+            stack.remove(span)
+            with self._lock:
+                self.spans.append(span)
+                if parent is None:
+                    self.roots.append(span)
+                else:
+                    parent.children.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+            self.roots = []
+
+    def format(self, span: RecordedSpan = None, indent: int = 0) -> str:
+        """Formats the recorded spans (or just `span` and its children) as an indented tree with their durations."""
+        spans = self.roots if span is None else [span]
+        lines = []
+        for span in spans:
+            lines.append(
+                "{}{} {:.3f} ms {}".format("  " * indent, span.name, (span.duration or 0.0) * 1e3, span.attributes)
+            )
+            for child in span.children:
+                lines.append(self.format(child, indent + 1))
+        return "\n".join(lines)
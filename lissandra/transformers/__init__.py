@@ -5,6 +5,7 @@ from .status import StatusTransformer
 from .leagues import LeagueTransformer
 from .thirdpartycode import ThirdPartyCodeTransformer
 from .summoner import SummonerTransformer
+from .match import MatchTransformer
 
 
 riotapi_transformer = CompositeDataTransformer(
@@ -14,6 +15,7 @@ riotapi_transformer = CompositeDataTransformer(
         LeagueTransformer(),
         ThirdPartyCodeTransformer(),
         SummonerTransformer(),
+        MatchTransformer(),
     ]
 )
 
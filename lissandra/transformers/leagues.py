@@ -1,5 +1,4 @@
 from typing import Type, TypeVar
-from copy import deepcopy
 
 from datapipelines import DataTransformer, PipelineContext
 
@@ -53,10 +52,8 @@ class LeagueTransformer(DataTransformer):
     def leagues_summoner_entries_dto_to_data(
         self, value: LeagueSummonerEntriesDto, context: PipelineContext = None
     ) -> LeagueSummonerEntriesData:
-        data = deepcopy(value)
-        for entry in data["entries"]:
-            entry["region"] = data["region"]
-        data = [LeagueTransformer.league_entry_dto_to_data(self, entry) for entry in data["entries"]]
+        region = value["region"]
+        data = [LeagueTransformer.league_entry_dto_to_data(self, entry)(region=region) for entry in value["entries"]]
         return LeagueSummonerEntriesData(data, summoner_id=value["summonerId"], region=value["region"])
 
     @transform.register(LeagueEntriesDto, LeagueEntriesData)
@@ -93,13 +90,11 @@ class LeagueTransformer(DataTransformer):
     # Data to Core
 
     def league_data_to_core(self, value: LeagueData, context: PipelineContext = None) -> League:
-        data = deepcopy(value)
-        return League.from_data(data)
+        return League.from_data(value)
 
     @transform.register(LeagueEntryData, LeagueEntry)
     def league_entry_data_to_core(self, value: LeagueEntryData, context: PipelineContext = None) -> LeagueEntry:
-        data = deepcopy(value)
-        return LeagueEntry.from_data(data=data)
+        return LeagueEntry.from_data(data=value)
 
     @transform.register(LeagueEntriesData, LeagueEntries)
     def league_entries_data_to_core(self, value: LeagueEntriesData, context: PipelineContext = None) -> LeagueEntries:
@@ -115,19 +110,16 @@ class LeagueTransformer(DataTransformer):
     def challenger_league_list_data_to_core(
         self, value: ChallengerLeagueListData, context: PipelineContext = None
     ) -> ChallengerLeague:
-        data = deepcopy(value)
-        return ChallengerLeague.from_data(data)
+        return ChallengerLeague.from_data(value)
 
     # @transform.register(GrandmasterLeagueListData, GrandmasterLeague)
     def grandmaster_league_list_data_to_core(
         self, value: GrandmasterLeagueListData, context: PipelineContext = None
     ) -> GrandmasterLeague:
-        data = deepcopy(value)
-        return GrandmasterLeague.from_data(data)
+        return GrandmasterLeague.from_data(value)
 
     # @transform.register(MasterLeagueListData, MasterLeague)
     def master_league_list_data_to_core(
         self, value: MasterLeagueListData, context: PipelineContext = None
     ) -> MasterLeague:
-        data = deepcopy(value)
-        return MasterLeague.from_data(data)
+        return MasterLeague.from_data(value)
@@ -0,0 +1,33 @@
+from typing import Type, TypeVar
+
+from datapipelines import DataTransformer, PipelineContext
+
+from ..core.match import MatchData, MatchListData, Match
+from ..dto.match import MatchDto, MatchListDto
+
+T = TypeVar("T")
+F = TypeVar("F")
+
+
+class MatchTransformer(DataTransformer):
+    @DataTransformer.dispatch
+    def transform(self, target_type: Type[T], value: F, context: PipelineContext = None) -> T:
+        pass
+
+    # Dto to Data
+
+    @transform.register(MatchDto, MatchData)
+    def match_dto_to_data(self, value: MatchDto, context: PipelineContext = None) -> MatchData:
+        return MatchData(**value)
+
+    @transform.register(MatchListDto, MatchListData)
+    def match_list_dto_to_data(self, value: MatchListDto, context: PipelineContext = None) -> MatchListData:
+        return MatchListData(
+            value["ids"], puuid=value["puuid"], region=value["region"], count=value["count"], start=value["start"]
+        )
+
+    # Data to Core
+
+    @transform.register(MatchData, Match)
+    def match_data_to_core(self, value: MatchData, context: PipelineContext = None) -> Match:
+        return Match.from_data(value)
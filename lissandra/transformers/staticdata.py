@@ -1,5 +1,4 @@
 from typing import Type, TypeVar
-from copy import deepcopy
 
 from datapipelines import DataTransformer, PipelineContext
 
@@ -31,7 +30,7 @@ class StaticDataTransformer(DataTransformer):
 
     @transform.register(VersionListDto, VersionListData)
     def version_list_dto_to_data(self, value: VersionListDto, context: PipelineContext = None) -> VersionListData:
-        data = VersionListData(deepcopy(value["versions"]), region=value["region"])
+        data = VersionListData(value["versions"], region=value["region"])
         return data
 
     # Realm
@@ -44,8 +43,7 @@ class StaticDataTransformer(DataTransformer):
 
     @transform.register(LanguagesDto, LanguagesData)
     def languages_dto_to_data(self, value: LanguagesDto, context: PipelineContext = None) -> LanguagesData:
-        data = deepcopy(value)
-        return LanguagesData(data["languages"], region=value["region"])
+        return LanguagesData(value["languages"], region=value["region"])
 
     # Language Strings
 
@@ -67,9 +65,8 @@ class StaticDataTransformer(DataTransformer):
     def profile_icon_data_dto_to_data(
         self, value: ProfileIconDataDto, context: PipelineContext = None
     ) -> ProfileIconListData:
-        data = deepcopy(value)
         return ProfileIconListData(
-            [self.profile_icon_details_dto_to_data(p) for p in data["data"].values()],
+            [self.profile_icon_details_dto_to_data(p) for p in value["data"].values()],
             region=value["region"],
             version=value["version"],
             locale=value["locale"],
@@ -1,5 +1,4 @@
 from typing import Type, TypeVar
-from copy import deepcopy
 
 from datapipelines import DataTransformer, PipelineContext
 
@@ -7,6 +7,10 @@ from setuptools import setup, find_packages
 
 install_requires = ["datapipelines>=1.0.7", "merakicommons>=1.0.7", "Pillow", "arrow", "requests"]
 
+# Optional dependencies, e.g. `pip install lissandra[export]`. The export extra works on every Python we support: pyarrow
+# 6.0.1 is the newest with wheels for Python 3.6, and pip picks it there.
+extras_require = {"export": ["pyarrow>=6.0", "numpy"], "tracing": ["opentelemetry-api"], "orjson": ["orjson"]}
+
 # Require python 3.6
 if sys.version_info.major != 3 and sys.version_info.minor < 6:
     sys.exit("Lissandra requires at least Python 3.6.")
@@ -35,5 +39,6 @@ setup(
     packages=find_packages(),
     zip_safe=True,
     install_requires=install_requires,
+    extras_require=extras_require,
     include_package_data=True,
 )
@@ -0,0 +1,107 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+import lissandra
+from lissandra import Division, Tier
+from lissandra.core.league import (
+    ChallengerLeague,
+    ChallengerLeagueListData,
+    LeagueEntries,
+    LeagueEntry,
+    LeagueEntryData,
+)
+from lissandra.core.summoner import Summoner, SummonerData
+from lissandra.export import export_league_entries
+
+from .test_export import N_ENTRIES, get_page, make_entry
+
+if pyarrow is not None:
+    from lissandra.export.columnar import (
+        iter_record_batches,
+        league_entry_rows,
+        league_entry_schema,
+        write_arrow,
+        write_league_entries_parquet,
+        write_summoners_parquet,
+    )
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestColumnarExport(unittest.TestCase):
+    def test_league_entries_round_trip(self):
+        entries = LeagueEntries.from_generator(
+            (LeagueEntry.from_data(LeagueEntryData(**make_entry(i))) for i in range(N_ENTRIES)),
+            region="EUW",
+            tier=Tier.gold,
+            division=Division.one,
+        )
+        fp = io.BytesIO()
+        self.assertEqual(write_league_entries_parquet(entries, fp, row_group_size=3), N_ENTRIES)
+        parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(fp.getvalue()))
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(parquet_file.schema_arrow, league_entry_schema())
+        rows = parquet_file.read().to_pylist()
+        self.assertEqual(rows[0]["rank"], "I")
+        self.assertEqual(rows[0]["miniSeries"], {"target": 3, "wins": 1, "losses": 0, "progress": "WNN"})
+        self.assertIsNone(rows[1]["miniSeries"])
+        self.assertEqual([row["summonerId"] for row in rows], ["summoner-{}".format(i) for i in range(N_ENTRIES)])
+
+    def test_apex_league_fills_league_fields(self):
+        entries = [make_entry(i) for i in range(2)]
+        for entry in entries:
+            for key in ("leagueId", "queueType", "tier", "region"):
+                del entry[key]
+        data = ChallengerLeagueListData(
+            leagueId="challenger-id", queue="RANKED_TFT", tier="CHALLENGER", region="EUW", entries=entries
+        )
+        rows = list(league_entry_rows(ChallengerLeague.from_data(data)))
+        self.assertEqual(rows[0]["leagueId"], "challenger-id")
+        self.assertEqual(rows[1]["tier"], "CHALLENGER")
+        self.assertEqual(rows[1]["region"], "EUW")
+
+    def test_summoners_skip_errors(self):
+        summoner = Summoner.from_data(SummonerData(id="id", name="Crimack", summonerLevel=30, region="EUW"))
+        fp = io.BytesIO()
+        self.assertEqual(write_summoners_parquet([summoner, KeyError("missing"), {"id": "other"}], fp), 2)
+        rows = pyarrow.parquet.read_table(io.BytesIO(fp.getvalue())).to_pylist()
+        self.assertEqual(rows[0]["summonerLevel"], 30)
+        self.assertEqual(rows[1]["id"], "other")
+
+    def test_batches_are_yielded_as_they_fill(self):
+        produced = []
+
+        def rows():
+            for i in range(5):
+                produced.append(i)
+                yield make_entry(i)
+
+        batches = iter_record_batches(rows(), league_entry_schema(), batch_size=2)
+        self.assertEqual(next(batches).num_rows, 2)
+        self.assertEqual(produced, [0, 1])
+        self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+
+    def test_arrow_ipc(self):
+        fp = io.BytesIO()
+        self.assertEqual(write_arrow([make_entry(0)], fp, league_entry_schema()), 1)
+        table = pyarrow.ipc.open_file(io.BytesIO(fp.getvalue())).read_all()
+        self.assertEqual(table.column("summonerName").to_pylist(), ["Summoner 0"])
+
+    def test_export_parquet_format(self):
+        pipeline = MagicMock()
+        pipeline.get.side_effect = get_page
+        with patch.object(lissandra.configuration.settings.__class__, "pipeline", pipeline):
+            fp = io.BytesIO()
+            self.assertEqual(export_league_entries(fp, Tier.gold, Division.one, region="EUW", format="parquet"), 8)
+        self.assertEqual(pyarrow.parquet.read_table(io.BytesIO(fp.getvalue())).num_rows, N_ENTRIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from enum import Enum
+
+from merakicommons.container import SearchError
+
+from lissandra.core.container import searchable, IndexedSearchableList, IndexedSearchableLazyList
+
+
+class Colour(Enum):
+    red = "RED"
+    blue = "BLUE"
+
+
+@searchable({int: ["id"], str: ["name"], Colour: ["colour"], bool: ["active"]})
+class Item(object):
+    def __init__(self, id, name, colour, active=False):
+        self.id = id
+        self.name = name
+        self.colour = colour
+        self.active = active
+
+    def __repr__(self):
+        return "Item({})".format(self.id)
+
+
+def make_items():
+    return [
+        Item(1, "Alpha", Colour.red),
+        Item(2, "Beta", Colour.blue, active=True),
+        Item(3, "Gamma", Colour.red),
+        Item(2, "Delta", Colour.red),
+    ]
+
+
+class TestIndexedSearchableList(unittest.TestCase):
+    def test_find_by_indexed_types(self):
+        items = IndexedSearchableList(make_items())
+        self.assertIs(items.find(3), items[2])
+        self.assertIs(items.find(Colour.blue), items[1])
+        self.assertIs(items.find(True), items[1])
+        self.assertEqual([item.name for item in items.search(2)], ["Beta", "Delta"])
+        self.assertEqual([item.name for item in items.search(Colour.red)], ["Alpha", "Gamma", "Delta"])
+        self.assertIn(1, items)
+        self.assertNotIn(5, items)
+        self.assertRaises(SearchError, items.find, 5)
+
+    def test_str_keeps_substring_matching(self):
+        items = IndexedSearchableList(make_items())
+        self.assertIs(items.find("amm"), items[2])
+        self.assertIs(items["Delta"], items[3])
+
+    def test_append_is_picked_up(self):
+        items = IndexedSearchableList(make_items())
+        self.assertRaises(SearchError, items.find, 7)
+        items.append(Item(7, "Epsilon", Colour.blue))
+        self.assertEqual(items.find(7).name, "Epsilon")
+
+    def test_mutations_invalidate_index(self):
+        items = IndexedSearchableList(make_items())
+        self.assertIs(items.find(1), items[0])
+        items.insert(0, Item(9, "Zeta", Colour.red))
+        self.assertIs(items.find(1), items[1])
+        self.assertEqual(items.find(9).name, "Zeta")
+        del items[1]
+        self.assertRaises(SearchError, items.find, 1)
+        items[0] = Item(1, "Eta", Colour.blue)
+        self.assertEqual(items.find(1).name, "Eta")
+        items.reverse()
+        self.assertIs(items.find(1), items[-1])
+        items.delete(2)
+        self.assertRaises(SearchError, items.find, 2)
+
+    def test_unindexable_elements_fall_back_to_scan(self):
+        items = IndexedSearchableList(make_items() + [1, 2])
+        self.assertEqual(items.search(2), [items[1], items[3], 2])
+
+    def test_unknown_item_type_matches_nothing(self):
+        items = IndexedSearchableList(make_items())
+        self.assertNotIn(1.5, items)
+
+
+class TestIndexedSearchableLazyList(unittest.TestCase):
+    def test_find_only_generates_what_it_needs(self):
+        generated = []
+
+        def generator():
+            for item in make_items():
+                generated.append(item)
+                yield item
+
+        items = IndexedSearchableLazyList(generator())
+        self.assertEqual(items.find(Colour.blue).name, "Beta")
+        self.assertEqual(len(generated), 2)
+        self.assertEqual(items.find(1).name, "Alpha")
+        self.assertEqual(len(generated), 2)
+        self.assertEqual([item.name for item in items.search(2)], ["Beta", "Delta"])
+        self.assertEqual(len(generated), 4)
+        self.assertEqual(len(items), 4)
+        self.assertRaises(SearchError, items.find, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
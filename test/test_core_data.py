@@ -0,0 +1,251 @@
+import copy
+import datetime
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from lissandra import Region, ProfileIcon
+from lissandra.core import common
+from lissandra.core.common import CassiopeiaObject, get_latest_version, clear_latest_versions
+from lissandra import Tier, Division
+from lissandra.core.league import LeagueEntry, LeagueEntries, LeagueEntryData
+from lissandra.core.summoner import SummonerData
+from lissandra.core.status import ShardStatusData
+
+ENTRY = {
+    "leagueId": "5d24b9a1-6667-4445-bc51-fa28e5b293cb",
+    "summonerId": "summoner-id",
+    "summonerName": "Crimack",
+    "queueType": "RANKED_TFT",
+    "tier": "GOLD",
+    "rank": "II",
+    "leaguePoints": 10,
+    "wins": 5,
+    "losses": 3,
+    "hotStreak": False,
+    "veteran": False,
+    "freshBlood": True,
+    "inactive": False,
+    "region": "EUW",
+}
+
+
+class TestSlottedCoreData(unittest.TestCase):
+    def test_no_instance_dict(self):
+        entry = LeagueEntryData(**ENTRY)
+        self.assertFalse(hasattr(entry, "__dict__"))
+        self.assertIn("division", LeagueEntryData.__slots__)
+        self.assertNotIn("rank", LeagueEntryData.__slots__)
+
+    def test_renamed_fields(self):
+        entry = LeagueEntryData(**ENTRY)
+        self.assertEqual(entry.division, "II")
+        self.assertFalse(hasattr(entry, "rank"))
+        summoner = SummonerData(summonerLevel=30, name="Crimack")
+        self.assertEqual(summoner.level, 30)
+        self.assertEqual(ShardStatusData(region_tag="euw1").platform, "euw1")
+
+    def test_missing_fields_raise_attribute_error(self):
+        summoner = SummonerData(name="Crimack")
+        self.assertRaises(AttributeError, getattr, summoner, "puuid")
+        self.assertRaises(AttributeError, getattr, summoner, "notAField")
+
+    def test_undeclared_fields_are_kept(self):
+        entry = LeagueEntryData(newField=1, **ENTRY)
+        self.assertEqual(entry.newField, 1)
+        self.assertEqual(entry.to_dict()["newField"], 1)
+
+    def test_interned_fields(self):
+        # Decode separately so that the values are distinct objects to begin with
+        first, second = (LeagueEntryData(**json.loads(json.dumps(dict(ENTRY, wins=300)))) for _ in range(2))
+        self.assertIs(first.tier, second.tier)
+        self.assertIs(first.division, second.division)
+        self.assertIs(first.wins, second.wins)
+        self.assertIsNot(first.summonerName, second.summonerName)
+        self.assertIn("division", LeagueEntryData._interned)
+
+    def test_update(self):
+        summoner = SummonerData(name="Crimack")
+        summoner(name="Crimack2", summonerLevel=31)
+        self.assertEqual(summoner.name, "Crimack2")
+        self.assertEqual(summoner.level, 31)
+
+    def test_to_dict(self):
+        entry = LeagueEntryData(**ENTRY)
+        expected = dict(ENTRY)
+        expected["division"] = expected.pop("rank")
+        self.assertEqual(entry.to_dict(), expected)
+
+    def test_nested_to_dict(self):
+        status = ShardStatusData(
+            name="EU West",
+            services=[{"name": "Game", "slug": "game", "status": "online", "incidents": [{"id": 1, "updates": []}]}],
+        )
+        self.assertEqual(
+            status.to_dict(),
+            {
+                "name": "EU West",
+                "services": [
+                    {"name": "Game", "slug": "game", "status": "online", "incidents": [{"id": 1, "updates": []}]}
+                ],
+            },
+        )
+
+    def test_copy(self):
+        entry = LeagueEntryData(newField=1, **ENTRY)
+        self.assertEqual(copy.deepcopy(entry).to_dict(), entry.to_dict())
+        self.assertEqual(copy.copy(entry).to_dict(), entry.to_dict())
+
+        # Updating a copy doesn't change the original, including its undeclared fields
+        copied = copy.copy(entry)
+        copied(newField=2, leaguePoints=20)
+        self.assertEqual((entry.newField, entry.leaguePoints), (1, 10))
+        self.assertEqual((copied.newField, copied.leaguePoints, copied.division), (2, 20, "II"))
+        self.assertEqual(copy.copy(SummonerData(name="Crimack")).to_dict(), {"name": "Crimack"})
+
+
+class Options(object):
+    flag = None
+
+    def __init__(self, **kwargs):
+        self(**kwargs)
+
+    def __call__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        return self
+
+
+class Record(CassiopeiaObject):
+    _data_types = {SummonerData, Options}
+
+
+class TestKeyRouting(unittest.TestCase):
+    def test_keys_are_routed_to_accepting_types(self):
+        routes = Record._route_kwargs({"name": "Crimack", "flag": True})
+        self.assertEqual(routes[SummonerData], {"name": "Crimack", "flag": True})
+        self.assertEqual(routes[Options], {"flag": True})
+
+    def test_routes_are_cached_per_class(self):
+        Record._route_kwargs({"name": "Crimack"})
+        with patch("lissandra.core.common.dir", create=True, side_effect=AssertionError) as mocked_dir:
+            Record(name="Crimack")(name="Crimack2")
+            mocked_dir.assert_not_called()
+        self.assertNotIn("_key_routes", CassiopeiaObject.__dict__)
+
+    def test_update_copies_shared_data(self):
+        data = SummonerData(name="Crimack")
+        first, second = Record.from_data(data), Record.from_data(data)
+        first(name="Crimack2")
+        self.assertEqual(first._data[SummonerData].name, "Crimack2")
+        self.assertEqual(second._data[SummonerData].name, "Crimack")
+        self.assertEqual(data.name, "Crimack")
+
+    def test_construct_and_update(self):
+        summoner = Record(name="Crimack")
+        self.assertEqual(summoner._data[SummonerData].name, "Crimack")
+        summoner(summonerLevel=30)
+        self.assertEqual(summoner._data[SummonerData].name, "Crimack")
+        self.assertEqual(summoner._data[SummonerData].level, 30)
+
+
+class TestSerialization(unittest.TestCase):
+    def make_entries(self):
+        entries = (LeagueEntry.from_data(LeagueEntryData(**dict(ENTRY, summonerName=str(i)))) for i in range(3))
+        return LeagueEntries.from_generator(entries, region="EUW", tier=Tier.gold, division=Division.two)
+
+    def test_values_are_converted_for_json(self):
+        entries = self.make_entries()
+        # to_dict keeps the values as they are; only the JSON is converted
+        self.assertEqual(entries.to_dict(), {"region": "EUW", "tier": Tier.gold, "division": Division.two})
+        converted = {"region": "EUW", "tier": "gold", "division": "two"}
+        self.assertEqual(json.loads(entries.to_json()), converted)
+        self.assertEqual(json.loads(entries.to_json_bytes()), converted)
+        self.assertEqual(json.loads(entries.to_json(indent=2)), converted)
+
+        played = datetime.datetime(2020, 5, 17, 12, 30)
+        entry = LeagueEntry.from_data(LeagueEntryData(played=played, duration=datetime.timedelta(seconds=90), **ENTRY))
+        self.assertEqual(entry.to_dict()["played"], played)
+        self.assertEqual(json.loads(entry.to_json())["played"], "2020-05-17T12:30:00")
+        self.assertEqual(json.loads(entry.to_json_bytes())["duration"], 90)
+
+    def test_json_backends_agree(self):
+        entry = LeagueEntry.from_data(LeagueEntryData(**dict(ENTRY, tier=Tier.gold, summonerName="Crimack ñ")))
+        with_orjson = entry.to_json_bytes()
+        with patch.object(common, "orjson", None):
+            self.assertEqual(entry.to_json_bytes(), with_orjson)
+            fp = io.BytesIO()
+            self.make_entries().write_json(fp)
+        self.assertEqual(json.loads(with_orjson)["tier"], "gold")
+        self.assertEqual([entry["summonerName"] for entry in json.loads(fp.getvalue())], ["0", "1", "2"])
+
+    def test_to_json(self):
+        entry = LeagueEntry.from_data(LeagueEntryData(**ENTRY))
+        expected = dict(ENTRY)
+        expected["division"] = expected.pop("rank")
+        self.assertEqual(json.loads(entry.to_json()), expected)
+
+    def test_write_json(self):
+        fp = io.BytesIO()
+        self.make_entries().write_json(fp)
+        self.assertEqual([entry["summonerName"] for entry in json.loads(fp.getvalue())], ["0", "1", "2"])
+
+    def test_write_json_lines(self):
+        fp = io.BytesIO()
+        self.make_entries().write_json(fp, lines=True)
+        lines = fp.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["summonerName"] for line in lines], ["0", "1", "2"])
+
+
+class TestLatestVersion(unittest.TestCase):
+    def setUp(self):
+        clear_latest_versions()
+        self.realms = MagicMock()
+        self.realms.return_value.version = "10.10.1"
+        self.realms.return_value.latest_versions = {"profileicon": "10.10.2"}
+        patcher = patch("lissandra.core.staticdata.realm.Realms", self.realms)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_latest_versions)
+
+    def test_memoized_per_region(self):
+        self.assertEqual(get_latest_version(Region.europe_west, None), "10.10.1")
+        self.assertEqual(get_latest_version("EUW", "profileicon"), "10.10.2")
+        self.assertEqual(self.realms.call_count, 1)
+        get_latest_version(Region.north_america, None)
+        self.assertEqual(self.realms.call_count, 2)
+
+    def test_expires_with_realms_ttl(self):
+        with patch("lissandra.core.common._get_realms_ttl", return_value=60), patch("time.monotonic") as monotonic:
+            monotonic.return_value = 1000
+            get_latest_version(Region.europe_west, None)
+            monotonic.return_value = 1059
+            get_latest_version(Region.europe_west, None)
+            self.assertEqual(self.realms.call_count, 1)
+            monotonic.return_value = 1060
+            get_latest_version(Region.europe_west, None)
+            self.assertEqual(self.realms.call_count, 2)
+
+    def test_cleared(self):
+        get_latest_version(Region.europe_west, None)
+        clear_latest_versions()
+        get_latest_version(Region.europe_west, None)
+        self.assertEqual(self.realms.call_count, 2)
+
+
+class TestGetFromPipeline(unittest.TestCase):
+    def test_signature_is_inspected_once(self):
+        pipeline = MagicMock()
+        with patch.object(common.configuration.settings.__class__, "pipeline", pipeline), patch(
+            "lissandra.core.common.get_latest_version", return_value="10.10.1"
+        ) as latest_version, patch("inspect.signature", wraps=common.inspect.signature) as signature:
+            ProfileIcon(id=1, region="EUW")
+            ProfileIcon(id=2, region="EUW")
+            self.assertLessEqual(signature.call_count, 1)
+            self.assertEqual(latest_version.call_count, 2)
+        _, kwargs = pipeline.get.call_args
+        self.assertEqual(kwargs["query"], {"id": 2, "region": "EUW", "version": "10.10.1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import collections
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import lissandra
+from lissandra import Platform, Region
+from lissandra._configuration.pipeline import CompiledDataPipeline
+from lissandra.crawler import BloomFilter, MatchCrawler, SeenSet
+from lissandra.datastores import Cache, RiotAPI, UnloadedGhostStore
+from lissandra.datastores.riotapi.common import RiotAPIRateLimiter
+from lissandra.datastores.riotapi.match import MatchAPI
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.transformers import __transformers__ as transformers
+
+from .test_match import RATE_LIMIT_HEADERS, make_match
+
+N_SUMMONERS = 20
+
+
+class FakeHTTPClient(object):
+    """A match graph of 20 summoners and 20 matches: summoner k played in matches k and k + 1, and match j was played by
+    summoners j - 7 to j (mod 20).
+    """
+
+    def __init__(self):
+        self.match_ids = collections.Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.005)
+            return self._get(url)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _get(self, url):
+        if "/summoners/" in url:
+            id = url.rsplit("/", 1)[1]
+            return {"id": id, "puuid": "puuid-" + id.split("-")[1], "name": id}, RATE_LIMIT_HEADERS
+        if url.endswith("/ids"):
+            k = int(url.split("/")[-2].split("-")[1])
+            return ["EUW1_{}".format((k + i) % N_SUMMONERS) for i in range(2)], RATE_LIMIT_HEADERS
+        id = url.rsplit("/", 1)[1]
+        with self._lock:
+            self.match_ids[id] += 1
+        j = int(id.split("_")[1])
+        match = make_match(id)
+        for i, participant in enumerate(match["info"]["participants"]):
+            participant["puuid"] = "puuid-{}".format((j - i) % N_SUMMONERS)
+        match["metadata"]["participants"] = [participant["puuid"] for participant in match["info"]["participants"]]
+        return match, RATE_LIMIT_HEADERS
+
+
+class TestSeenSet(unittest.TestCase):
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(str(i))
+        self.assertTrue(all(str(i) in bloom for i in range(1000)))
+        false_positives = sum(str(i) in bloom for i in range(1000, 11000))
+        self.assertLess(false_positives, 300)
+        self.assertTrue("7" in BloomFilter.from_dict(bloom.to_dict()))
+
+    def test_exact_fallback(self):
+        seen = SeenSet(capacity=10, error_rate=0.5, exact_capacity=100)
+        self.assertTrue(all(seen.add(str(i)) for i in range(50)))
+        self.assertFalse(seen.add("7"))
+        self.assertEqual(len(seen), 50)
+        self.assertTrue(seen.is_exact)
+
+    def test_exact_set_is_dropped(self):
+        seen = SeenSet(capacity=100, exact_capacity=10)
+        for i in range(11):
+            seen.add(str(i))
+        self.assertFalse(seen.is_exact)
+        self.assertIn("3", seen)
+        self.assertIn("3", SeenSet.from_dict(seen.to_dict()))
+
+
+class TestMatchCrawler(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeHTTPClient()
+        app_rate_limiter = {platform: RiotAPIRateLimiter(limiting_share=1.0) for platform in Platform}
+        services = [
+            MatchAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=self.client),
+            SummonerAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=self.client),
+        ]
+        pipeline = CompiledDataPipeline([Cache(), UnloadedGhostStore(), RiotAPI(services=services)], transformers)
+        patcher = patch.object(lissandra.configuration.settings.__class__, "pipeline", pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_crawls_whole_graph_once(self):
+        matches = []
+        crawler = MatchCrawler(matches.append, matches_per_summoner=2, concurrency=3)
+        crawler.add_puuid("puuid-0", "EUW")
+        crawler.crawl()
+        self.assertEqual(sorted(match.id for match in matches), sorted("EUW1_{}".format(j) for j in range(20)))
+        self.assertEqual(set(self.client.match_ids.values()), {1})
+        self.assertEqual((crawler.n_matches, crawler.n_summoners, crawler.n_errors), (20, 20, 0))
+
+    def test_seed_from_ladder(self):
+        crawler = MatchCrawler(max_summoners=1)
+        entries = [{"summonerId": "id-3"}, {"summonerId": "id-5", "region": "EUW"}]
+        crawler.seed(entries, region=Region.europe_west)
+        self.assertEqual(list(crawler._puuids[Region.europe_west]), ["puuid-3", "puuid-5"])
+
+    def test_budget(self):
+        crawler = MatchCrawler(matches_per_summoner=2, max_matches=5)
+        crawler.add_puuid("puuid-0", "EUW")
+        crawler.crawl()
+        self.assertEqual(crawler.n_matches, 5)
+
+    def test_checkpoint_and_resume(self):
+        path = os.path.join(self.directory, "crawl.json")
+        first, second = [], []
+        crawler = MatchCrawler(first.append, matches_per_summoner=2, max_matches=7, checkpoint_path=path)
+        crawler.add_puuid("puuid-0", "EUW")
+        crawler.crawl()
+        self.assertTrue(os.path.exists(path))
+
+        crawler = MatchCrawler.resume(path, second.append, matches_per_summoner=2)
+        self.assertEqual(crawler.n_matches, 7)
+        crawler.crawl()
+        ids = [match.id for match in first + second]
+        self.assertEqual(sorted(ids), sorted("EUW1_{}".format(j) for j in range(20)))
+        self.assertEqual(crawler.n_matches, 20)
+
+    def test_checkpoint_written_outside_lock(self):
+        crawler = MatchCrawler(
+            matches_per_summoner=2, checkpoint_path=os.path.join(self.directory, "crawl.json"), checkpoint_every=5
+        )
+        crawler.add_puuid("puuid-0", "EUW")
+        lock_free = []
+
+        def is_lock_free():
+            if not crawler._lock.acquire(timeout=1.0):
+                return False
+            crawler._lock.release()
+            return True
+
+        def dump(state, fp, json_dump=json.dump):
+            # Another thread could carry on crawling while the checkpoint is written
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                lock_free.append(executor.submit(is_lock_free).result())
+            json_dump(state, fp)
+
+        with patch("lissandra.crawler.json.dump", dump):
+            crawler.crawl()
+        # Every 5 of the 20 matches, and when the crawl stopped
+        self.assertEqual(lock_free, [True] * 5)
+
+    def test_concurrency(self):
+        crawler = MatchCrawler(matches_per_summoner=2, concurrency=2)
+        for j in range(20):
+            crawler.add_match_id("EUW1_{}".format(j), "EUW")
+        crawler.crawl()
+        self.assertEqual(crawler.n_matches, 20)
+        # The matches were fetched in one batch of 20, but only `concurrency` at a time
+        self.assertEqual(self.client.max_in_flight, 2)
+
+    def test_on_match_fails(self):
+        path = os.path.join(self.directory, "crawl.json")
+        matches = []
+
+        def on_match(match):
+            if len(matches) == 5:
+                raise IOError("Disk full")
+            matches.append(match)
+
+        crawler = MatchCrawler(on_match, matches_per_summoner=2, checkpoint_path=path)
+        crawler.add_puuid("puuid-0", "EUW")
+        self.assertRaises(IOError, crawler.crawl)
+        self.assertEqual(crawler.n_matches, 5)
+
+        # The match that failed, and the rest of the crawl, are still queued
+        crawler = MatchCrawler.resume(path, matches.append, matches_per_summoner=2)
+        crawler.crawl()
+        self.assertEqual(sorted(match.id for match in matches), sorted("EUW1_{}".format(j) for j in range(20)))
+        self.assertEqual(crawler.n_matches, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
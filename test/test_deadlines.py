@@ -0,0 +1,187 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from lissandra import Platform, configuration, deadlines
+from lissandra.datastores.common import HTTPClient, HTTPError
+from lissandra.datastores.riotapi.common import APITimeoutError, RiotAPIRateLimiter, window_limiter
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.deadlines import DeadlineExceededError
+from lissandra.dto.summoner import SummonerDto
+
+from benchmarks.endtoend import apply_settings
+from benchmarks.mockserver import MockRiotAPI, ThreadingHTTPServer
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "20:1", "X-Method-Rate-Limit": "5:10"}
+
+
+class TricklingHandler(BaseHTTPRequestHandler):
+    """Sends a JSON response a byte every 50 milliseconds, so no single read takes long but the whole response does."""
+
+    def do_GET(self):
+        body = b'{"name": "Crimack"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for byte in body:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TimingOutHTTPClient(object):
+    """Times out on the first `timeouts` requests."""
+
+    def __init__(self, timeouts):
+        self.timeouts = timeouts
+        self.calls = 0
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with rate_limiters[0], rate_limiters[1]:
+            self.calls += 1
+            if self.calls <= self.timeouts:
+                raise HTTPError("The request timed out", "timeout")
+            return {"id": "id-1", "puuid": "puuid-1", "name": "Crimack"}, RATE_LIMIT_HEADERS
+
+
+def summoner_api(http_client, rate_limiter="fixed_window", **kwargs):
+    app_rate_limiter = {
+        each: RiotAPIRateLimiter(limiting_share=1.0, platform=each, window_limiter=window_limiter(rate_limiter))
+        for each in Platform
+    }
+    return SummonerAPI(
+        "RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=http_client, rate_limiter=rate_limiter, **kwargs
+    )
+
+
+class TestDeadline(unittest.TestCase):
+    def test_nesting(self):
+        self.assertIsNone(deadlines.current())
+        with deadlines.deadline(10.0) as outer:
+            self.assertTrue(9 < deadlines.remaining() <= 10)
+            with deadlines.deadline(1.0) as inner:
+                self.assertLess(inner, outer)
+                # An inner deadline can't extend an outer one
+                with deadlines.deadline(100.0) as innermost:
+                    self.assertEqual(innermost, inner)
+            self.assertEqual(deadlines.current(), outer)
+        self.assertIsNone(deadlines.current())
+
+    def test_check_and_sleep(self):
+        deadlines.check("nothing")
+        with deadlines.deadline(0.1):
+            self.assertRaises(DeadlineExceededError, deadlines.sleep, 1.0, "a long wait")
+            deadlines.sleep(0.05, "a short wait")
+            time.sleep(0.06)
+            self.assertRaises(DeadlineExceededError, deadlines.check, "something else")
+
+    def test_propagate(self):
+        seen = []
+        with deadlines.deadline(10.0) as at:
+            thread = threading.Thread(target=deadlines.propagate(lambda: seen.append(deadlines.current())))
+        thread.start()
+        thread.join()
+        self.assertEqual(seen, [at])
+
+
+class TestRateLimiterDeadline(unittest.TestCase):
+    def check_limiter(self, rate_limiter):
+        limiter = RiotAPIRateLimiter(1.0, window_limiter=window_limiter(rate_limiter))
+        limiter.adjust_rate_limits_if_necessary([[100, 600], [1, 10]])
+        with limiter:
+            pass
+        start = time.monotonic()
+        with deadlines.deadline(0.1):
+            self.assertRaises(DeadlineExceededError, limiter.__enter__)
+        self.assertLess(time.monotonic() - start, 0.5)
+        return limiter
+
+    def test_fixed_window(self):
+        limiter = self.check_limiter("fixed_window")
+        # The long window was exited when the short one couldn't be entered, so it doesn't count a request in progress
+        self.assertEqual(limiter[0]._currently_processing, 0)
+
+    def test_gcra(self):
+        self.check_limiter("gcra")
+
+
+class TestRequestDeadline(unittest.TestCase):
+    def test_timeout_handling(self):
+        api = summoner_api(TimingOutHTTPClient(timeouts=1))
+        self.assertRaises(APITimeoutError, api.get, SummonerDto, {"name": "Crimack", "platform": Platform.korea})
+
+        retry = {"strategy": "exponential_backoff", "initial_backoff": 0.0, "backoff_factor": 1.0, "max_attempts": 2}
+        api = summoner_api(TimingOutHTTPClient(timeouts=2), request_error_handling={"timeout": retry})
+        self.assertEqual(api.get(SummonerDto, {"name": "Crimack", "platform": Platform.korea})["name"], "Crimack")
+
+    def test_backoff_past_deadline(self):
+        retry = {"strategy": "exponential_backoff", "initial_backoff": 5.0, "backoff_factor": 1.0, "max_attempts": 2}
+        api = summoner_api(TimingOutHTTPClient(timeouts=1), request_error_handling={"timeout": retry})
+        start = time.monotonic()
+        with deadlines.deadline(1.0):
+            self.assertRaises(
+                DeadlineExceededError, api.get, SummonerDto, {"name": "Crimack", "platform": Platform.korea}
+            )
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_mock_server(self):
+        with MockRiotAPI() as server, server.redirect():
+            client = HTTPClient()
+            api = summoner_api(client)
+            query = {"name": "Crimack", "platform": Platform.europe_west}
+            api.get(SummonerDto, query)
+
+            server.latency = 0.5
+            start = time.monotonic()
+            with deadlines.deadline(0.1):
+                self.assertRaises(DeadlineExceededError, api.get, SummonerDto, dict(query, name="Kalturi"))
+            self.assertLess(time.monotonic() - start, 0.4)
+
+            # Without a deadline, the client's own read timeout is an HTTP error for the "timeout" handler
+            client.read_timeout = 0.1
+            self.assertRaises(APITimeoutError, api.get, SummonerDto, dict(query, name="Kalturi"))
+
+    def test_trickling_response(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), TricklingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = "http://127.0.0.1:{}/".format(server.server_address[1])
+
+        start = time.monotonic()
+        with deadlines.deadline(0.3):
+            self.assertRaises(DeadlineExceededError, HTTPClient().get, url)
+        self.assertLess(time.monotonic() - start, 0.6)
+        # Without a deadline the whole response is read
+        self.assertEqual(HTTPClient().get(url)[0], {"name": "Crimack"})
+        # A read timeout while the body is read is a timeout like any other, for the "timeout" error handler
+        client = HTTPClient()
+        client.read_timeout = 0.02
+        with self.assertRaises(HTTPError) as context:
+            client.get(url)
+        self.assertEqual(context.exception.code, "timeout")
+        with deadlines.deadline(5.0):
+            self.assertEqual(HTTPClient().get(url)[0], {"name": "Crimack"})
+
+    def test_pipeline(self):
+        with MockRiotAPI(latency=0.5) as server, server.redirect():
+            apply_settings()
+            query = {"name": "Crimack", "platform": Platform.europe_west}
+            start = time.monotonic()
+            self.assertRaises(
+                DeadlineExceededError, configuration.settings.pipeline.get, SummonerDto, query, deadline=start + 0.1
+            )
+            self.assertLess(time.monotonic() - start, 0.4)
+            self.assertIsNone(deadlines.current())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import lissandra
+from lissandra import Division, Tier
+from lissandra.dto.league import LeagueEntriesDto
+from lissandra.export import export_league_entries, iter_league_entries
+
+PAGE_SIZE = 3
+N_ENTRIES = 8
+
+
+def make_entry(i: int) -> dict:
+    entry = {
+        "leagueId": "league-id",
+        "queueType": "RANKED_TFT",
+        "tier": "GOLD",
+        "rank": "I",
+        "summonerId": "summoner-{}".format(i),
+        "summonerName": "Summoner {}".format(i),
+        "leaguePoints": i,
+        "wins": 10,
+        "losses": 5,
+        "hotStreak": False,
+        "veteran": False,
+        "freshBlood": True,
+        "inactive": False,
+        "region": "EUW",
+    }
+    if i == 0:
+        entry["miniSeries"] = {"target": 3, "wins": 1, "losses": 0, "progress": "WNN"}
+    return entry
+
+
+def get_page(type, query):
+    page = query["page"]
+    entries = [make_entry(i) for i in range((page - 1) * PAGE_SIZE, min(page * PAGE_SIZE, N_ENTRIES))]
+    return LeagueEntriesDto(entries=entries, page=page, region="EUW", tier="GOLD", division="I")
+
+
+class TestLeagueExport(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = MagicMock()
+        self.pipeline.get.side_effect = get_page
+        patcher = patch.object(lissandra.configuration.settings.__class__, "pipeline", self.pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages_are_requested_lazily(self):
+        entries = iter_league_entries(Tier.gold, Division.one, region="EUW")
+        self.assertEqual(next(entries)["summonerId"], "summoner-0")
+        self.assertEqual(self.pipeline.get.call_count, 1)
+        self.assertEqual(len(list(entries)), N_ENTRIES - 1)
+        # The last page is short, so there's no need to ask for another
+        self.assertEqual(self.pipeline.get.call_count, 3)
+        _, kwargs = self.pipeline.get.call_args
+        self.assertEqual(kwargs["query"], {"region": "EUW", "tier": Tier.gold, "division": Division.one, "page": 3})
+
+    def test_ndjson(self):
+        fp = io.BytesIO()
+        self.assertEqual(export_league_entries(fp, "GOLD", "I", region="EUW"), N_ENTRIES)
+        rows = [json.loads(line) for line in fp.getvalue().splitlines()]
+        self.assertEqual(rows, [make_entry(i) for i in range(N_ENTRIES)])
+
+    def test_csv(self):
+        fp = io.BytesIO()
+        self.assertEqual(export_league_entries(fp, Tier.gold, Division.one, region="EUW", format="csv"), N_ENTRIES)
+        self.assertFalse(fp.closed)
+        rows = list(csv.DictReader(io.StringIO(fp.getvalue().decode("utf-8"))))
+        self.assertEqual([row["summonerName"] for row in rows], ["Summoner {}".format(i) for i in range(N_ENTRIES)])
+        self.assertEqual(rows[0]["miniSeries.progress"], "WNN")
+        self.assertEqual(rows[1]["miniSeries.progress"], "")
+
+    def test_gzip_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "gold-i.ndjson.gz")
+            export_league_entries(path, Tier.gold, Division.one, region="EUW")
+            with gzip.open(path) as fp:
+                self.assertEqual(len(fp.read().splitlines()), N_ENTRIES)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, export_league_entries, io.BytesIO(), Tier.gold, Division.one, format="xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
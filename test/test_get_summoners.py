@@ -0,0 +1,124 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from datapipelines import NotFoundError
+
+import lissandra
+from lissandra import Platform, Summoner
+from lissandra.core.summoner import SummonerData
+from lissandra._configuration.pipeline import CompiledDataPipeline
+from lissandra.datastores import Cache, RiotAPI, UnloadedGhostStore
+from lissandra.datastores.common import HTTPError
+from lissandra.datastores.riotapi.common import RiotAPIRateLimiter
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.transformers import __transformers__ as transformers
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "100:1", "X-Method-Rate-Limit": "100:1"}
+
+
+class FakeHTTPClient(object):
+    """Answers summoner-v1 requests by summoner id, with a 404 for ids starting with "missing"."""
+
+    def __init__(self):
+        self.ids = []
+        self._lock = threading.Lock()
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        if isinstance(url, bytes):
+            url = url.decode("utf-8")
+        id = url.rsplit("/", 1)[1]
+        with self._lock:
+            self.ids.append(id)
+        if id.startswith("missing"):
+            raise HTTPError("Not found", 404, {})
+        if id.startswith("broken"):
+            raise HTTPError("Forbidden", 403, {})
+        data = {
+            "id": id,
+            "accountId": "account-" + id,
+            "puuid": "puuid-" + id,
+            "name": "Name " + id,
+            "summonerLevel": 30,
+        }
+        return data, RATE_LIMIT_HEADERS
+
+
+class TestGetSummoners(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeHTTPClient()
+        app_rate_limiter = {platform: RiotAPIRateLimiter(limiting_share=1.0) for platform in Platform}
+        summoner_api = SummonerAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=self.client)
+        pipeline = CompiledDataPipeline([Cache(), RiotAPI(services=[summoner_api])], transformers)
+        patcher = patch.object(lissandra.configuration.settings.__class__, "pipeline", pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_results_are_in_input_order(self):
+        ids = ["id-{}".format(i) for i in range(25)]
+        summoners = lissandra.get_summoners(ids=ids, region="EUW")
+        self.assertEqual([summoner.name for summoner in summoners], ["Name " + id for id in ids])
+        self.assertEqual(sorted(self.client.ids), sorted(ids))
+
+    def test_duplicates_are_loaded_once(self):
+        summoners = lissandra.get_summoners(ids=["a", "b", "a"], region="EUW")
+        self.assertEqual([summoner.id for summoner in summoners], ["a", "b", "a"])
+        self.assertEqual(sorted(self.client.ids), ["a", "b"])
+
+    def test_only_misses_are_requested(self):
+        lissandra.get_summoners(ids=["a", "b"], region="EUW")
+        summoners = lissandra.get_summoners(ids=["c", "a", "b"], region="EUW")
+        self.assertEqual([summoner.id for summoner in summoners], ["c", "a", "b"])
+        self.assertEqual(sorted(self.client.ids), ["a", "b", "c"])
+
+    def test_per_item_errors(self):
+        summoners = lissandra.get_summoners(ids=["a", "missing", "broken"], region="EUW")
+        self.assertEqual(summoners[0].id, "a")
+        self.assertIsInstance(summoners[1], NotFoundError)
+        self.assertIsInstance(summoners[2], Exception)
+        self.assertNotIsInstance(summoners[2], NotFoundError)
+
+    def test_all_missing(self):
+        summoners = lissandra.get_summoners(names=["missing-1", "missing-2"], region="EUW")
+        self.assertTrue(all(isinstance(summoner, NotFoundError) for summoner in summoners))
+
+    def test_exactly_one_identifier_type(self):
+        self.assertRaises(ValueError, lissandra.get_summoners, region="EUW")
+        self.assertRaises(ValueError, lissandra.get_summoners, ids=["a"], names=["b"], region="EUW")
+        self.assertEqual(lissandra.get_summoners(ids=[], region="EUW"), [])
+
+
+class TestSummonerIdentities(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeHTTPClient()
+        app_rate_limiter = {platform: RiotAPIRateLimiter(limiting_share=1.0) for platform in Platform}
+        summoner_api = SummonerAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=self.client)
+        self.cache = Cache()
+        pipeline = CompiledDataPipeline(
+            [self.cache, UnloadedGhostStore(), RiotAPI(services=[summoner_api])], transformers
+        )
+        patcher = patch.object(lissandra.configuration.settings.__class__, "pipeline", pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_loaded_summoner_is_found_by_every_identifier(self):
+        self.assertEqual(Summoner(id="abc", region="EUW").level, 30)
+        for summoner in (
+            Summoner(name="Name Abc", region="EUW"),
+            Summoner(puuid="puuid-abc", region="EUW"),
+            Summoner(account_id="account-abc", region="EUW"),
+            Summoner(name="nameabc", region="EUW"),
+        ):
+            self.assertEqual(summoner.level, 30)
+        self.assertEqual(self.client.ids, ["abc"])
+
+    def test_renamed_summoner_is_not_found_by_old_name(self):
+        self.cache.put(SummonerData, SummonerData(id="abc", name="Old Name", region="EUW"))
+        self.assertEqual(self.cache.get(Summoner, {"name": "oldname", "region": "EUW"}).id, "abc")
+        self.cache.put(SummonerData, SummonerData(id="abc", name="New Name", region="EUW"))
+        self.assertRaises(NotFoundError, self.cache.get, Summoner, {"name": "Old Name", "region": "EUW"})
+        self.assertEqual(self.cache.get(Summoner, {"id": "abc", "region": "EUW"}).name, "New Name")
+
+
+if __name__ == "__main__":
+    unittest.main()
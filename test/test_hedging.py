@@ -0,0 +1,143 @@
+import threading
+import time
+import unittest
+
+import lissandra
+from lissandra import Platform
+from lissandra.datastores.riotapi.common import HedgingPolicy, RiotAPIRateLimiter
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.dto.summoner import SummonerDto
+from lissandra.metrics import REGISTRY
+
+from benchmarks.endtoend import apply_settings
+from benchmarks.mockserver import MockRiotAPI
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "1000:1", "X-Method-Rate-Limit": "1000:1"}
+HEDGING = {"min_samples": 5, "min_delay": 0.05, "max_share": 1.0}
+
+
+class SlowHTTPClient(object):
+    """Takes `slow` seconds to answer the requests numbered in `slow_calls`, and `fast` seconds otherwise."""
+
+    def __init__(self, slow_calls, slow=2.0, fast=0.01, headers=RATE_LIMIT_HEADERS):
+        self.slow_calls = set(slow_calls)
+        self.slow = slow
+        self.fast = fast
+        self.headers = headers
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with rate_limiters[0], rate_limiters[1]:
+            with self._lock:
+                self.calls += 1
+                call = self.calls
+            time.sleep(self.slow if call in self.slow_calls else self.fast)
+            return {"id": "id-{}".format(call), "puuid": "puuid", "name": "Crimack"}, self.headers
+
+
+def summoner_api(http_client, **kwargs):
+    app_rate_limiter = {each: RiotAPIRateLimiter(limiting_share=1.0, platform=each) for each in Platform}
+    return SummonerAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=http_client, **kwargs)
+
+
+def hedged(platform, result):
+    labels = {"platform": platform.value, "endpoint": "summoners/by-name/name", "result": result}
+    return REGISTRY.get_sample_value("lissandra_hedged_requests_total", labels) or 0
+
+
+class TestHedgingPolicy(unittest.TestCase):
+    def test_delay(self):
+        policy = HedgingPolicy(quantile=0.9, min_delay=0.01, min_samples=10)
+        for i in range(9):
+            policy.observe("KR", "summoners/by-name/name", (i + 1) / 10)
+        self.assertIsNone(policy.delay("KR", "summoners/by-name/name"))
+        policy.observe("KR", "summoners/by-name/name", 1.0)
+        self.assertEqual(policy.delay("KR", "summoners/by-name/name"), 1.0)
+        self.assertIsNone(policy.delay("EUW1", "summoners/by-name/name"))
+
+    def test_budget(self):
+        policy = HedgingPolicy(max_share=0.25, max_burst=1.0)
+        for _ in range(3):
+            policy.earn()
+        self.assertFalse(policy.spend())
+        for _ in range(10):
+            policy.earn()
+        self.assertTrue(policy.spend())
+        self.assertFalse(policy.spend())
+
+
+class TestHedgedRequests(unittest.TestCase):
+    def warm_up(self, api, platform):
+        for i in range(HEDGING["min_samples"]):
+            api.get(SummonerDto, {"name": "warm-up-{}".format(i), "platform": platform})
+
+    def test_hedge_wins(self):
+        platform = Platform.korea
+        client = SlowHTTPClient(slow_calls=[6])
+        api = summoner_api(client, hedging=HEDGING)
+        self.warm_up(api, platform)
+        won = hedged(platform, "won")
+        start = time.monotonic()
+        summoner = api.get(SummonerDto, {"name": "Crimack", "platform": platform})
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(summoner["id"], "id-7")  # The hedge's answer
+        self.assertEqual(hedged(platform, "won"), won + 1)
+        self.assertEqual(client.calls, 7)
+
+    def test_hedge_loses(self):
+        platform = Platform.japan
+        client = SlowHTTPClient(slow_calls=[6, 7], slow=0.3)
+        api = summoner_api(client, hedging=HEDGING)
+        self.warm_up(api, platform)
+        lost = hedged(platform, "lost")
+        self.assertEqual(api.get(SummonerDto, {"name": "Crimack", "platform": platform})["id"], "id-6")
+        self.assertEqual(hedged(platform, "lost"), lost + 1)
+
+    def test_not_hedged(self):
+        # Hedging is opt in
+        platform = Platform.brazil
+        client = SlowHTTPClient(slow_calls=[6], slow=0.3)
+        api = summoner_api(client)
+        self.warm_up(api, platform)
+        self.assertEqual(api.get(SummonerDto, {"name": "Crimack", "platform": platform})["id"], "id-6")
+        self.assertEqual(client.calls, 6)
+
+        # Out of budget
+        platform = Platform.north_america
+        client = SlowHTTPClient(slow_calls=[6], slow=0.3)
+        api = summoner_api(client, hedging=dict(HEDGING, max_share=0.0))
+        self.warm_up(api, platform)
+        over_budget = hedged(platform, "over_budget")
+        self.assertEqual(api.get(SummonerDto, {"name": "Crimack", "platform": platform})["id"], "id-6")
+        self.assertEqual(hedged(platform, "over_budget"), over_budget + 1)
+        self.assertEqual(client.calls, 6)
+
+    def test_rate_limited(self):
+        platform = Platform.oceania
+        # The method limit allows the warm up calls (after the first, which tells us the limit) and the request, but
+        # not its hedge
+        headers = {"X-App-Rate-Limit": "1000:1", "X-Method-Rate-Limit": "5:10"}
+        client = SlowHTTPClient(slow_calls=[6], slow=0.3, headers=headers)
+        api = summoner_api(client, hedging=HEDGING)
+        self.warm_up(api, platform)
+        rate_limited = hedged(platform, "rate_limited")
+        self.assertEqual(api.get(SummonerDto, {"name": "Crimack", "platform": platform})["id"], "id-6")
+        self.assertEqual(hedged(platform, "rate_limited"), rate_limited + 1)
+        self.assertEqual(client.calls, 6)
+
+
+class TestMockServerHedging(unittest.TestCase):
+    def test_tail_latency(self):
+        with MockRiotAPI(latency=0.01, slow_rate=0.1, slow_latency=1.0, seed=0) as server, server.redirect():
+            apply_settings(hedging={"min_samples": 10, "max_share": 0.2})
+            start = time.monotonic()
+            for i in range(40):
+                lissandra.get_summoner(name="summoner-{}".format(i), region="EUW").level
+            # Without hedging, the slow responses alone would take about 4 seconds
+            self.assertLess(time.monotonic() - start, 3.5)
+            self.assertGreater(hedged(Platform.europe_west, "won"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Modules that shouldn't be loaded until the pipeline is actually used
+HEAVY_MODULES = [
+    "PIL",
+    "arrow",
+    "requests",
+    "pycurl",
+    "datapipelines",
+    "lissandra.datastores",
+    "lissandra.transformers",
+]
+
+# Generous upper bound for `import lissandra` (in seconds), so that this only fails if import gets eager again
+IMPORT_TIME_BUDGET = float(os.environ.get("LISSANDRA_IMPORT_TIME_BUDGET", 1.0))
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import lissandra
+elapsed = time.perf_counter() - start
+sys.stderr.write(json.dumps({"elapsed": elapsed, "modules": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _import_lissandra():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.run(
+        [sys.executable, "-c", _SCRIPT % HEAVY_MODULES],
+        cwd=root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    return process.stdout, json.loads(process.stderr.decode().strip().splitlines()[-1])
+
+
+class TestImport(unittest.TestCase):
+    def test_import_has_no_output(self):
+        stdout, _ = _import_lissandra()
+        self.assertEqual(stdout, b"")
+
+    def test_import_is_lazy(self):
+        _, result = _import_lissandra()
+        self.assertEqual(result["modules"], [])
+
+    def test_import_time(self):
+        elapsed = min(_import_lissandra()[1]["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from datapipelines import NotFoundError
+
+import lissandra
+from lissandra import MatchHistory, Platform, Queue, Region
+from lissandra.core.match import MatchData
+from lissandra._configuration.pipeline import CompiledDataPipeline
+from lissandra.data import RoutingRegion
+from lissandra.datastores import Cache, RiotAPI, UnloadedGhostStore
+from lissandra.datastores.common import HTTPError
+from lissandra.datastores.riotapi.common import RiotAPIRateLimiter
+from lissandra.datastores.riotapi.match import MatchAPI
+from lissandra.transformers import __transformers__ as transformers
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "100:1", "X-Method-Rate-Limit": "100:1"}
+
+
+def make_match(id):
+    participants = [
+        {
+            "puuid": "puuid-{}".format(placement),
+            "placement": placement,
+            "level": 9 - placement,
+            "gold_left": 3,
+            "last_round": 30,
+            "players_eliminated": 1,
+            "time_eliminated": 1800.5,
+            "total_damage_to_players": 100,
+            "companion": {"content_ID": "content", "skin_ID": 1, "species": "PetTFT"},
+            "traits": [{"name": "Set3_Blaster", "num_units": 2, "style": 1, "tier_current": 1, "tier_total": 3}],
+            "units": [{"character_id": "TFT3_Ezreal", "items": [1, 2], "name": "", "rarity": 2, "tier": 2}],
+        }
+        for placement in range(1, 9)
+    ]
+    return {
+        "metadata": {
+            "data_version": "5",
+            "match_id": id,
+            "participants": [participant["puuid"] for participant in participants],
+        },
+        "info": {
+            "game_datetime": 1590000000000,
+            "game_length": 2000.5,
+            "game_version": "Version 10.10",
+            "queue_id": 1100,
+            "tft_set_number": 3,
+            "participants": participants,
+        },
+    }
+
+
+class FakeHTTPClient(object):
+    """Answers tft/match/v1 requests, with a 404 for match ids ending in "missing"."""
+
+    def __init__(self):
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with self._lock:
+            self.urls.append(url)
+        if url.endswith("/ids"):
+            return ["EUW1_{}".format(i) for i in range(parameters["count"])], RATE_LIMIT_HEADERS
+        id = url.rsplit("/", 1)[1]
+        if id.endswith("missing"):
+            raise HTTPError("Not found", 404, {})
+        return make_match(id), RATE_LIMIT_HEADERS
+
+
+class TestMatch(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeHTTPClient()
+        app_rate_limiter = {platform: RiotAPIRateLimiter(limiting_share=1.0) for platform in Platform}
+        self.match_api = MatchAPI("RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=self.client)
+        pipeline = CompiledDataPipeline(
+            [Cache(), UnloadedGhostStore(), RiotAPI(services=[self.match_api])], transformers
+        )
+        patcher = patch.object(lissandra.configuration.settings.__class__, "pipeline", pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_region_from_id(self):
+        match = lissandra.get_match("NA1_1")
+        self.assertEqual(match.region, Region.north_america)
+        self.assertEqual(self.client.urls, [])
+
+    def test_load(self):
+        match = lissandra.get_match("EUW1_1")
+        self.assertEqual(match.queue, Queue.ranked_tft)
+        self.assertEqual(match.set_number, 3)
+        self.assertEqual(self.client.urls, ["https://europe.api.riotgames.com/tft/match/v1/matches/EUW1_1"])
+        self.assertIsInstance(match._data[MatchData].participant_dtos[0], dict)
+        participants = match.participants
+        self.assertEqual([participant.placement for participant in participants], list(range(1, 9)))
+        self.assertEqual(participants[0].traits[0].name, "Set3_Blaster")
+        self.assertEqual(participants[0].units[0].items, [1, 2])
+        self.assertEqual(participants[0].companion.skin_id, 1)
+        self.assertEqual(participants[0].summoner.puuid, "puuid-1")
+        self.assertIs(match.participants, participants)
+
+    def test_routing_region_rate_limiters(self):
+        lissandra.get_match("EUW1_1").load()
+        lissandra.get_match("EUN1_2").load()
+        self.assertIn((RoutingRegion.europe, "matches/matchId"), self.match_api._rate_limiters)
+        self.assertIn(RoutingRegion.europe, self.match_api._rate_limiters["application"])
+
+    def test_get_matches(self):
+        ids = ["EUW1_{}".format(i) for i in range(15)]
+        lissandra.get_match("EUW1_3").load()
+        matches = lissandra.get_matches(ids + ["EUW1_missing", "EUW1_0"])
+        self.assertEqual([match.id for match in matches[:15]], ids)
+        self.assertIsInstance(matches[15], NotFoundError)
+        self.assertEqual(matches[16].id, "EUW1_0")
+        self.assertEqual(len(self.client.urls), 16)
+
+    def test_match_history(self):
+        history = lissandra.get_match_history(puuid="puuid-1", count=5, region="EUW")
+        self.assertIsInstance(history, MatchHistory)
+        self.assertEqual([match.id for match in history], ["EUW1_{}".format(i) for i in range(5)])
+        self.assertEqual(
+            self.client.urls, ["https://europe.api.riotgames.com/tft/match/v1/matches/by-puuid/puuid-1/ids"]
+        )
+        self.assertEqual(history[0].version, "Version 10.10")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from lissandra import Match, Queue
+from lissandra.core.match import MatchData
+
+from .test_match import make_match
+
+if numpy is not None:
+    from lissandra.export.matchstore import MatchStore, N_PLACEMENTS
+
+
+def make_matches(n):
+    matches = []
+    for i in range(n):
+        match = make_match("EUW1_{}".format(i))
+        match["region"] = "EUW"
+        # The winner of every other match also has a second, inactive trait
+        if i % 2 == 0:
+            match["info"]["participants"][0]["traits"].append(
+                {"name": "Set3_Rebel", "num_units": 1, "style": 0, "tier_current": 0, "tier_total": 3}
+            )
+        matches.append(match)
+    return matches
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestMatchStore(unittest.TestCase):
+    def setUp(self):
+        self.store = MatchStore()
+        self.store.extend(make_matches(10))
+
+    def test_records(self):
+        self.assertEqual(len(self.store), 10)
+        self.assertEqual(len(self.store.participants), 10 * N_PLACEMENTS)
+        self.assertEqual(self.store.traits.values, [None, "Set3_Blaster", "Set3_Rebel"])
+        self.assertEqual(list(self.store.participants["n_traits"][:2]), [2, 1])
+
+    def test_grows(self):
+        store = MatchStore()
+        store.extend(make_matches(1100))
+        self.assertEqual(len(store), 1100)
+        self.assertEqual(store[1099].id, "EUW1_1099")
+
+    def test_round_trip(self):
+        match = self.store[2]
+        self.assertIsInstance(match, Match)
+        self.assertEqual(match.id, "EUW1_2")
+        self.assertEqual(match.queue, Queue.ranked_tft)
+        participant = match.participants[0]
+        self.assertEqual([trait.name for trait in participant.traits], ["Set3_Blaster", "Set3_Rebel"])
+        self.assertEqual(participant.units[0].items, [1, 2])
+        self.assertEqual(participant.companion.species, "PetTFT")
+        expected = MatchData(**make_matches(3)[2]).participant_dtos
+        for unit in (unit for participant in expected for unit in participant["units"]):
+            del unit["name"]  # Always empty, so not stored
+        self.assertEqual(self.store.match_data(2).participant_dtos, expected)
+        self.assertEqual(self.store.participant(16).placement, 1)
+
+    def test_trait_frequency_by_placement(self):
+        frequency = self.store.trait_frequency_by_placement()
+        self.assertEqual(frequency.shape, (3, N_PLACEMENTS))
+        self.assertEqual(list(frequency[1]), [10] * N_PLACEMENTS)
+        self.assertEqual(frequency[2].sum(), 0)
+        self.assertEqual(list(self.store.trait_frequency_by_placement(min_tier=0)[2]), [5, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(list(self.store.average_placement(frequency)[1:2]), [4.5])
+
+    def test_too_many_traits(self):
+        store = MatchStore(max_traits=1)
+        self.assertRaises(ValueError, store.add, make_matches(1)[0])
+        self.assertEqual(len(store), 0)
+
+    def test_save_and_load(self):
+        fp = io.BytesIO()
+        self.store.save(fp)
+        fp.seek(0)
+        loaded = MatchStore.load(fp)
+        self.assertEqual(len(loaded), 10)
+        self.assertEqual(loaded.match_data(4).to_dict(), self.store.match_data(4).to_dict())
+        loaded.add(make_matches(1)[0])
+        self.assertEqual(len(loaded), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import logging
+import unittest
+
+from lissandra import Platform
+from lissandra.datastores.common import HTTPError
+from lissandra.datastores.riotapi.common import RiotAPIRateLimiter
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.dto.summoner import SummonerDto
+from lissandra.metrics import REGISTRY, MetricsRegistry
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "100:1", "X-Method-Rate-Limit": "100:1", "Content-Length": "42"}
+NO_BACKOFF = {"strategy": "exponential_backoff", "initial_backoff": 0.0, "backoff_factor": 1.0, "max_attempts": 2}
+
+
+class FlakyHTTPClient(object):
+    """Fails the first request with a 504."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with rate_limiters[0], rate_limiters[1]:
+            self.calls += 1
+            if self.calls == 1:
+                raise HTTPError("Gateway timeout", 504, {})
+            return {"id": "id-1", "puuid": "puuid-1", "name": "Crimack"}, RATE_LIMIT_HEADERS
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("platform",))
+        latency = registry.histogram("latency_seconds", "Latency.", ("platform",), buckets=(0.1, 1.0))
+        requests.inc(platform="EUW1")
+        requests.inc(2, platform='say "hi"')
+        latency.observe(0.5, platform="EUW1")
+        self.assertEqual(
+            registry.to_prometheus().splitlines(),
+            [
+                "# HELP requests_total Requests.",
+                "# TYPE requests_total counter",
+                'requests_total{platform="EUW1"} 1',
+                'requests_total{platform="say \\"hi\\""} 2',
+                "# HELP latency_seconds Latency.",
+                "# TYPE latency_seconds histogram",
+                'latency_seconds_bucket{platform="EUW1",le="0.1"} 0',
+                'latency_seconds_bucket{platform="EUW1",le="1"} 1',
+                'latency_seconds_bucket{platform="EUW1",le="+Inf"} 1',
+                'latency_seconds_count{platform="EUW1"} 1',
+                'latency_seconds_sum{platform="EUW1"} 0.5',
+            ],
+        )
+        self.assertEqual(registry.get_sample_value("latency_seconds_count", {"platform": "EUW1"}), 1)
+        self.assertRaises(ValueError, requests.inc, region="EUW")
+        self.assertRaises(ValueError, registry.counter, "requests_total", "Again.")
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def test_request_and_retry(self):
+        platform = Platform.korea
+        app_rate_limiter = {each: RiotAPIRateLimiter(limiting_share=1.0, platform=each) for each in Platform}
+        api = SummonerAPI(
+            "RGAPI-test",
+            app_rate_limiter=app_rate_limiter,
+            request_error_handling={"504": NO_BACKOFF},
+            http_client=FlakyHTTPClient(),
+        )
+        labels = {"platform": "KR", "endpoint": "summoners/by-name/name"}
+
+        def value(name, **extra):
+            return REGISTRY.get_sample_value(name, dict(labels, **extra)) or 0
+
+        before = {
+            "ok": value("lissandra_requests_total", status="200"),
+            "timeout": value("lissandra_requests_total", status="504"),
+            "retries": value("lissandra_retries_total", reason="504"),
+            "bytes": value("lissandra_response_bytes_total"),
+        }
+        with self.assertLogs("datastores.riotapi", logging.DEBUG) as logs:
+            summoner = api.get(SummonerDto, {"name": "Crimack", "platform": platform})
+        self.assertEqual(summoner["puuid"], "puuid-1")
+
+        self.assertEqual(value("lissandra_requests_total", status="200") - before["ok"], 1)
+        self.assertEqual(value("lissandra_requests_total", status="504") - before["timeout"], 1)
+        self.assertEqual(value("lissandra_retries_total", reason="504") - before["retries"], 1)
+        self.assertEqual(value("lissandra_response_bytes_total") - before["bytes"], 42)
+        self.assertGreaterEqual(
+            REGISTRY.get_sample_value(
+                "lissandra_rate_limiter_wait_seconds_count", {"platform": "KR", "limiter": "application"}
+            ),
+            2,
+        )
+        self.assertIn("lissandra_request_duration_seconds_bucket", REGISTRY.to_prometheus())
+
+        attempts = [record for record in logs.records if hasattr(record, "status")]
+        self.assertEqual([record.status for record in attempts], [504, 504, 200])
+        self.assertEqual([record.levelname for record in attempts], ["DEBUG", "WARNING", "DEBUG"])
+        self.assertEqual(attempts[-1].endpoint, "summoners/by-name/name")
+        self.assertEqual(attempts[-1].retry, "504")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import lissandra
+from lissandra import Tier, Division
+
+from benchmarks.endtoend import apply_settings
+from benchmarks.mockserver import MockRiotAPI
+
+SUMMONER_URL = "/euw1.api.riotgames.com/tft/summoner/v1/summoners/by-name/Crimack"
+
+
+class TestMockRiotAPI(unittest.TestCase):
+    def test_rate_limits(self):
+        server = MockRiotAPI(app_rate_limit="2:10", method_rate_limit="100:10")
+        for _ in range(2):
+            status, headers, _ = server.handle(SUMMONER_URL)
+            self.assertEqual(status, 200)
+        self.assertEqual(headers["X-App-Rate-Limit-Count"], "2:10")
+        status, headers, _ = server.handle(SUMMONER_URL)
+        self.assertEqual(status, 429)
+        self.assertEqual(headers["X-Rate-Limit-Type"], "application")
+        self.assertEqual(headers["Retry-After"], "10")
+        self.assertEqual(server.max_rate_limit_utilisation, 1.0)
+
+    def test_injected_errors(self):
+        server = MockRiotAPI(error_5xx_rate=1.0, error_5xx_status=500)
+        self.assertEqual(server.handle(SUMMONER_URL)[0], 500)
+        self.assertEqual(server.handle("/ddragon.leagueoflegends.com/api/versions.json")[0], 200)
+
+    def test_end_to_end(self):
+        with MockRiotAPI(league_page_size=10, league_pages=2) as server, server.redirect():
+            apply_settings()
+            summoner = lissandra.get_summoner(name="Crimack", region="EUW")
+            self.assertEqual(summoner.puuid, "puuid-crimack")
+            self.assertEqual(len(lissandra.get_paginated_league_entries(Tier.gold, Division.two, region="EUW")), 20)
+            self.assertEqual(len(lissandra.get_challenger_league(region="EUW").entries), 300)
+            self.assertEqual(lissandra.get_status(region="EUW").name, "Mock EUW1")
+            self.assertEqual(len(lissandra.get_profile_icons(region="EUW")), 1000)
+            self.assertEqual(len(lissandra.get_match("EUW1_1").participants), 8)
+        self.assertEqual(server.requests["league-entries"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+import unittest
+from typing import Any, Iterable, Mapping, Type, TypeVar
+
+from datapipelines import DataSource, DataSink, DataTransformer, NotFoundError, PipelineContext
+from datapipelines.pipelines import NoConversionError
+
+from lissandra import Region
+from lissandra._configuration.pipeline import CompiledDataPipeline
+from lissandra.core.summoner import Summoner, SummonerData
+from lissandra.datastores import Cache
+from lissandra.datastores.util import PartialNotFoundError, restrict_many_query
+
+T = TypeVar("T")
+
+
+class Dto(dict):
+    pass
+
+
+class Core(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class Source(DataSource):
+    def __init__(self, results: Mapping[str, Any] = None):
+        self.results = results or {}
+        self.queries = []
+
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    @get.register(Dto)
+    def get_dto(self, query: Mapping[str, Any], context: PipelineContext = None) -> Dto:
+        self.queries.append(query)
+        query["touched"] = True
+        try:
+            return Dto(value=self.results[query["key"]])
+        except KeyError:
+            raise NotFoundError()
+
+
+class ManySource(Source):
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    @get_many.register(Dto)
+    def get_many_dto(self, query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[Dto]:
+        self.queries.append(query)
+        results = [Dto(value=self.results[key]) if key in self.results else None for key in query["keys"]]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if not missing:
+            return iter(results)
+        if len(missing) == len(results):
+            raise NotFoundError()
+        raise PartialNotFoundError(results, missing, restrict_many_query(query, missing, len(results)))
+
+
+class Sink(DataSink):
+    def __init__(self):
+        self.items = []
+
+    @DataSink.dispatch
+    def put(self, type: Type[T], item: T, context: PipelineContext = None) -> None:
+        pass
+
+    @DataSink.dispatch
+    def put_many(self, type: Type[T], items: Iterable[T], context: PipelineContext = None) -> None:
+        pass
+
+    @put.register(Core)
+    def put_core(self, item: Core, context: PipelineContext = None) -> None:
+        self.items.append(item.value)
+
+    @put_many.register(Core)
+    def put_many_core(self, items: Iterable[Core], context: PipelineContext = None) -> None:
+        self.items.extend(item.value for item in items)
+
+
+class Transformer(DataTransformer):
+    def __init__(self):
+        self.calls = 0
+
+    @DataTransformer.dispatch
+    def transform(self, target_type: Type[T], value: Any, context: PipelineContext = None) -> T:
+        pass
+
+    @transform.register(Dto, Core)
+    def dto_to_core(self, value: Dto, context: PipelineContext = None) -> Core:
+        self.calls += 1
+        return Core(value["value"])
+
+
+class TestCompiledDataPipeline(unittest.TestCase):
+    def test_get_falls_through_to_next_source(self):
+        sink, first, second = Sink(), Source({"a": 1}), Source({"b": 2})
+        pipeline = CompiledDataPipeline([sink, first, second], [Transformer()])
+        self.assertEqual(pipeline.get(Core, {"key": "b"}).value, 2)
+        self.assertEqual(len(first.queries), 1)
+        self.assertEqual(sink.items, [2])
+        self.assertRaises(NotFoundError, pipeline.get, Core, {"key": "c"})
+
+    def test_routes_are_reused(self):
+        pipeline = CompiledDataPipeline([Sink(), Source({"a": 1})], [Transformer()])
+        pipeline.get(Core, {"key": "a"})
+        routes = pipeline._get_routes[Core]
+        pipeline._get_handlers = None  # Resolving handlers again would now fail
+        self.assertEqual(pipeline.get(Core, {"key": "a"}).value, 1)
+        self.assertIs(pipeline._get_routes[Core], routes)
+
+    def test_query_is_not_mutated(self):
+        source = Source({"a": 1})
+        pipeline = CompiledDataPipeline([source], [Transformer()])
+        query = {"key": "a"}
+        pipeline.get(Dto, query)
+        self.assertEqual(query, {"key": "a"})
+        self.assertEqual(source.queries, [{"key": "a", "touched": True}])
+
+    def test_no_conversion(self):
+        pipeline = CompiledDataPipeline([Source({"a": 1})])
+        self.assertRaises(NoConversionError, pipeline.get, Core, {"key": "a"})
+        self.assertRaises(NoConversionError, pipeline.get, Core, {"key": "a"})
+
+    def test_get_many_skips_sources_without_get_many(self):
+        sink = Sink()
+        pipeline = CompiledDataPipeline([sink, Source({"a": 1}), ManySource({"a": 1, "b": 2})], [Transformer()])
+        self.assertEqual(len(pipeline._routes(Core, many=True)), 1)
+        self.assertEqual([core.value for core in pipeline.get_many(Core, {"keys": ["a", "b"]})], [1, 2])
+        self.assertEqual(sink.items, [1, 2])
+
+    def test_get_many_streaming(self):
+        sink = Sink()
+        pipeline = CompiledDataPipeline([sink, ManySource({"a": 1, "b": 2})], [Transformer()])
+        results = pipeline.get_many(Core, {"keys": ["a", "b"]}, streaming=True)
+        self.assertEqual(sink.items, [])
+        self.assertEqual(next(results).value, 1)
+        self.assertEqual(sink.items, [1])
+        self.assertEqual([core.value for core in results], [2])
+        self.assertEqual(sink.items, [1, 2])
+
+    def test_get_many_merges_partial_hits(self):
+        sink = Sink()
+        first, second, third = ManySource({"b": 2}), ManySource({"a": 1, "d": 4}), ManySource({"c": 3})
+        pipeline = CompiledDataPipeline([first, sink, second, third], [Transformer()])
+        results = pipeline.get_many(Core, {"keys": ["a", "b", "c", "d"], "platform": "EUW1"})
+        self.assertEqual([core.value for core in results], [1, 2, 3, 4])
+        self.assertEqual(second.queries[0], {"keys": ["a", "c", "d"], "platform": "EUW1"})
+        self.assertEqual(third.queries[0], {"keys": ["c"], "platform": "EUW1"})
+        # Only the items that came from after the sink are put into it
+        self.assertEqual(sink.items, [1, 4, 3])
+
+    def test_get_many_set_of_keys(self):
+        first, second = ManySource({"b": 2}), ManySource({"a": 1, "c": 3})
+        pipeline = CompiledDataPipeline([first, second], [Transformer()])
+        keys = {"a", "b", "c"}
+        results = pipeline.get_many(Core, {"keys": keys})
+        self.assertEqual([core.value for core in results], [{"a": 1, "b": 2, "c": 3}[key] for key in keys])
+        results = pipeline.get_many(Core, {"keys": (key for key in ["c", "b"])})
+        self.assertEqual([core.value for core in results], [3, 2])
+
+    def test_get_many_partial_miss(self):
+        pipeline = CompiledDataPipeline([ManySource({"b": 2})], [Transformer()])
+        with self.assertRaises(PartialNotFoundError) as context:
+            pipeline.get_many(Core, {"keys": ["a", "b"]})
+        self.assertEqual(context.exception.results[1].value, 2)
+        self.assertEqual(context.exception.missing, [0])
+        self.assertEqual(context.exception.missing_query, {"keys": ["a"]})
+
+
+class TestCacheGetMany(unittest.TestCase):
+    def setUp(self):
+        self.cache = Cache()
+        for i in range(3):
+            summoner = SummonerData(id="id-{}".format(i), name="name-{}".format(i), region="EUW")
+            self.cache.put(Summoner, Summoner.from_data(summoner))
+
+    def test_all_hits(self):
+        results = self.cache.get_many(Summoner, {"ids": ["id-2", "id-0"], "region": Region.europe_west})
+        self.assertEqual([summoner.name for summoner in results], ["name-2", "name-0"])
+
+    def test_partial_hit(self):
+        with self.assertRaises(PartialNotFoundError) as context:
+            self.cache.get_many(Summoner, {"names": ["name-1", "unknown", "name-0", "missing"], "region": "EUW"})
+        error = context.exception
+        self.assertEqual([summoner and summoner.name for summoner in error.results], ["name-1", None, "name-0", None])
+        self.assertEqual(error.missing, [1, 3])
+        self.assertEqual(error.missing_query["names"], ["unknown", "missing"])
+
+    def test_set_and_generator_of_ids(self):
+        ids = {"id-1", "unknown", "id-0"}
+        with self.assertRaises(PartialNotFoundError) as context:
+            self.cache.get_many(Summoner, {"ids": ids, "region": "EUW"})
+        error = context.exception
+        self.assertEqual(error.missing_query["ids"], ["unknown"])
+        for id, summoner in zip(ids, error.results):
+            self.assertEqual(summoner and summoner.id, None if id == "unknown" else id)
+
+        results = self.cache.get_many(Summoner, {"ids": ("id-{}".format(i) for i in [2, 1]), "region": "EUW"})
+        self.assertEqual([summoner.id for summoner in results], ["id-2", "id-1"])
+
+    def test_all_misses(self):
+        self.assertRaises(NotFoundError, self.cache.get_many, Summoner, {"ids": ["unknown"], "region": "EUW"})
+
+
+if __name__ == "__main__":
+    unittest.main()
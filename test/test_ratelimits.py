@@ -0,0 +1,237 @@
+import threading
+import unittest
+from unittest import mock
+
+import lissandra
+from lissandra import Platform
+from lissandra.datastores.common import HTTPError
+from lissandra.datastores.riotapi import common as riotapi_common
+from lissandra.datastores.riotapi.common import AdaptiveRateControl, GCRALimiter, RiotAPIRateLimiter, window_limiter
+from lissandra.datastores.riotapi.summoner import SummonerAPI
+from lissandra.dto.summoner import SummonerDto
+
+from benchmarks.endtoend import apply_settings
+from benchmarks.mockserver import MockRiotAPI
+
+RATE_LIMIT_HEADERS = {"X-App-Rate-Limit": "20:1,100:120", "X-Method-Rate-Limit": "5:10"}
+
+
+class RateLimitedHTTPClient(object):
+    """Fails the first request with a 429 with these headers."""
+
+    def __init__(self, headers):
+        self.headers = headers
+        self.calls = 0
+
+    def get(self, url, parameters=None, headers=None, rate_limiters=None, connection=None):
+        with rate_limiters[0], rate_limiters[1]:
+            self.calls += 1
+            if self.calls == 1:
+                raise HTTPError("Rate limited", 429, self.headers)
+            return {"id": "id-1", "puuid": "puuid-1", "name": "Crimack"}, RATE_LIMIT_HEADERS
+
+
+def summoner_api(http_client, rate_limiter="fixed_window", **kwargs):
+    app_rate_limiter = {
+        each: RiotAPIRateLimiter(limiting_share=1.0, platform=each, window_limiter=window_limiter(rate_limiter))
+        for each in Platform
+    }
+    return SummonerAPI(
+        "RGAPI-test", app_rate_limiter=app_rate_limiter, http_client=http_client, rate_limiter=rate_limiter, **kwargs
+    )
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_windows(self):
+        limiter = RiotAPIRateLimiter(limiting_share=0.5, platform=Platform.korea, endpoint="summoners/by-name/name")
+        self.assertEqual(limiter.snapshot()["windows"], [])
+        limiter.adjust_rate_limits_if_necessary([[10, 10], [100, 600]])
+        for _ in range(3):
+            with limiter:
+                pass
+
+        snapshot = limiter.snapshot()
+        self.assertEqual(snapshot["platform"], "KR")
+        self.assertEqual(snapshot["endpoint"], "summoners/by-name/name")
+        self.assertEqual(snapshot["permits_issued"], 3)
+        short, long = snapshot["windows"]
+        self.assertEqual((short["window_seconds"], short["permits"]), (10, 5))
+        self.assertEqual((short["used"], short["remaining"], short["utilisation"]), (3, 2, 0.6))
+        self.assertEqual((long["used"], long["remaining"]), (3, 47))
+        self.assertTrue(9 < short["seconds_until_reset"] <= 10)
+        self.assertTrue(599 < long["seconds_until_reset"] <= 600)
+        self.assertEqual(short["waiting"], 0)
+
+        limiter.restrict_for(2)
+        short = limiter.snapshot()["windows"][0]
+        self.assertEqual(short["remaining"], 0)
+        self.assertTrue(short["seconds_until_reset"] <= 2)
+
+    def test_rate_limited(self):
+        api = summoner_api(RateLimitedHTTPClient({"X-Rate-Limit-Type": "method", "Retry-After": "0"}))
+        api.get(SummonerDto, {"name": "Crimack", "platform": Platform.korea})
+        [application, method] = api.rate_limiters()
+        self.assertEqual(application.snapshot()["rate_limited"], {})
+        self.assertEqual(method.snapshot()["rate_limited"], {"method": 1})
+        self.assertEqual([window["permits"] for window in application.snapshot()["windows"]], [20, 100])
+        # The windows only start counting once the first response has told us the limits
+        self.assertEqual(method.snapshot()["windows"][0]["used"], 0)
+        api.get(SummonerDto, {"name": "Crimack", "platform": Platform.korea})
+        self.assertEqual(method.snapshot()["windows"][0]["used"], 1)
+
+
+class TestAdaptiveRateLimiting(unittest.TestCase):
+    def test_aimd(self):
+        control = AdaptiveRateControl(decrease_factor=0.5, increase=0.1, interval=0.0, min_share=0.2)
+        self.assertFalse(control.succeeded())
+        self.assertTrue(control.limited())
+        self.assertTrue(control.limited())
+        self.assertEqual(control.share, 0.25)
+        self.assertTrue(control.limited())
+        self.assertEqual(control.share, 0.2)
+        self.assertFalse(control.limited())
+        for _ in range(7):
+            control.succeeded()
+        self.assertAlmostEqual(control.share, 0.9)
+        control.succeeded()
+        control.succeeded()
+        self.assertEqual(control.share, 1.0)
+
+    def test_once_per_interval(self):
+        control = AdaptiveRateControl(interval=60.0)
+        self.assertTrue(control.limited())
+        self.assertFalse(control.limited())  # Requests sent in the same burst don't count again
+        self.assertFalse(control.succeeded())  # Nor does it probe back up straight away
+        self.assertEqual(control.share, 0.5)
+
+    def test_permits(self):
+        limiter = RiotAPIRateLimiter(0.5, Platform.korea, "summoners/by-name/name", AdaptiveRateControl(interval=0.0))
+        limiter.adjust_rate_limits_if_necessary([[100, 10], [3, 1]])
+        self.assertEqual([window["permits"] for window in limiter.snapshot()["windows"]], [50, 1.5])
+        limiter.record_rate_limited("method")
+        self.assertEqual(limiter.adaptive.share, 1.0)
+        limiter.record_rate_limited("service")
+        self.assertEqual([window["permits"] for window in limiter.snapshot()["windows"]], [25, 1])
+        limiter.record_success()
+        limiter.adjust_rate_limits_if_necessary([[100, 10], [3, 1]])
+        self.assertEqual([window["permits"] for window in limiter.snapshot()["windows"]], [30, 1])
+        self.assertAlmostEqual(limiter.snapshot()["adaptive_share"], 0.6)
+
+    def test_service_rate_limit(self):
+        backoff = {"strategy": "exponential_backoff", "initial_backoff": 0.0, "backoff_factor": 1.0, "max_attempts": 2}
+        api = summoner_api(RateLimitedHTTPClient({}), request_error_handling={"429": {"service": backoff}})
+        api.get(SummonerDto, {"name": "Crimack", "platform": Platform.korea})
+        [_, method] = api.rate_limiters()
+        self.assertEqual(method.snapshot()["rate_limited"], {"service": 1})
+        self.assertEqual(method.snapshot()["adaptive_share"], 0.5)
+        self.assertEqual(method.snapshot()["windows"][0]["permits"], 2)
+
+        static = summoner_api(
+            RateLimitedHTTPClient({}),
+            request_error_handling={"429": {"service": backoff}},
+            adaptive_rate_limiting=False,
+        )
+        static.get(SummonerDto, {"name": "Crimack", "platform": Platform.korea})
+        self.assertIsNone(static.rate_limiters()[1].snapshot()["adaptive_share"])
+
+
+class FakeClock(object):
+    """Stands in for the `time` module in the rate limiters, with a clock that only moves when they sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestGCRALimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(riotapi_common, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def issue(self, limiter, n):
+        """Takes n permits one after the other, and returns how long after the first each was issued."""
+        start = self.clock.now
+        issued = []
+        for _ in range(n):
+            with limiter:
+                issued.append(self.clock.now - start)
+        return issued
+
+    def test_spacing(self):
+        limiter = GCRALimiter(window_seconds=1, window_permits=20, burst=0.1, margin=0.0)
+        # A burst of 2, then one every 1 / 19 seconds
+        issued = self.issue(limiter, 4)
+        for actual, expected in zip(issued, [0, 0, 1 / 19, 2 / 19]):
+            self.assertAlmostEqual(actual, expected)
+        snapshot = limiter.snapshot()
+        self.assertEqual((snapshot["used"], snapshot["remaining"], snapshot["permits_issued"]), (4, 16, 4))
+
+        limiter.restrict_for(0.2)
+        self.assertAlmostEqual(self.issue(limiter, 1)[0], 0.2)
+
+    def test_never_over_the_limit(self):
+        limiter = GCRALimiter(window_seconds=1, window_permits=40, burst=0.05, margin=0.05)
+        issued = self.issue(limiter, 200)
+        # However the Riot API's windows line up with ours, none of them gets more than its permits
+        for i, start in enumerate(issued):
+            in_window = [each for each in issued[i:] if each < start + 1]
+            self.assertLessEqual(len(in_window), 40)
+        # Only the burst goes at once; the rest are spread evenly over the window and the margin
+        self.assertEqual(issued[:3], [0, 0, issued[2]])
+        gaps = [later - earlier for earlier, later in zip(issued[1:], issued[2:])]
+        for gap in gaps:
+            self.assertAlmostEqual(gap, 1.05 / 39)
+
+    def test_timeout(self):
+        limiter = GCRALimiter(window_seconds=10, window_permits=1, timeout=0.1)
+        with limiter:
+            pass
+        self.assertRaises(TimeoutError, limiter.__enter__)
+
+    def test_setting(self):
+        limiter = window_limiter({"strategy": "gcra", "burst": 0.5})(window_seconds=10, window_permits=100)
+        self.assertIsInstance(limiter, GCRALimiter)
+        self.assertEqual(limiter._burst, 0.5)
+        self.assertRaises(ValueError, window_limiter, "leaky_bucket")
+
+
+class TestGetRateLimits(unittest.TestCase):
+    def test_get_and_monitor(self):
+        with MockRiotAPI() as server, server.redirect():
+            apply_settings()
+            lissandra.get_summoner(name="Crimack", region="EUW").level
+            lissandra.get_summoner(name="Kalturi", region="EUW").level
+
+            snapshots = {(each["platform"], each["endpoint"]): each for each in lissandra.get_rate_limits()}
+            method = snapshots[("EUW1", "summoners/by-name/name")]
+            # The first request is counted from the X-Method-Rate-Limit-Count header
+            self.assertEqual(method["windows"][0]["used"], 2)
+            self.assertIn(("EUW1", None), snapshots)
+
+            received = []
+            called = threading.Event()
+
+            def callback(snapshots):
+                received.append(snapshots)
+                called.set()
+
+            monitor = lissandra.monitor_rate_limits(callback, interval=0.01)
+            self.assertTrue(called.wait(5))
+            monitor.stop()
+            monitor.join(5)
+            self.assertFalse(monitor.is_alive())
+            self.assertIn(method["endpoint"], [each["endpoint"] for each in received[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
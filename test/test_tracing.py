@@ -0,0 +1,113 @@
+import unittest
+
+import lissandra
+from lissandra import tracing
+from lissandra._configuration.pipeline import CompiledDataPipeline
+
+from benchmarks.endtoend import apply_settings
+from benchmarks.mockserver import MockRiotAPI
+
+from .test_pipeline import Core, ManySource, Sink, Source, Transformer
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tracer = tracing.RecordingTracer()
+        tracing.set_tracer(self.tracer)
+        self.addCleanup(tracing.set_tracer, None)
+
+
+class TestPipelineSpans(TracingTestCase):
+    def test_get(self):
+        pipeline = CompiledDataPipeline([Sink(), Source({"a": 1}), Source({"b": 2})], [Transformer()])
+        self.assertEqual(pipeline.get(Core, {"key": "b"}).value, 2)
+
+        [root] = self.tracer.roots
+        self.assertEqual(root.name, "pipeline.get")
+        self.assertEqual(
+            root.attributes,
+            {
+                "lissandra.type": "Core",
+                "lissandra.query.key": "b",
+                "lissandra.datastore": "Source",
+                "lissandra.cache": "miss",
+            },
+        )
+        self.assertEqual(
+            [(span.name, span.attributes.get("lissandra.result")) for span in root.children],
+            [("datastore.get", "miss"), ("datastore.get", "hit"), ("transform", None), ("datastore.put", None)],
+        )
+        self.assertEqual(root.children[2].attributes, {"lissandra.from": "Dto", "lissandra.to": "Core"})
+        # The untraced routes weren't compiled
+        self.assertEqual(pipeline._get_routes, {})
+
+    def test_get_many_partial(self):
+        pipeline = CompiledDataPipeline([ManySource({"b": 2}), ManySource({"a": 1})], [Transformer()])
+        pipeline.get_many(Core, {"keys": ["a", "b"]})
+        [root] = self.tracer.roots
+        self.assertEqual(root.name, "pipeline.get_many")
+        self.assertEqual(root.attributes["lissandra.query.keys"], ["a", "b"])
+        results = [span.attributes["lissandra.result"] for span in root.children if span.name == "datastore.get_many"]
+        self.assertEqual(results, ["partial", "hit"])
+
+    def test_get_many_streaming(self):
+        pipeline = CompiledDataPipeline([ManySource({"a": 1, "b": 2})], [Transformer()])
+        stream = pipeline.get_many(Core, {"keys": ["a", "b"]}, streaming=True)
+        self.assertEqual(self.tracer.roots, [])  # Still open until the items have been loaded
+        self.assertEqual([item.value for item in stream], [1, 2])
+
+        [root] = self.tracer.roots
+        self.assertEqual(root.name, "pipeline.get_many")
+        self.assertIsNotNone(root.duration)
+        # The items are transformed as they're read, inside the span
+        self.assertEqual([span.name for span in root.children].count("transform"), 2)
+
+        # Closing a stream before it's been read ends the span too
+        self.tracer.clear()
+        pipeline.get_many(Core, {"keys": ["a", "b"]}, streaming=True).close()
+        self.assertEqual([span.name for span in self.tracer.roots], ["pipeline.get_many"])
+
+    def test_off(self):
+        tracing.set_tracer(None)
+        pipeline = CompiledDataPipeline([Source({"a": 1})], [Transformer()])
+        pipeline.get(Core, {"key": "a"})
+        self.assertEqual(self.tracer.spans, [])
+        self.assertEqual(pipeline._traced_get_routes, {})
+
+
+class TestRequestSpans(TracingTestCase):
+    def test_summoner(self):
+        with MockRiotAPI() as server, server.redirect():
+            apply_settings()
+            summoner = lissandra.get_summoner(name="Crimack", region="EUW")
+            self.tracer.clear()
+            self.assertEqual(summoner.level, 107)
+            self.tracer.clear()
+            lissandra.get_summoner(name="Crimack", region="EUW").level
+
+        [root] = self.tracer.roots
+        self.assertEqual(root.attributes["lissandra.cache"], "hit")
+        load = [span for span in self.tracer.spans if span.attributes.get("lissandra.type") == "SummonerData"]
+        self.assertEqual(load, [])  # Served from the cached Summoner, so it's never loaded again
+
+    def test_request(self):
+        with MockRiotAPI() as server, server.redirect():
+            apply_settings()
+            summoner = lissandra.get_summoner(name="Crimack", region="EUW")
+            self.tracer.clear()
+            summoner.level
+
+        [root] = self.tracer.roots
+        self.assertEqual(root.attributes["lissandra.type"], "SummonerData")
+        self.assertEqual(root.attributes["lissandra.query.name"], "Crimack")
+        self.assertEqual(root.attributes["lissandra.datastore"], "RiotAPI")
+        names = [span.name for span in self.tracer.spans]
+        self.assertIn("rate_limiter.wait", names)
+        [http] = [span for span in self.tracer.spans if span.name == "http.get"]
+        self.assertEqual(http.attributes["http.status_code"], 200)
+        self.assertTrue(http.attributes["http.url"].endswith("/tft/summoner/v1/summoners/by-name/Crimack"))
+        self.assertIn("http.get", self.tracer.format())
+
+
+if __name__ == "__main__":
+    unittest.main()